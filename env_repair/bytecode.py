@@ -0,0 +1,168 @@
+import concurrent.futures
+import importlib.util
+import os
+import struct
+import sys
+
+from .ownership import REPORT_LIMIT
+from .scan import list_site_packages, python_abi_tag_for
+from .subprocess_utils import run_cmd_capture
+
+# magic(4) + flags(4) + mtime(4) + source size(4), PEP 552.
+_PYC_HEADER = 16
+_FLAG_HASH_BASED = 0x1
+
+
+def interpreter_magic(python_exe, abi_tag):
+    """
+    The env interpreter's pyc magic number. Taken from the running interpreter when the
+    versions match, otherwise asked from the env interpreter once. None if unknown.
+    """
+    if abi_tag == f"cp{sys.version_info[0]}{sys.version_info[1]}":
+        return importlib.util.MAGIC_NUMBER
+    if not python_exe:
+        return None
+    try:
+        rc, out, _err = run_cmd_capture([python_exe, "-c", "import importlib.util;print(importlib.util.MAGIC_NUMBER.hex())"])
+    except OSError:
+        return None
+    if rc != 0:
+        return None
+    try:
+        return bytes.fromhex((out or "").strip())
+    except ValueError:
+        return None
+
+
+def _check_pyc(pyc_path, source_path, magic):
+    """
+    Classify one cached pyc: "ok", "bad-magic", "stale" (source mtime/size changed),
+    "orphaned" (source gone) or None if unreadable.
+    """
+    try:
+        with open(pyc_path, "rb") as f:
+            header = f.read(_PYC_HEADER)
+    except OSError:
+        return None
+    if len(header) < _PYC_HEADER or (magic is not None and header[:4] != magic):
+        return "bad-magic"
+    try:
+        st = os.stat(source_path)
+    except OSError:
+        return "orphaned"
+    flags, mtime, size = struct.unpack("<III", header[4:16])
+    if flags & _FLAG_HASH_BASED:
+        # Hash-based pycs are validated against the source hash by the importer itself.
+        return "ok"
+    if mtime != (int(st.st_mtime) & 0xFFFFFFFF) or size != (st.st_size & 0xFFFFFFFF):
+        return "stale"
+    return "ok"
+
+
+def _scan_tree(site_pkg, top, cache_tag, magic):
+    """
+    (relpath, status) for every pyc below site_pkg/top that is not "ok".
+    Pycs of another interpreter version are reported as "foreign-tag".
+    """
+    found = []
+    stack = [top]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(site_pkg, rel_dir)) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        is_cache = os.path.basename(rel_dir) == "__pycache__"
+        for e in entries:
+            try:
+                is_dir = e.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            rel = f"{rel_dir}/{e.name}"
+            if is_dir:
+                if not e.name.lower().endswith((".dist-info", ".egg-info")):
+                    stack.append(rel)
+                continue
+            if not is_cache or not e.name.endswith(".pyc"):
+                continue
+            parts = e.name.split(".")
+            if len(parts) < 3:
+                continue
+            if cache_tag and parts[1] != cache_tag:
+                found.append((rel, "foreign-tag"))
+                continue
+            source = os.path.join(site_pkg, os.path.dirname(rel_dir), parts[0] + ".py")
+            status = _check_pyc(e.path, source, magic)
+            if status not in (None, "ok"):
+                found.append((rel, status))
+    return found
+
+
+def _recompile_target(rel):
+    """
+    Site-packages entry whose compile refreshes the pyc at `rel`: the top-level package dir,
+    or the module file itself for pycs in the root `__pycache__` (e.g. `six.py`).
+    """
+    top, _sep, rest = rel.partition("/")
+    if top == "__pycache__":
+        return rest.split(".", 1)[0] + ".py"
+    return top
+
+
+def scan_bytecode(env_path, python_exe, site_pkgs, listings=None):
+    """
+    Check `__pycache__` contents of every site-packages against the env interpreter:
+    wrong magic number, source mtime/size mismatch (recompiled on every import, silently
+    failing on read-only envs), pycs whose source is gone, and pycs of other Python versions.
+    Package trees are walked in parallel. Returns one `stale-bytecode` issue per site-packages.
+    """
+    issues = []
+    magic = None
+    for site_pkg in site_pkgs or []:
+        listing = (listings or {}).get(site_pkg) or list_site_packages(site_pkg)
+        if listing is None:
+            continue
+        abi_tag = python_abi_tag_for(site_pkg, env_path)
+        if magic is None:
+            magic = interpreter_magic(python_exe, abi_tag)
+        cache_tag = f"cpython-{abi_tag[2:]}" if abi_tag else None
+        tops = [name for name, is_dir in listing["entries"] if is_dir and not name.lower().endswith((".dist-info", ".egg-info"))]
+        found = []
+        if tops:
+            workers = min(16, (os.cpu_count() or 1) * 2, len(tops))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+                for items in ex.map(lambda top: _scan_tree(str(site_pkg), top, cache_tag, magic), tops):
+                    found.extend(items)
+        if not found:
+            continue
+        found.sort()
+        counts = {}
+        for _rel, status in found:
+            counts[status] = counts.get(status, 0) + 1
+        issues.append(
+            {
+                "type": "stale-bytecode",
+                "site_pkg": str(site_pkg),
+                "count": len(found),
+                "counts": counts,
+                # Package dirs / top-level modules whose bytecode a recompile would refresh
+                # (foreign/orphaned pycs are inert).
+                "packages": sorted({_recompile_target(rel) for rel, status in found if status in ("bad-magic", "stale")}),
+                "files": [{"path": rel, "status": status} for rel, status in found[:REPORT_LIMIT]],
+            }
+        )
+    return issues
+
+
+def recompile_packages(python_exe, site_pkg, packages, *, workers=0):
+    """
+    `python -m compileall -q -j <workers>` over the given top-level package dirs and module
+    files, run by the env interpreter (workers=0 uses every CPU). Only out-of-date pycs are
+    rewritten.
+    """
+    targets = [os.path.join(site_pkg, p) for p in packages if os.path.exists(os.path.join(site_pkg, p))]
+    if not python_exe or not targets:
+        return True
+    rc, _out, _err = run_cmd_capture([python_exe, "-m", "compileall", "-q", "-j", str(workers), *targets])
+    return rc == 0
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def cache_dir():
+    """
+    Directory for persisted caches (ENV_REPAIR_CACHE_DIR overrides `.env_repair/cache`).
+    """
+    override = (os.environ.get("ENV_REPAIR_CACHE_DIR") or "").strip()
+    if override:
+        return Path(override)
+    return Path(".env_repair") / "cache"
+
+
+def cache_path(kind, key):
+    """
+    Cache file for `kind` (e.g. "conda-meta-index") and an arbitrary key such as an env path.
+    """
+    digest = hashlib.sha1(str(key).encode("utf-8", errors="ignore")).hexdigest()[:16]
+    return cache_dir() / f"{kind}-{digest}.json"
+
+
+def load_json_cache(path, *, version):
+    """
+    Return the cached payload, or None if missing, unreadable or written by another format version.
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data.get("data")
+
+
+def save_json_cache(path, payload, *, version):
+    """
+    Atomically write a cache payload. Failures are ignored (caches are an optimization only).
+    """
+    path = Path(path)
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp name per writer: concurrent threads/processes never share a temp file.
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            tmp = f.name
+            json.dump({"version": version, "data": payload}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        return False
+    return True
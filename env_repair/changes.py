@@ -0,0 +1,130 @@
+import os
+import time
+from pathlib import Path
+
+from .conda_deps import parse_match_spec
+from .conda_meta import index_records, load_conda_meta_index, site_packages_files
+from .dependencies import parse_requirement, read_requires
+from .dist_meta import is_dist_metadata_name, split_dist_dirname
+from .history import parse_history
+from .naming import normalize_name
+from .scan import list_site_packages
+
+_TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y-%m-%d")
+
+
+def parse_timestamp(text):
+    """
+    Local time "YYYY-MM-DD[ HH:MM[:SS]]" (also with "T") or epoch seconds -> epoch seconds.
+    Raises ValueError for anything else.
+    """
+    text = (text or "").strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    for fmt in _TIME_FORMATS:
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    raise ValueError(f"invalid timestamp: {text}")
+
+
+def _revision_time(rev):
+    try:
+        return parse_timestamp(rev.get("date"))
+    except ValueError:
+        return None
+
+
+def _dist_info_dirs(files):
+    """
+    dist-info / egg-info directory names among a conda record's site-packages files.
+    """
+    names = set()
+    for f in files:
+        for part in f.replace("\\", "/").split("/"):
+            if is_dist_metadata_name(part):
+                names.add(part)
+                break
+    return names
+
+
+def _installed_dist_infos(site_pkgs):
+    """
+    [{"dir", "key", "requires", "mtime"}] for every dist-info/egg-info in site-packages.
+    """
+    out = []
+    for site_pkg in site_pkgs or []:
+        listing = list_site_packages(site_pkg)
+        for name in (listing or {}).get("dist_infos") or []:
+            path = Path(site_pkg) / name
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            requires = set()
+            for line in read_requires(path):
+                req = parse_requirement(line)
+                if req is not None:
+                    requires.add(normalize_name(req["name"]))
+            out.append({"dir": name, "key": normalize_name(split_dist_dirname(name)[0]), "requires": requires, "mtime": mtime})
+    return out
+
+
+def changed_packages(env_path, site_pkgs, *, revision=None, since=None):
+    """
+    Packages changed after conda revision `revision` (or since epoch time `since`) plus their
+    direct reverse dependencies:
+      - conda: packages added/removed in later `conda-meta/history` revisions, and installed
+        records whose `depends` name one of them
+      - pip: dist-info dirs not owned by conda and modified after the cutoff, and dists
+        whose Requires-Dist name a changed dist (conda-installed ones included)
+    Returns {"cutoff", "conda_changed", "conda_reverse", "pip_changed", "pip_reverse",
+    "dist_infos"}; raises ValueError for an unknown revision.
+    """
+    revisions = parse_history(env_path)
+    if revision is not None:
+        rev = next((r for r in revisions if r["rev"] == revision), None)
+        if rev is None:
+            raise ValueError(f"unknown revision: {revision}")
+        cutoff = _revision_time(rev)
+        later = [r for r in revisions if r["rev"] > revision]
+    else:
+        cutoff = since
+        later = [r for r in revisions if (_revision_time(r) or 0) >= since]
+    conda_changed = {d["name"].lower() for r in later for d in r["added"] + r["removed"]}
+
+    conda_dist_infos = {}
+    conda_reverse = set()
+    for rec in index_records(load_conda_meta_index(env_path)):
+        name = str(rec["meta"].get("name") or "").lower()
+        if not name:
+            continue
+        conda_dist_infos.setdefault(name, set()).update(_dist_info_dirs(site_packages_files(rec)))
+        specs = [parse_match_spec(t) for t in rec["meta"].get("depends") or [] if isinstance(t, str)]
+        deps = {s["name"].lower() for s in specs if s}
+        if deps & conda_changed and name not in conda_changed:
+            conda_reverse.add(name)
+
+    dists = _installed_dist_infos(site_pkgs)
+    conda_changed_dirs = set().union(*(conda_dist_infos.get(n, set()) for n in conda_changed))
+    changed_keys = {d["key"] for d in dists if d["dir"] in conda_changed_dirs}
+    if cutoff is not None:
+        # conda links its dist-infos after writing the history header, so mtimes only
+        # say something for dists conda does not own.
+        conda_dirs = set().union(*conda_dist_infos.values())
+        changed_keys |= {d["key"] for d in dists if d["dir"] not in conda_dirs and d["mtime"] >= cutoff}
+    reverse_keys = {d["key"] for d in dists if d["requires"] & changed_keys} - changed_keys
+
+    selected = conda_changed_dirs | set().union(*(conda_dist_infos.get(n, set()) for n in conda_reverse))
+    selected |= {d["dir"] for d in dists if d["key"] in changed_keys or d["key"] in reverse_keys}
+    return {
+        "cutoff": cutoff,
+        "conda_changed": sorted(conda_changed),
+        "conda_reverse": sorted(conda_reverse),
+        "pip_changed": sorted(changed_keys),
+        "pip_reverse": sorted(reverse_keys),
+        "dist_infos": sorted(selected),
+    }
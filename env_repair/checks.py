@@ -0,0 +1,28 @@
+from .bytecode import scan_bytecode
+from .elf import scan_duplicate_libraries, scan_elf_dependencies
+from .integrity import scan_conda_integrity
+from .ownership import scan_file_overlaps, scan_namespace_collisions, scan_orphan_files
+from .relocation import scan_foreign_prefix
+
+# Opt-in scan detectors (`--check NAME`, repeatable). Each takes the scan context dict
+# (env_path, python, site_pkgs, listings, conda) and returns a list of issues.
+OPTIONAL_CHECKS = {
+    "integrity": lambda ctx: scan_conda_integrity(ctx["env_path"]) if ctx["conda"] else [],
+    "integrity-deep": lambda ctx: scan_conda_integrity(ctx["env_path"], deep=True) if ctx["conda"] else [],
+    "overlaps": lambda ctx: scan_file_overlaps(ctx["env_path"], ctx["site_pkgs"]),
+    "bytecode": lambda ctx: scan_bytecode(ctx["env_path"], ctx["python"], ctx["site_pkgs"], ctx["listings"]),
+    "elf": lambda ctx: scan_elf_dependencies(ctx["env_path"], ctx["site_pkgs"]),
+    "dup-libs": lambda ctx: scan_duplicate_libraries(ctx["env_path"], ctx["site_pkgs"]),
+    "relocation": lambda ctx: scan_foreign_prefix(ctx["env_path"], ctx["site_pkgs"]),
+    "namespaces": lambda ctx: scan_namespace_collisions(ctx["env_path"], ctx["site_pkgs"]),
+    "orphans": lambda ctx: scan_orphan_files(ctx["env_path"], ctx["site_pkgs"]) if ctx["conda"] else [],
+}
+
+
+def run_optional_checks(names, ctx):
+    issues = []
+    for name in dict.fromkeys(names or ()):
+        check = OPTIONAL_CHECKS.get(name)
+        if check is not None:
+            issues.extend(check(ctx))
+    return issues
@@ -3,6 +3,7 @@ import json
 import os
 import sys
 
+from .checks import OPTIONAL_CHECKS
 from .doctor import (
     cache_check,
     cache_fix,
@@ -10,7 +11,9 @@ from .doctor import (
     diagnose_inconsistent,
     diagnose_ssl,
     fix_inconsistent,
+    profile_startup,
     rebuild,
+    restore,
     rollback,
     run,
 )
@@ -145,6 +148,22 @@ def build_parser():
     rb.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
     rb.add_argument("--plan", action="store_true", help=t("help_plan", lang=lang))
 
+    rs = sub.add_parser(
+        "restore",
+        help=t("help_cmd_restore", lang=lang),
+        description=t("help_cmd_restore", lang=lang),
+        add_help=False,
+    )
+    rs.add_argument("-h", "--help", action="help", help=t("help_help", lang=lang))
+    rs.add_argument("--env", required=True, help=t("help_env_single", lang=lang))
+    rs.add_argument("--snapshot", required=True, help=t("help_snapshot_file", lang=lang))
+    rs.add_argument("--solver", action="store_true", help=t("help_restore_solver", lang=lang))
+    rs.add_argument("--dry-run", action="store_true", help=t("help_dry_run", lang=lang))
+    rs.add_argument("-y", "--yes", action="store_true", help=t("help_yes", lang=lang))
+    rs.add_argument("--json", action="store_true", help=t("help_json", lang=lang))
+    rs.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
+    rs.add_argument("--plan", action="store_true", help=t("help_plan", lang=lang))
+
     rb2 = sub.add_parser(
         "rebuild",
         help=t("help_cmd_rebuild", lang=lang),
@@ -168,7 +187,7 @@ def build_parser():
     )
     dc.add_argument("-h", "--help", action="help", help=t("help_help", lang=lang))
     dc.add_argument("--env", required=True, help=t("help_env_single", lang=lang))
-    dc.add_argument("--logfile", required=True, help=t("help_logfile", lang=lang))
+    dc.add_argument("--logfile", help=t("help_logfile", lang=lang))
     dc.add_argument("--json", action="store_true", help=t("help_json", lang=lang))
     dc.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
 
@@ -180,6 +199,7 @@ def build_parser():
     )
     di.add_argument("-h", "--help", action="help", help=t("help_help", lang=lang))
     di.add_argument("--env", required=True, help=t("help_env_single", lang=lang))
+    di.add_argument("--solver", action="store_true", help=t("help_solver", lang=lang))
     di.add_argument("--json", action="store_true", help=t("help_json", lang=lang))
     di.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
 
@@ -258,6 +278,18 @@ def build_parser():
     ds.add_argument("--json", action="store_true", help=t("help_json", lang=lang))
     ds.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
 
+    ps = sub.add_parser(
+        "profile-startup",
+        help=t("help_cmd_profile_startup", lang=lang),
+        description=t("help_cmd_profile_startup", lang=lang),
+        add_help=False,
+    )
+    ps.add_argument("-h", "--help", action="help", help=t("help_help", lang=lang))
+    ps.add_argument("--env", dest="env_single", help=t("help_env_single", lang=lang))
+    ps.add_argument("--top", type=int, default=10, help=t("help_top", lang=lang))
+    ps.add_argument("--json", action="store_true", help=t("help_json", lang=lang))
+    ps.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
+
     vi = sub.add_parser(
         "verify-imports",
         help="Check if installed packages can be imported",
@@ -273,6 +305,22 @@ def build_parser():
     vi.add_argument("--json", action="store_true", help=t("help_json", lang=lang))
     vi.add_argument("--debug", action="store_true", help=t("help_debug", lang=lang))
     vi.add_argument("--fix", action="store_true", help="Attempt to automatically fix broken imports")
+    vi.add_argument(
+        "--entry-points",
+        action="store_true",
+        help="Also resolve every console/gui script entry point (module:attr) in one helper process",
+    )
+    vi.add_argument(
+        "--since-revision",
+        type=int,
+        default=None,
+        help="Only check packages changed after this conda-meta/history revision, plus their reverse dependencies",
+    )
+    vi.add_argument(
+        "--since",
+        default=None,
+        help="Only check packages changed since this local time (YYYY-MM-DD[ HH:MM[:SS]]), plus their reverse dependencies",
+    )
 
     p.add_argument(
         "--env",
@@ -281,6 +329,14 @@ def build_parser():
         help=t("help_env_multi", lang=lang),
     )
     p.add_argument("--fix", action="store_true", help=t("help_fix", lang=lang))
+    p.add_argument(
+        "--check",
+        action="append",
+        default=[],
+        choices=sorted(OPTIONAL_CHECKS),
+        metavar="NAME",
+        help=t("help_check", lang=lang, choices=", ".join(sorted(OPTIONAL_CHECKS))),
+    )
     p.add_argument("--adopt-pip", action="store_true", help=t("help_adopt_pip", lang=lang))
     p.add_argument(
         "--keep-pip",
@@ -315,6 +371,8 @@ def main(argv=None):
     try:
         if args.cmd == "rollback":
             result = rollback(args)
+        elif args.cmd == "restore":
+            result = restore(args)
         elif args.cmd == "rebuild":
             result = rebuild(args)
         elif args.cmd == "diagnose-clobber":
@@ -331,6 +389,8 @@ def main(argv=None):
             result = cache_fix(args)
         elif args.cmd == "diagnose-ssl":
             result = diagnose_ssl(args)
+        elif args.cmd == "profile-startup":
+            result = profile_startup(args)
         elif args.cmd == "verify-imports":
             result = verify_imports(args)
         else:
@@ -1,104 +1,165 @@
-import json
 import re
 from pathlib import Path
 from pathlib import PureWindowsPath
 
+from .conda_meta import file_owner, file_owners, load_conda_meta_index
 
-def extract_paths_from_text(text, *, env_prefix):
+
+# Quoted windows paths: 'C:\\...'
+_QUOTED_WIN_RE = re.compile(r"['\"]([A-Za-z]:\\[^'\"]+)['\"]")
+# Unquoted windows paths: C:\...\something
+_WIN_RE = re.compile(r"([A-Za-z]:\\[^\s'\"]+)")
+# POSIX paths (for completeness)
+_POSIX_RE = re.compile(r"(?<![\w:/.])(/[^\s'\"]+)")
+# Punctuation that logs put right after a path.
+_TRAILING = ",;)]>"
+
+
+def _looks_like_windows_abs(p):
+    # Accept a normal Windows path (C:\...) and also log-escaped variants (C:\\...),
+    # since conda/mamba errors often include doubled backslashes.
+    return bool(re.match(r"^[A-Za-z]:\\", p or ""))
+
+
+def _normalize_windows_abs(p):
+    # Logs often contain escaped backslashes (C:\\Anaconda3\\...) – unescape them.
+    p = (p or "").replace("\\\\", "\\")
+    # Normalize separators and case-insensitive comparison via a forward-slash form.
+    return str(PureWindowsPath(p).as_posix()).lower()
+
+
+class _PrefixMatcher:
     """
-    Best-effort extraction of conflicting paths from conda/mamba error output.
-    We only return paths that appear to be inside the given env prefix.
+    Decides cheaply whether a log line / candidate can be inside the env prefix, so only
+    those candidates are normalized or resolved.
     """
-    if not text:
-        return []
 
-    def _looks_like_windows_abs(p):
-        # Accept a normal Windows path (C:\...) and also log-escaped variants (C:\\...),
-        # since conda/mamba errors often include doubled backslashes.
-        return bool(re.match(r"^[A-Za-z]:\\", p or ""))
-
-    def _normalize_windows_abs(p):
-        # Logs often contain escaped backslashes (C:\\Anaconda3\\...) – unescape them.
-        p = (p or "").replace("\\\\", "\\")
-        # Normalize separators and case-insensitive comparison via a forward-slash form.
-        return str(PureWindowsPath(p).as_posix()).lower()
-
-    prefix_is_win = _looks_like_windows_abs(env_prefix)
-    prefix_cmp = _normalize_windows_abs(env_prefix) if prefix_is_win else str(Path(env_prefix).resolve())
-    if prefix_is_win:
-        # Ensure consistent prefix matching (avoid C:/A matching C:/AB).
-        prefix_cmp = prefix_cmp.rstrip("/")
-
-    # Common patterns include quoted paths, or lines containing "path:".
-    candidates = set()
-
-    # Quoted windows paths: 'C:\\...'
-    for m in re.finditer(r"['\"]([A-Za-z]:\\[^'\"]+)['\"]", text):
-        candidates.add(m.group(1))
-    # Unquoted windows paths: C:\...\something
-    for m in re.finditer(r"([A-Za-z]:\\[^\\s\\r\\n]+)", text):
-        candidates.add(m.group(1))
-    # POSIX paths (for completeness)
-    for m in re.finditer(r"(/[^\\s\\r\\n]+)", text):
-        candidates.add(m.group(1))
-
-    inside = []
-    for p in candidates:
-        if prefix_is_win and _looks_like_windows_abs(p):
-            cand_norm = _normalize_windows_abs(p)
-            if cand_norm == prefix_cmp or cand_norm.startswith(prefix_cmp + "/"):
-                inside.append(str(PureWindowsPath(p.replace("\\\\", "\\"))))
-            continue
+    def __init__(self, env_prefix):
+        self.is_win = _looks_like_windows_abs(env_prefix)
+        if self.is_win:
+            # Ensure consistent prefix matching (avoid C:/A matching C:/AB).
+            self.prefixes = [_normalize_windows_abs(env_prefix).rstrip("/")]
+        else:
+            raw = str(Path(env_prefix)).rstrip("/") or "/"
+            resolved = str(Path(env_prefix).resolve()).rstrip("/") or "/"
+            self.prefixes = sorted({raw, resolved})
+        # Substring that every line mentioning the prefix must contain (fast pre-filter).
+        names = {PureWindowsPath(p).name.lower() if self.is_win else Path(p).name.lower() for p in self.prefixes}
+        self.needles = [n for n in names if n]
+
+    def line_may_match(self, line):
+        if not self.needles:
+            return True
+        lower = line.lower()
+        return any(n in lower for n in self.needles)
 
+    def inside(self, candidate):
+        """
+        Normalized path if `candidate` is inside the prefix, else None.
+        """
+        if self.is_win and _looks_like_windows_abs(candidate):
+            cand_norm = _normalize_windows_abs(candidate)
+            prefix = self.prefixes[0]
+            if cand_norm == prefix or cand_norm.startswith(prefix + "/"):
+                return str(PureWindowsPath(candidate.replace("\\\\", "\\")))
+            return None
+        if not candidate.startswith("/"):
+            return None
+        if not any(candidate == p or candidate.startswith(p.rstrip("/") + "/") for p in self.prefixes):
+            return None
         try:
-            rp = str(Path(p).resolve())
+            rp = str(Path(candidate).resolve())
         except Exception:
-            continue
+            return None
         # Normalize for case-insensitive comparison on Windows prefixes that are not Windows-abs.
-        if rp.lower().startswith(str(prefix_cmp).lower()):
-            inside.append(rp)
-    return sorted(set(inside))
+        if any(rp.lower().startswith(p.lower()) for p in self.prefixes):
+            return rp
+        return None
+
+
+def extract_paths_from_lines(lines, *, env_prefix):
+    """
+    Streaming variant of `extract_paths_from_text`: consume log lines one at a time and
+    return the sorted paths inside `env_prefix`. Lines that cannot mention the prefix are
+    skipped before any regex runs; only candidates under the prefix are resolved.
+    """
+    matcher = _PrefixMatcher(env_prefix)
+    patterns = (_QUOTED_WIN_RE, _WIN_RE) if matcher.is_win else (_POSIX_RE,)
+    seen = set()
+    inside = set()
+    for line in lines:
+        if not line or not matcher.line_may_match(line):
+            continue
+        for pattern in patterns:
+            for m in pattern.finditer(line):
+                cand = m.group(1).rstrip(_TRAILING)
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                path = matcher.inside(cand)
+                if path:
+                    inside.add(path)
+    return sorted(inside)
+
+
+def extract_paths_from_file(log_path, *, env_prefix):
+    """
+    Extract conflict paths from a (possibly huge) log file without loading it into memory.
+    """
+    with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+        return extract_paths_from_lines(f, env_prefix=env_prefix)
+
+
+def extract_paths_from_text(text, *, env_prefix):
+    """
+    Best-effort extraction of conflicting paths from conda/mamba error output.
+    We only return paths that appear to be inside the given env prefix.
+    """
+    if not text:
+        return []
+    return extract_paths_from_lines(text.splitlines(), env_prefix=env_prefix)
 
 
 def build_conda_file_owner_map(env_prefix):
     """
     Map relative file paths (as stored in conda-meta JSON 'files') to package records.
     Returns dict[relpath] = {"name": ..., "version": ..., "build": ..., "record": ...}
+    When several records list the same path, the first record (by filename) wins.
     """
+    index = load_conda_meta_index(env_prefix)
+    if index is None:
+        return {}
     owners = {}
-    root = Path(env_prefix) / "conda-meta"
-    if not root.exists():
-        return owners
-
-    for p in root.glob("*.json"):
-        try:
-            data = json.loads(p.read_text(encoding="utf-8", errors="ignore"))
-        except Exception:
-            continue
-        if not isinstance(data, dict):
-            continue
-        files = data.get("files")
-        if not isinstance(files, list):
-            continue
-        name = data.get("name")
-        version = data.get("version")
-        build = data.get("build") or data.get("build_string")
-        for f in files:
-            if not isinstance(f, str) or not f:
-                continue
-            rel = f.replace("\\", "/").lstrip("/")
-            owners.setdefault(
-                rel,
-                {
-                    "name": name,
-                    "version": version,
-                    "build": build,
-                    "record": p.name,
-                },
-            )
+    for rel, recs in file_owners(index).items():
+        meta = recs[0]["meta"]
+        owners[rel] = {
+            "name": meta.get("name"),
+            "version": meta.get("version"),
+            "build": meta.get("build") or meta.get("build_string"),
+            "record": recs[0]["file"],
+        }
     return owners
 
 
+def conda_owner_of(index, relpath):
+    """
+    Owner of one relpath from the (cached) conda-meta index, in the same shape as
+    `build_conda_file_owner_map` values; None if unowned.
+    """
+    if index is None or not relpath:
+        return None
+    rec = file_owner(index, relpath)
+    if rec is None:
+        return None
+    meta = rec["meta"]
+    return {
+        "name": meta.get("name"),
+        "version": meta.get("version"),
+        "build": meta.get("build") or meta.get("build_string"),
+        "record": rec["file"],
+    }
+
+
 def to_relpath(env_prefix, abs_path):
     try:
         rel = str(Path(abs_path).resolve().relative_to(Path(env_prefix).resolve()))
@@ -5,7 +5,7 @@ from pathlib import Path
 from .subprocess_utils import run_json_cmd
 
 
-def load_conda_channels_from_condarc(*, base_prefix=None):
+def _condarc_paths(base_prefix=None):
     paths = []
     env_condarc = os.environ.get("CONDARC")
     if env_condarc:
@@ -13,33 +13,68 @@ def load_conda_channels_from_condarc(*, base_prefix=None):
     paths.append(Path.home() / ".condarc")
     if base_prefix:
         paths.append(Path(base_prefix) / ".condarc")
+    return paths
 
-    for p in paths:
-        if not p.exists():
+
+def _read_condarc_list(path, key):
+    """
+    Items of a top-level YAML list `key:` in a .condarc (minimal line parser, no YAML dependency).
+    """
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return []
+    in_list = False
+    items = []
+    for line in lines:
+        raw = line.strip()
+        if not raw or raw.startswith("#"):
             continue
-        try:
-            lines = p.read_text(encoding="utf-8", errors="ignore").splitlines()
-        except OSError:
+        if raw.startswith(f"{key}:"):
+            in_list = True
             continue
-        in_channels = False
-        channels = []
-        for line in lines:
-            raw = line.strip()
-            if not raw or raw.startswith("#"):
-                continue
-            if raw.startswith("channels:"):
-                in_channels = True
-                continue
-            if in_channels:
-                if raw.startswith("- "):
-                    channels.append(raw[2:].strip())
-                elif re.match(r"^[A-Za-z0-9_-]+\\s*:", raw):
-                    break
+        if in_list:
+            if raw.startswith("- "):
+                items.append(raw[2:].strip().strip("'\""))
+            elif re.match(r"^[A-Za-z0-9_-]+\s*:", raw):
+                break
+    return items
+
+
+def load_conda_channels_from_condarc(*, base_prefix=None):
+    for p in _condarc_paths(base_prefix):
+        if not p.exists():
+            continue
+        channels = _read_condarc_list(p, "channels")
         if channels:
             return channels
     return []
 
 
+def load_pkgs_dirs(*, base_prefix=None):
+    """
+    Package cache directories without asking conda: $CONDA_PKGS_DIRS, `pkgs_dirs` from
+    .condarc, else conda's defaults (<base>/pkgs, ~/.conda/pkgs). Only existing dirs.
+    """
+    dirs = [d for d in (os.environ.get("CONDA_PKGS_DIRS") or "").split(",") if d.strip()]
+    if not dirs:
+        for p in _condarc_paths(base_prefix):
+            if p.exists():
+                dirs = _read_condarc_list(p, "pkgs_dirs")
+                if dirs:
+                    break
+    if not dirs:
+        if base_prefix:
+            dirs.append(str(Path(base_prefix) / "pkgs"))
+        dirs.append(str(Path.home() / ".conda" / "pkgs"))
+    out = []
+    for d in dirs:
+        path = Path(os.path.expandvars(os.path.expanduser(d.strip())))
+        if path.is_dir() and str(path) not in out:
+            out.append(str(path))
+    return out
+
+
 def load_conda_channels(*, base_prefix=None, has_conda, has_mamba=False, show_json_output=False):
     channels = load_conda_channels_from_condarc(base_prefix=base_prefix)
     if channels:
@@ -0,0 +1,287 @@
+import re
+from itertools import zip_longest
+
+from .conda_meta import index_records
+
+# Same rules as conda.models.version / conda.models.match_spec.
+_VERSION_CHECK_RE = re.compile(r"^[*.+!_0-9a-z]+$")
+_VERSION_SPLIT_RE = re.compile(r"([0-9]+|[*]+|[^0-9*]+)")
+_RELATION_RE = re.compile(r"^(=|==|!=|<=|>=|<|>|~=)(?![=<>!~])(\S+)$")
+_NAME_RE = re.compile(r"([^ =<>!~]+)?([><!=~ ].+)?")
+_VERSION_BUILD_RE = re.compile(r"((?:.+?)[^><!,|]?)(?:(?<![=!|,<>~])(?:[ =])([^-=,|<>~]+?))?$")
+_BRACKET_RE = re.compile(r"""([a-z_]+)\s*=\s*(?:'([^']*)'|"([^"]*)"|([^,\s\]]+))""")
+_FILL = 0
+
+
+def version_order(text):
+    """
+    Parse a conda version like conda's VersionOrder: (version components, local components),
+    each a list of [int | str | inf] runs, epoch first. None if the string is not a valid
+    conda version.
+    """
+    version = (text or "").strip().lower()
+    if not version:
+        return None
+    if not _VERSION_CHECK_RE.match(version):
+        if "-" in version and "_" not in version:
+            version = version.replace("-", "_")
+        if not _VERSION_CHECK_RE.match(version):
+            return None
+    parts = version.split("!")
+    if len(parts) > 2 or (len(parts) == 2 and not parts[0].isdigit()):
+        return None
+    epoch = [parts[0]] if len(parts) == 2 else ["0"]
+    parts = parts[-1].split("+")
+    if len(parts) > 2 or not parts[0]:
+        return None
+    local = parts[1].replace("_", ".").split(".") if len(parts) == 2 else []
+    main = parts[0]
+    if main.endswith("_"):
+        split_version = main[:-1].replace("_", ".").split(".")
+        split_version[-1] += "_"
+    else:
+        split_version = main.replace("_", ".").split(".")
+    result = []
+    for components in (epoch + split_version, local):
+        parsed = []
+        for comp in components:
+            runs = _VERSION_SPLIT_RE.findall(comp)
+            if not runs:
+                return None
+            for j, run in enumerate(runs):
+                if run.isdigit():
+                    runs[j] = int(run)
+                elif run == "post":
+                    runs[j] = float("inf")
+                elif run == "dev":
+                    runs[j] = "DEV"
+            parsed.append(runs if comp[0].isdigit() else [_FILL] + runs)
+        result.append(parsed)
+    return tuple(result)
+
+
+def _eq(t1, t2):
+    for v1, v2 in zip_longest(t1, t2, fillvalue=[]):
+        for c1, c2 in zip_longest(v1, v2, fillvalue=_FILL):
+            if c1 != c2:
+                return False
+    return True
+
+
+def _lt(a, b):
+    for t1, t2 in zip(a, b):
+        for v1, v2 in zip_longest(t1, t2, fillvalue=[]):
+            for c1, c2 in zip_longest(v1, v2, fillvalue=_FILL):
+                if c1 == c2:
+                    continue
+                if isinstance(c1, str):
+                    if not isinstance(c2, str):
+                        return True
+                elif isinstance(c2, str):
+                    return False
+                return c1 < c2
+    return False
+
+
+def compare_versions(a, b):
+    """
+    -1 / 0 / 1 for two parsed conda versions (see `version_order`).
+    """
+    if _eq(a[0], b[0]) and _eq(a[1], b[1]):
+        return 0
+    return -1 if _lt(a, b) else 1
+
+
+def _startswith(a, prefix):
+    if prefix[1]:
+        if not _eq(a[0], prefix[0]):
+            return False
+        t1, t2 = a[1], prefix[1]
+    else:
+        t1, t2 = a[0], prefix[0]
+    nt = len(t2) - 1
+    if not _eq(t1[:nt], t2[:nt]):
+        return False
+    v1 = [] if len(t1) <= nt else t1[nt]
+    v2 = t2[nt]
+    nc = len(v2) - 1
+    if not _eq([v1[:nc]], [v2[:nc]]):
+        return False
+    c1 = _FILL if len(v1) <= nc else v1[nc]
+    c2 = v2[nc]
+    if isinstance(c2, str):
+        return isinstance(c1, str) and c1.startswith(c2)
+    return c1 == c2
+
+
+def _match_relation(op, version, target_text):
+    target = version_order(target_text)
+    if target is None:
+        return None
+    if op == "=":
+        return _startswith(version, target)
+    if op == "!=startswith":
+        return not _startswith(version, target)
+    if op == "~=":
+        base = version_order(".".join(target_text.split(".")[:-1]))
+        return compare_versions(version, target) >= 0 and base is not None and _startswith(version, base)
+    cmp = compare_versions(version, target)
+    return {"==": cmp == 0, "!=": cmp != 0, "<=": cmp <= 0, ">=": cmp >= 0, "<": cmp < 0, ">": cmp > 0}[op]
+
+
+def _match_single(spec, version_text, version):
+    spec = spec.strip()
+    if not spec or spec == "*":
+        return True
+    if spec[0] in "=<>!~":
+        m = _RELATION_RE.match(spec)
+        if not m:
+            return None
+        op, target = m.groups()
+        if target.endswith(".*"):
+            if op == "!=":
+                op = "!=startswith"
+            elif op == "~=":
+                return None
+            target = target[:-2]
+        return _match_relation(op, version, target)
+    if "*" in spec.rstrip("*"):
+        rx = spec.replace(".", r"\.").replace("+", r"\+").replace("*", r".*")
+        return re.match(rf"^(?:{rx})$", version_text.strip().lower()) is not None
+    if spec.endswith("*"):
+        return _match_relation("=", version, spec.rstrip("*").rstrip("."))
+    return _match_relation("==", version, spec)
+
+
+def version_matches(spec, version_text):
+    """
+    Whether an installed version satisfies a conda version spec (`>=1.2,<2|3.*`).
+    None if spec or version cannot be evaluated (regex/parenthesized specs, invalid versions).
+    """
+    if spec is None or spec.strip() in ("", "*"):
+        return True
+    if "(" in spec or ")" in spec or spec.strip().startswith("^"):
+        return None
+    version = version_order(version_text)
+    if version is None:
+        return None
+    unknown = False
+    for alternative in spec.split("|"):
+        results = [_match_single(part, version_text, version) for part in alternative.split(",")]
+        if all(r is True for r in results):
+            return True
+        if None in results and False not in results:
+            unknown = True
+    return None if unknown else False
+
+
+def build_matches(spec, build):
+    if spec is None or spec.strip() in ("", "*"):
+        return True
+    spec = spec.strip()
+    if "*" in spec:
+        rx = re.escape(spec).replace(r"\*", ".*")
+        return re.match(rf"^{rx}$", build or "") is not None
+    return spec == (build or "")
+
+
+def parse_match_spec(text):
+    """
+    A conda match spec (`python >=3.9,<3.10.0a0`, `python_abi 3.13.* *_cp313`, `numpy=1.26`,
+    `conda-forge::pkg[version='>=1']`) -> {"name", "version", "build"} or None.
+    """
+    spec = (text or "").strip()
+    if not spec:
+        return None
+    brackets = {}
+    if spec.endswith("]") and "[" in spec:
+        spec, _sep, inner = spec.partition("[")
+        for m in _BRACKET_RE.finditer(inner[:-1]):
+            brackets[m.group(1)] = next(g for g in m.groups()[1:] if g is not None)
+        spec = spec.strip()
+    if "::" in spec:
+        spec = spec.rsplit("::", 1)[1]
+    m = _NAME_RE.match(spec)
+    if not m or not m.group(1):
+        return None
+    name, rest = m.groups()
+    version = build = None
+    rest = (rest or "").strip()
+    if rest:
+        parts = _VERSION_BUILD_RE.search(rest)
+        if parts:
+            version, build = parts.groups()
+            build = build and build.strip()
+        else:
+            version = rest
+        version = version and version.replace(" ", "")
+        if version and version not in ("=", "==") and version[0] == "=":
+            test = version[1:]
+            if version[:2] == "==" and build is None:
+                version = version[2:]
+            elif not any(c in test for c in "=,|"):
+                version = test + "*" if build is None and test[-1] != "*" else test
+    return {
+        "name": name,
+        "version": brackets.get("version", version),
+        "build": brackets.get("build", build),
+    }
+
+
+def spec_matches(spec, meta):
+    """
+    True/False/None (undecidable) for a parsed match spec against an installed record's meta.
+    """
+    version = version_matches(spec["version"], str(meta.get("version") or ""))
+    if version is False:
+        return False
+    if not build_matches(spec["build"], meta.get("build") or meta.get("build_string")):
+        return False
+    return version
+
+
+def check_conda_dependencies(index):
+    """
+    Evaluate every installed record's `depends` / `constrains` against the installed records
+    (no solver). Virtual packages (`__glibc`, ...) are skipped. Returns a list of
+    {"package", "version", "build", "kind": depends|constrains, "spec", "dependency",
+    "installed": "<version> <build>" | None}.
+    """
+    installed = {}
+    for rec in index_records(index):
+        name = str(rec["meta"].get("name") or "").lower()
+        if name:
+            installed.setdefault(name, rec["meta"])
+    unsatisfied = []
+    for rec in index_records(index):
+        meta = rec["meta"]
+        for kind in ("depends", "constrains"):
+            for text in meta.get(kind) or []:
+                if not isinstance(text, str):
+                    continue
+                spec = parse_match_spec(text)
+                if spec is None or spec["name"].startswith("__"):
+                    continue
+                target = installed.get(spec["name"].lower())
+                if target is None:
+                    if kind == "constrains":
+                        continue
+                    ok = False
+                else:
+                    ok = spec_matches(spec, target) is not False
+                if ok:
+                    continue
+                unsatisfied.append(
+                    {
+                        "package": meta.get("name"),
+                        "version": meta.get("version"),
+                        "build": meta.get("build") or meta.get("build_string"),
+                        "kind": kind,
+                        "spec": text,
+                        "dependency": spec["name"],
+                        "installed": f"{target.get('version')} {target.get('build') or target.get('build_string') or ''}".strip()
+                        if target is not None
+                        else None,
+                    }
+                )
+    return unsatisfied
@@ -0,0 +1,455 @@
+import concurrent.futures
+import json
+import os
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+from .cache import cache_path, load_json_cache, save_json_cache
+from .discovery import find_site_packages
+from .dist_meta import iter_dist_infos, read_dist_name_version
+from .record_stream import HEAVY_KEYS, iter_record_files, open_record, read_record_header
+
+KNOWN_SUBDIRS = {
+    "noarch",
+    "linux-32",
+    "linux-64",
+    "linux-aarch64",
+    "linux-armv6l",
+    "linux-armv7l",
+    "linux-ppc64le",
+    "linux-s390x",
+    "osx-64",
+    "osx-arm64",
+    "win-32",
+    "win-64",
+    "win-arm64",
+    "emscripten-wasm32",
+    "wasi-wasm32",
+    "zos-z",
+}
+
+# Hosts whose channel URLs `conda list` shortens to the channel path (conda-forge, pkgs/main, ...).
+_SHORT_CHANNEL_HOSTS = {"conda.anaconda.org", "repo.anaconda.com", "anaconda.org"}
+
+
+def conda_meta_dir(env_path):
+    return Path(env_path) / "conda-meta"
+
+
+INDEX_VERSION = 2
+VERDICT_VERSION = 1
+# Small envs parse in milliseconds; only persist the index where it pays off.
+PERSIST_MIN_RECORDS = 64
+# Records at least this large are streamed instead of loaded with `json.loads`.
+STREAM_MIN_BYTES = 2 * 1024 * 1024
+
+# Indexes of the most recently used envs (a full run touches one env at a time, parallel
+# scans at most a few).
+_INDEX_MEMO = {}
+_INDEX_MEMO_MAX = 4
+_INDEX_MEMO_LOCK = threading.Lock()
+
+
+def _stat_conda_meta(root):
+    """
+    Return {filename: [size, mtime_ns]} for conda-meta/*.json (single scandir), or None if unreadable.
+    """
+    out = {}
+    try:
+        with os.scandir(root) as it:
+            for e in it:
+                if not e.name.endswith(".json"):
+                    continue
+                try:
+                    if not e.is_file():
+                        continue
+                    st = e.stat()
+                except OSError:
+                    continue
+                out[e.name] = [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+    return out
+
+
+def _normalize_files(files):
+    if not isinstance(files, list):
+        return None
+    return [f.replace("\\", "/").lstrip("/") for f in files if isinstance(f, str) and f]
+
+
+def _parse_record_file(path, size, mtime_ns):
+    rec = {"file": path.name, "size": size, "mtime_ns": mtime_ns, "valid": False, "keys": [], "meta": None, "files": None}
+    try:
+        if size >= STREAM_MIN_BYTES:
+            # Huge records (qt, libboost, cuda-*): read in chunks and validated, but only the
+            # header is kept; `record_files` streams the file list again when it is needed.
+            with open_record(path) as f:
+                meta, keys = read_record_header(f)
+            rec["streamed"] = str(path)
+            files = None
+        else:
+            data = json.loads(path.read_bytes().decode("utf-8"))
+            if not isinstance(data, dict):
+                return rec
+            keys = list(data.keys())
+            meta = {k: v for k, v in data.items() if k not in HEAVY_KEYS}
+            files = data.get("files")
+    except Exception:
+        return rec
+    rec["valid"] = True
+    rec["keys"] = sorted(keys)
+    rec["meta"] = meta
+    rec["files"] = _normalize_files(files)
+    return rec
+
+
+def _map_parallel(fn, items):
+    if len(items) < 8:
+        return [fn(item) for item in items]
+    workers = min(16, (os.cpu_count() or 1) * 2, len(items))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fn, items))
+
+
+def _parse_records(root, todo):
+    return _map_parallel(lambda item: _parse_record_file(root / item[0], *item[1]), todo)
+
+
+def _memo_get(key):
+    with _INDEX_MEMO_LOCK:
+        index = _INDEX_MEMO.pop(key, None)
+        if index is not None:
+            _INDEX_MEMO[key] = index
+        return index
+
+
+def _memo_put(key, index):
+    with _INDEX_MEMO_LOCK:
+        _INDEX_MEMO.pop(key, None)
+        _INDEX_MEMO[key] = index
+        while len(_INDEX_MEMO) > _INDEX_MEMO_MAX:
+            _INDEX_MEMO.pop(next(iter(_INDEX_MEMO)))
+
+
+def clear_index_cache():
+    """
+    Drop the in-process index memo only. The persisted index and verdict caches stay; they
+    are keyed by record size/mtime and revalidated on the next load.
+    """
+    with _INDEX_MEMO_LOCK:
+        _INDEX_MEMO.clear()
+
+
+def load_conda_meta_index(env_path, *, use_cache=True):
+    """
+    Parse <env>/conda-meta/*.json once and return an index dict:
+      {"env": ..., "stats": {file: [size, mtime_ns]}, "records": [record, ...]}
+    Each record: file, size, mtime_ns, valid, keys (top-level keys), meta (record minus
+    files/paths_data), files (normalized relpaths or None).
+
+    Records are reused from the in-process memo and the persisted cache
+    (`.env_repair/cache`, large envs only) when size and mtime are unchanged;
+    everything else is parsed in parallel. Returns None if the env has no conda-meta directory.
+    """
+    root = conda_meta_dir(env_path)
+    stats = _stat_conda_meta(root)
+    if stats is None:
+        return None
+    key = os.path.abspath(str(env_path))
+    memo = _memo_get(key)
+    if memo is not None and memo["stats"] == stats:
+        return memo
+
+    persist = use_cache and len(stats) >= PERSIST_MIN_RECORDS
+    cache_file = cache_path("conda-meta-index", key) if persist else None
+    previous = {}
+    for rec in (memo or {}).get("records") or []:
+        previous[rec["file"]] = rec
+    if persist and len(previous) < len(stats):
+        cached = load_json_cache(cache_file, version=INDEX_VERSION)
+        for rec in (cached or {}).get("records") or []:
+            if isinstance(rec, dict) and isinstance(rec.get("file"), str):
+                previous.setdefault(rec["file"], rec)
+
+    records = []
+    todo = []
+    for name, (size, mtime_ns) in stats.items():
+        old = previous.get(name)
+        if old is not None and old.get("size") == size and old.get("mtime_ns") == mtime_ns:
+            records.append(old)
+        else:
+            todo.append((name, (size, mtime_ns)))
+    records.extend(_parse_records(root, todo))
+    records.sort(key=lambda r: r["file"].lower())
+
+    index = {"env": key, "stats": stats, "records": records}
+    if persist and todo:
+        save_json_cache(cache_file, {"records": records}, version=INDEX_VERSION)
+    _memo_put(key, index)
+    return index
+
+
+def record_verdict(keys, meta):
+    """
+    "ok" or "missing-depends" for a parsed record (`keys`: its top-level keys).
+    """
+    keys = set(keys)
+    if "depends" in keys:
+        return "ok"
+    # Some helper/ABI records can legitimately omit `depends`.
+    # Treat missing `depends` as broken when the record otherwise looks like a
+    # real package metadata record (not just a minimal helper marker).
+    is_platform_record = not bool((meta or {}).get("noarch"))
+    looks_real_record = bool(keys & {"subdir", "files", "url", "channel", "md5", "sha256", "build_number"})
+    is_incomplete = not all(k in keys for k in ("name", "version", "build"))
+    if is_incomplete or (is_platform_record and looks_real_record):
+        return "missing-depends"
+    return "ok"
+
+
+def _judge_record_file(path):
+    try:
+        text = path.read_bytes().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return "invalid-json"
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return "invalid-json"
+    if not isinstance(data, dict):
+        return "invalid-json"
+    return record_verdict(data.keys(), data)
+
+
+def conda_meta_verdicts(env_path, *, strict=False):
+    """
+    Validate conda-meta records: {filename: "ok" | "invalid-json" | "missing-depends"}.
+
+    Reuses the in-process index when it is current. Otherwise every new or changed record
+    gets a full `json.loads` (in parallel); only records whose cached size/mtime is unchanged
+    are skipped (large envs only). `strict=True` ignores the cache. Returns None if the env
+    has no conda-meta directory.
+    """
+    root = conda_meta_dir(env_path)
+    stats = _stat_conda_meta(root)
+    if stats is None:
+        return None
+    key = os.path.abspath(str(env_path))
+    memo = _memo_get(key)
+    if memo is not None and memo["stats"] == stats:
+        return {
+            rec["file"]: record_verdict(rec["keys"], rec["meta"]) if rec["valid"] else "invalid-json"
+            for rec in memo["records"]
+        }
+
+    persist = not strict and len(stats) >= PERSIST_MIN_RECORDS
+    cache_file = cache_path("conda-meta-verdicts", key) if persist else None
+    cached = (load_json_cache(cache_file, version=VERDICT_VERSION) or {}) if persist else {}
+    verdicts = {}
+    todo = []
+    for name, (size, mtime_ns) in stats.items():
+        old = cached.get(name) if isinstance(cached, dict) else None
+        if isinstance(old, list) and len(old) == 3 and old[0] == size and old[1] == mtime_ns:
+            verdicts[name] = old[2]
+        else:
+            todo.append(name)
+    for name, verdict in zip(todo, _map_parallel(lambda n: _judge_record_file(root / n), todo)):
+        verdicts[name] = verdict
+    if persist and todo:
+        save_json_cache(cache_file, {n: [*stats[n], verdicts[n]] for n in stats}, version=VERDICT_VERSION)
+    return verdicts
+
+
+def index_records(index, *, valid_only=True):
+    for rec in (index or {}).get("records") or []:
+        if valid_only and not rec.get("valid"):
+            continue
+        yield rec
+
+
+def find_package_records(index, name):
+    """
+    Valid records whose package name matches `name` (case-insensitive).
+    """
+    want = (name or "").lower()
+    return [r for r in index_records(index) if str(r["meta"].get("name") or "").lower() == want]
+
+
+def file_owners(index):
+    """
+    Map relpath -> list of records listing it in `files` (built lazily, once per index).
+    """
+    owners = index.get("owners")
+    if owners is None:
+        owners = {}
+        for rec in index_records(index):
+            for f in record_files(rec):
+                owners.setdefault(f, []).append(rec)
+        index["owners"] = owners
+    return owners
+
+
+def file_owner(index, relpath):
+    owners = file_owners(index).get((relpath or "").replace("\\", "/").lstrip("/"))
+    return owners[0] if owners else None
+
+
+def record_files(rec):
+    """
+    Iterate a record's files (normalized relpaths). Large records keep no list in the index:
+    their `files` are streamed from disk again.
+    """
+    if rec.get("files") is not None:
+        yield from rec["files"]
+        return
+    if not rec.get("streamed") or "files" not in rec.get("keys", ()):
+        return
+    try:
+        with open_record(rec["streamed"]) as f:
+            for item in iter_record_files(f):
+                if isinstance(item, str) and item:
+                    yield item.replace("\\", "/").lstrip("/")
+    except (OSError, ValueError):
+        return
+
+
+def site_packages_files(rec):
+    """
+    Files of a record that live under a site-packages directory (any platform layout).
+    """
+    return [f for f in record_files(rec) if "site-packages/" in f.lower()]
+
+
+def _split_channel_url(value, *, subdir=None):
+    """
+    Return (base_url, channel_name) for a channel/url string as stored in conda-meta.
+    """
+    value = (value or "").strip()
+    if not value:
+        return "", ""
+    if "://" not in value:
+        # Already a canonical name (micromamba / newer conda write e.g. "conda-forge").
+        name = value.rstrip("/")
+        return f"https://conda.anaconda.org/{name}", name
+    parsed = urlparse(value)
+    parts = [p for p in parsed.path.split("/") if p]
+    if parts and (parts[-1].endswith(".conda") or parts[-1].endswith(".tar.bz2")):
+        parts = parts[:-1]
+    if parts and (parts[-1] in KNOWN_SUBDIRS or parts[-1] == subdir):
+        parts = parts[:-1]
+    if len(parts) >= 2 and parts[0] == "t":
+        # Token-authenticated URL: /t/<token>/<channel>
+        parts = parts[2:]
+    base_url = f"{parsed.scheme}://{parsed.netloc}/" + "/".join(parts)
+    if (parsed.hostname or "").lower() in _SHORT_CHANNEL_HOSTS and parts:
+        return base_url, "/".join(parts)
+    return base_url, base_url
+
+
+def channel_name(record):
+    """
+    Channel name as `conda list --json` reports it (e.g. "conda-forge", "pkgs/main").
+    """
+    schannel = record.get("schannel")
+    subdir = record.get("subdir")
+    if isinstance(schannel, str) and schannel:
+        return schannel
+    for key in ("channel", "url"):
+        value = record.get(key)
+        if isinstance(value, str) and value:
+            return _split_channel_url(value, subdir=subdir)[1]
+    return ""
+
+
+def record_to_entry(record):
+    """
+    Convert a conda-meta record into a `conda list --json` style entry (None if incomplete).
+    """
+    name = record.get("name")
+    version = record.get("version")
+    build = record.get("build") or record.get("build_string")
+    if not (isinstance(name, str) and isinstance(version, str) and isinstance(build, str)):
+        return None
+    subdir = record.get("subdir")
+    base_url = ""
+    for key in ("channel", "url"):
+        value = record.get(key)
+        if isinstance(value, str) and value:
+            base_url = _split_channel_url(value, subdir=subdir)[0]
+            break
+    build_number = record.get("build_number")
+    return {
+        "base_url": base_url,
+        "build_number": build_number if isinstance(build_number, int) else 0,
+        "build_string": build,
+        "channel": channel_name(record),
+        "dist_name": f"{name}-{version}-{build}",
+        "name": name,
+        "platform": subdir if isinstance(subdir, str) else "",
+        "version": version,
+    }
+
+
+def pypi_entry(name, version):
+    # `conda list` reports pip dists with conda-style names (lowercase, '-' separators).
+    conda_name = name.lower().replace("_", "-").replace(".", "-")
+    return {
+        "base_url": "https://pypi.org/",
+        "build_number": 0,
+        "build_string": "pypi_0",
+        "channel": "pypi",
+        "dist_name": f"{conda_name}-{version}-pypi_0",
+        "name": conda_name,
+        "platform": "pypi",
+        "version": version,
+    }
+
+
+def owned_dist_dirs(files):
+    """
+    Collect lowercase `*.dist-info` / `*.egg-info` names (directly in site-packages) listed by a record.
+    """
+    owned = set()
+    for f in files or []:
+        if not isinstance(f, str):
+            continue
+        rel = f.replace("\\", "/")
+        lower = rel.lower()
+        if "site-packages/" not in lower or ("-info" not in lower):
+            continue
+        tail = rel[lower.index("site-packages/") + len("site-packages/") :]
+        top = tail.split("/", 1)[0]
+        if top.lower().endswith((".dist-info", ".egg-info")):
+            owned.add(top.lower())
+    return owned
+
+
+def read_conda_package_entries(env_path):
+    """
+    Build the same entries as `conda list -p <env> --json` directly from disk:
+      - one entry per conda-meta/*.json record
+      - one `pypi` entry per site-packages dist-info/egg-info not owned by a conda record
+    Returns None if the env has no conda-meta directory.
+    """
+    index = load_conda_meta_index(env_path)
+    if index is None:
+        return None
+    entries = []
+    owned = set()
+    for rec in index_records(index):
+        entry = record_to_entry(rec["meta"])
+        if entry is None:
+            continue
+        entries.append(entry)
+        owned |= owned_dist_dirs(site_packages_files(rec))
+
+    for site_pkg in find_site_packages(env_path):
+        for dist in iter_dist_infos(site_pkg):
+            if dist.name.lower() in owned:
+                continue
+            name, version = read_dist_name_version(dist)
+            if name and version:
+                entries.append(pypi_entry(name, version))
+    return sorted(entries, key=lambda e: (e["name"].lower(), e["channel"] == "pypi"))
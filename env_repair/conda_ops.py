@@ -5,6 +5,9 @@ import subprocess
 import sys
 from pathlib import Path
 
+from .conda_meta import read_conda_package_entries
+from .dist_meta import package_list_mode, report_entry_mismatch
+from .history import parse_history
 from .subprocess_utils import run_cmd_capture, run_cmd_live, run_cmd_live_capture, run_cmd_stdout_to_file, run_json_cmd
 
 
@@ -114,6 +117,27 @@ def ensure_mamba(*, base_prefix):
 
 
 def get_env_package_entries(env_path, manager, *, show_json_output):
+    """
+    Return `conda list --json` style entries for the env.
+
+    By default entries are read directly from conda-meta + site-packages (no conda CLI).
+    ENV_REPAIR_PACKAGE_LIST=cli forces the manager CLI; =verify runs both, reports
+    differences on stderr and returns the CLI result.
+    """
+    mode = package_list_mode()
+    native = None
+    if mode != "cli":
+        native = read_conda_package_entries(env_path)
+        if native is not None and mode == "native":
+            return native
+    cli = _cli_package_entries(env_path, manager, show_json_output=show_json_output)
+    if native is not None and mode == "verify":
+        report_entry_mismatch(env_path, native, cli)
+        return cli or native
+    return cli
+
+
+def _cli_package_entries(env_path, manager, *, show_json_output):
     if manager == "micromamba":
         cmd = ["micromamba", "list", "-p", env_path, "--json"]
     elif manager == "mamba":
@@ -207,10 +231,14 @@ def env_update_from_yaml(env_path, manager, yaml_path):
 def list_revisions(env_path):
     """
     Returns a sorted list of available revision numbers for the env.
-    Uses `conda list --revisions` (text output) and parses the leading revision column.
+    Read from `conda-meta/history`; `conda list --revisions` is only asked if the file is missing.
     """
     import re
 
+    revisions = parse_history(env_path)
+    if revisions:
+        return [r["rev"] for r in revisions]
+
     if shutil.which("conda"):
         cmd = ["conda", "list", "--revisions", "-p", env_path]
     elif shutil.which("mamba"):
@@ -223,12 +251,10 @@ def list_revisions(env_path):
         return []
     revs = []
     for line in out.splitlines():
-        m = re.match(r"^\\s*(\\d+)\\s+", line)
+        # "2024-01-02 10:11:12  (rev 3)"
+        m = re.search(r"\(rev\s+(\d+)\)", line)
         if m:
-            try:
-                revs.append(int(m.group(1)))
-            except ValueError:
-                pass
+            revs.append(int(m.group(1)))
     return sorted(set(revs))
 
 
@@ -246,6 +272,34 @@ def rollback_to_revision(env_path, revision, *, dry_run):
     return run_cmd_live(cmd) == 0
 
 
+def install_explicit(env_path, manager, explicit_file, *, dry_run):
+    """
+    Install an `@EXPLICIT` spec file: exact builds, no solve (cached packages are not downloaded).
+    """
+    runner = manager if manager in ("micromamba", "mamba", "conda") else _pick_runner()
+    if not runner:
+        return False
+    cmd = [runner, "install", "-y", "-p", env_path, "--file", str(explicit_file)]
+    if dry_run:
+        cmd.insert(2, "--dry-run")
+    return run_cmd_live(cmd) == 0
+
+
+def remove_forced(env_path, manager, packages, *, dry_run):
+    """
+    Remove exactly `packages` (`--force`: no solve, dependents are left alone).
+    """
+    if not packages:
+        return True
+    runner = manager if manager in ("micromamba", "mamba", "conda") else _pick_runner()
+    if not runner:
+        return False
+    cmd = [runner, "remove", "-y", "--force", "-p", env_path] + list(packages)
+    if dry_run:
+        cmd.insert(2, "--dry-run")
+    return run_cmd_live(cmd) == 0
+
+
 def env_create_from_yaml(*, manager, src_yaml, target, target_is_path):
     if manager == "micromamba":
         # micromamba supports env create -f and -p
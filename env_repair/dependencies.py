@@ -0,0 +1,491 @@
+import os
+import platform
+import re
+import sys
+from pathlib import Path
+
+from .conda_meta import find_package_records, load_conda_meta_index
+from .dist_meta import is_dist_metadata_name, iter_dist_infos, read_dist_name_version, read_metadata_headers
+from .naming import normalize_name
+from .ownership import REPORT_LIMIT
+from .scan import python_abi_tag_for
+
+# PEP 440 (same grammar as `packaging.version`).
+_VERSION_RE = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+_PRE_LABELS = {"a": "a", "alpha": "a", "b": "b", "beta": "b", "c": "rc", "pre": "rc", "preview": "rc", "rc": "rc"}
+_SPEC_RE = re.compile(r"^\s*(===|==|!=|~=|<=|>=|<|>)\s*(\S+)\s*$")
+_REQ_RE = re.compile(r"^\s*(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[(?P<extras>[^\]]*)\])?\s*(?P<rest>.*)$")
+_MARKER_TOKEN_RE = re.compile(r"""\s*(?:(?P<str>'[^']*'|"[^"]*")|(?P<op>===|==|!=|<=|>=|~=|<|>)|(?P<paren>[()])|(?P<word>[A-Za-z_][A-Za-z0-9_.]*))""")
+# Legacy (PEP 345 / setuptools) marker variable spellings.
+_MARKER_ALIASES = {
+    "os.name": "os_name",
+    "sys.platform": "sys_platform",
+    "platform.version": "platform_version",
+    "platform.machine": "platform_machine",
+    "platform.python_implementation": "platform_python_implementation",
+    "python_implementation": "platform_python_implementation",
+}
+
+# Sentinels so None parts sort before (_LOW) or after (_HIGH) any real value.
+_LOW = (0,)
+_HIGH = (2,)
+
+
+def parse_version(text):
+    """
+    Parse a PEP 440 version into {"epoch", "release", "pre", "post", "dev", "local", "key"}
+    (`key` sorts like packaging.version.Version). None for legacy/invalid versions.
+    """
+    m = _VERSION_RE.match(text or "")
+    if not m:
+        return None
+    release = tuple(int(p) for p in m.group("release").split("."))
+    pre = (_PRE_LABELS[m.group("pre_l").lower()], int(m.group("pre_n") or 0)) if m.group("pre_l") else None
+    if m.group("post_n1"):
+        post = int(m.group("post_n1"))
+    elif m.group("post_l"):
+        post = int(m.group("post_n2") or 0)
+    else:
+        post = None
+    dev = int(m.group("dev_n") or 0) if m.group("dev_l") else None
+    local = tuple(p.lower() for p in re.split(r"[-_.]", m.group("local"))) if m.group("local") else None
+    version = {"epoch": int(m.group("epoch") or 0), "release": release, "pre": pre, "post": post, "dev": dev, "local": local}
+    version["key"] = _version_key(version)
+    return version
+
+
+def _version_key(v):
+    release = list(v["release"])
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    if v["pre"] is None and v["post"] is None and v["dev"] is not None:
+        pre = _LOW
+    elif v["pre"] is None:
+        pre = _HIGH
+    else:
+        pre = (1, v["pre"])
+    post = _LOW if v["post"] is None else (1, v["post"])
+    dev = _HIGH if v["dev"] is None else (1, v["dev"])
+    if v["local"] is None:
+        local = _LOW
+    else:
+        local = (1, tuple((1, int(p), "") if p.isdigit() else (0, 0, p) for p in v["local"]))
+    return (v["epoch"], tuple(release), pre, post, dev, local)
+
+
+def _public(v):
+    return {**v, "local": None, "key": _version_key({**v, "local": None})}
+
+
+def _base_key(v):
+    return _version_key({**v, "pre": None, "post": None, "dev": None, "local": None})
+
+
+def _is_prerelease(v):
+    return v["pre"] is not None or v["dev"] is not None
+
+
+def _prefix_match(candidate, prefix_text):
+    prefix = parse_version(prefix_text)
+    if prefix is None or candidate["epoch"] != prefix["epoch"]:
+        return False
+    want = prefix["release"]
+    have = candidate["release"] + (0,) * max(0, len(want) - len(candidate["release"]))
+    if have[: len(want)] != want:
+        return False
+    # `==1.0rc1.*` style prefixes also pin the pre/post part.
+    for part in ("pre", "post", "dev"):
+        if prefix[part] is not None and candidate[part] != prefix[part]:
+            return False
+    return True
+
+
+def specifier_contains(op, spec_text, candidate):
+    """
+    Whether parsed version `candidate` satisfies one clause (`op`, `spec_text`).
+    Pre-releases are accepted, as `pip check` does.
+    """
+    if op == "===":
+        return False
+    if op in ("==", "!=") and spec_text.endswith(".*"):
+        matched = _prefix_match(_public(candidate), spec_text[:-2])
+        return matched if op == "==" else not matched
+    spec = parse_version(spec_text)
+    if spec is None:
+        return False
+    if op in ("==", "!="):
+        cand = candidate if spec["local"] is not None else _public(candidate)
+        equal = cand["key"] == spec["key"]
+        return equal if op == "==" else not equal
+    cand = _public(candidate)
+    if op == "~=":
+        if len(spec["release"]) < 2:
+            return False
+        prefix = ".".join(str(p) for p in spec["release"][:-1])
+        if spec["epoch"]:
+            prefix = f"{spec['epoch']}!{prefix}"
+        return cand["key"] >= spec["key"] and _prefix_match(cand, prefix)
+    if op == "<=":
+        return cand["key"] <= spec["key"]
+    if op == ">=":
+        return cand["key"] >= spec["key"]
+    if op == "<":
+        if not cand["key"] < spec["key"]:
+            return False
+        # `<1.0` does not admit 1.0 pre-releases unless the bound itself is one.
+        return _is_prerelease(spec) or not _is_prerelease(cand) or _base_key(cand) != _base_key(spec)
+    if op == ">":
+        if not cand["key"] > spec["key"]:
+            return False
+        same_base = _base_key(candidate) == _base_key(spec)
+        if spec["post"] is None and candidate["post"] is not None and same_base:
+            return False
+        return not (candidate["local"] is not None and same_base)
+    return False
+
+
+def parse_specifier_set(text):
+    """
+    "(>=1.0, !=1.3.*)" -> [(op, version)]. Raises ValueError on an invalid clause.
+    """
+    text = (text or "").strip()
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    clauses = []
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        m = _SPEC_RE.match(part)
+        if not m:
+            raise ValueError(f"invalid specifier: {part.strip()}")
+        clauses.append((m.group(1), m.group(2)))
+    return clauses
+
+
+def version_satisfies(version_text, clauses):
+    """
+    True/False for an installed version against parsed clauses; None if the version is not
+    PEP 440 (only `===` can match those).
+    """
+    candidate = parse_version(version_text)
+    if candidate is None:
+        if clauses and all(op == "===" for op, _ in clauses):
+            return all(version_text.strip().lower() == v.lower() for _, v in clauses)
+        return None if clauses else True
+    for op, spec in clauses:
+        if op == "===":
+            if version_text.strip().lower() != spec.lower():
+                return False
+        elif not specifier_contains(op, spec, candidate):
+            return False
+    return True
+
+
+def parse_requirement(text):
+    """
+    PEP 508 requirement -> {"name", "extras", "specifier", "url", "marker"} (specifier is a
+    clause list, marker the unparsed marker text). None if the line cannot be parsed.
+    """
+    m = _REQ_RE.match(text or "")
+    if not m:
+        return None
+    rest = m.group("rest").strip()
+    url = None
+    marker = None
+    if rest.startswith("@"):
+        parts = re.split(r"\s+;", rest[1:], maxsplit=1)
+        url = parts[0].strip()
+        marker = parts[1].strip() if len(parts) > 1 else None
+        spec_text = ""
+    else:
+        spec_text, _sep, marker_text = rest.partition(";")
+        marker = marker_text.strip() or None
+    try:
+        specifier = parse_specifier_set(spec_text)
+    except ValueError:
+        return None
+    extras = [e.strip() for e in (m.group("extras") or "").split(",") if e.strip()]
+    return {"name": m.group("name"), "extras": extras, "specifier": specifier, "url": url, "marker": marker}
+
+
+def _tokenize_marker(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = _MARKER_TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"invalid marker: {text}")
+        pos = m.end()
+        if m.group("str") is not None:
+            tokens.append(("str", m.group("str")[1:-1]))
+        elif m.group("op"):
+            tokens.append(("op", m.group("op")))
+        elif m.group("paren"):
+            tokens.append((m.group("paren"), m.group("paren")))
+        else:
+            word = m.group("word")
+            if word in ("and", "or", "in"):
+                tokens.append((word, word))
+            elif word == "not":
+                tokens.append(("not", word))
+            else:
+                tokens.append(("var", _MARKER_ALIASES.get(word, word)))
+    return tokens
+
+
+def _compare_marker(lhs, op, rhs, variable):
+    if op == "in":
+        return lhs in rhs
+    if op == "not in":
+        return lhs not in rhs
+    if variable == "extra":
+        lhs, rhs = normalize_name(lhs), normalize_name(rhs)
+    elif op != "===":
+        candidate = parse_version(lhs)
+        if candidate is not None and (parse_version(rhs) is not None or (op in ("==", "!=") and rhs.endswith(".*"))):
+            return specifier_contains(op, rhs, candidate)
+    if op in ("==", "==="):
+        return lhs == rhs
+    if op == "!=":
+        return lhs != rhs
+    # Ordering on non-version strings is undefined in PEP 508.
+    return False
+
+
+def evaluate_marker(text, environment):
+    """
+    Evaluate a PEP 508 environment marker against `environment` (variable -> str).
+    Unknown variables evaluate as "". Raises ValueError on syntax errors.
+    """
+    tokens = _tokenize_marker(text)
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def take(kind=None):
+        nonlocal pos
+        if pos >= len(tokens) or (kind and tokens[pos][0] != kind):
+            raise ValueError(f"invalid marker: {text}")
+        pos += 1
+        return tokens[pos - 1]
+
+    def value():
+        kind, val = take()
+        if kind == "str":
+            return val, None
+        if kind == "var":
+            return str(environment.get(val, "")), val
+        raise ValueError(f"invalid marker: {text}")
+
+    def atom():
+        if peek() == "(":
+            take("(")
+            result = or_expr()
+            take(")")
+            return result
+        lhs, lvar = value()
+        kind = peek()
+        if kind == "op":
+            op = take()[1]
+        elif kind == "in":
+            take()
+            op = "in"
+        elif kind == "not":
+            take()
+            take("in")
+            op = "not in"
+        else:
+            raise ValueError(f"invalid marker: {text}")
+        rhs, rvar = value()
+        return _compare_marker(lhs, op, rhs, lvar or rvar)
+
+    def and_expr():
+        result = atom()
+        while peek() == "and":
+            take()
+            result = atom() and result
+        return result
+
+    def or_expr():
+        result = and_expr()
+        while peek() == "or":
+            take()
+            result = and_expr() or result
+        return result
+
+    result = or_expr()
+    if pos != len(tokens):
+        raise ValueError(f"invalid marker: {text}")
+    return result
+
+
+def _python_full_version(env_path, conda):
+    index = load_conda_meta_index(env_path) if conda else None
+    if index is not None:
+        for rec in find_package_records(index, "python"):
+            version = rec["meta"].get("version")
+            if isinstance(version, str) and version:
+                return version
+    try:
+        text = (Path(env_path) / "pyvenv.cfg").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and key.strip().lower() in ("version", "version_info"):
+            return value.strip()
+    return None
+
+
+def marker_environment(env_path, site_pkgs, *, conda=True):
+    """
+    PEP 508 marker variables for an env's interpreter, derived without starting it: the
+    Python version from conda-meta / pyvenv.cfg / the site-packages layout, platform facts
+    from the host the env lives on.
+    """
+    abi_tag = None
+    for site_pkg in site_pkgs or []:
+        abi_tag = python_abi_tag_for(site_pkg, env_path)
+        if abi_tag:
+            break
+    short = f"{abi_tag[2]}.{abi_tag[3:]}" if abi_tag else f"{sys.version_info[0]}.{sys.version_info[1]}"
+    full = _python_full_version(env_path, conda) if env_path else None
+    if not full or not full.startswith(short):
+        full = short if abi_tag else platform.python_version()
+    return {
+        "python_version": short,
+        "python_full_version": full,
+        "implementation_version": full,
+        "implementation_name": "cpython",
+        "platform_python_implementation": "CPython",
+        "os_name": os.name,
+        "sys_platform": sys.platform,
+        "platform_system": platform.system(),
+        "platform_machine": platform.machine(),
+        "platform_release": platform.release(),
+        "platform_version": platform.version(),
+        "extra": "",
+    }
+
+
+def _egg_info_requires(dist_info):
+    """
+    Unconditional requirements from an egg-info `requires.txt` (extras sections skipped,
+    `[:marker]` sections turned into markers).
+    """
+    try:
+        text = (Path(dist_info) / "requires.txt").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    out = []
+    marker = None
+    skip = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            extra, _sep, section_marker = line[1:-1].partition(":")
+            skip = bool(extra.strip())
+            marker = section_marker.strip() or None
+            continue
+        if not skip:
+            out.append(f"{line}; {marker}" if marker else line)
+    return out
+
+
+def read_requires(dist_info):
+    """
+    Requires-Dist lines of an installed dist (requires.txt for egg-info).
+    """
+    requires = read_metadata_headers(dist_info).get("requires-dist") or []
+    if not requires and str(dist_info).lower().endswith(".egg-info"):
+        requires = _egg_info_requires(dist_info)
+    return requires
+
+
+def check_requirements(dists, environment):
+    """
+    The `pip check` algorithm over already-read dists ({"name", "version", "requires"}):
+    requirements whose marker applies (no extras requested) and whose target is not
+    installed (missing) or installed in a non-matching version (conflicts).
+    """
+    installed = {normalize_name(d["name"]): d for d in dists}
+    missing = []
+    conflicts = []
+    for dist in dists:
+        for line in dist.get("requires") or []:
+            req = parse_requirement(line)
+            if req is None:
+                continue
+            if req["marker"]:
+                try:
+                    if not evaluate_marker(req["marker"], environment):
+                        continue
+                except ValueError:
+                    continue
+            entry = {"package": dist["name"], "version": dist["version"], "requirement": line.strip()}
+            target = installed.get(normalize_name(req["name"]))
+            if target is None:
+                missing.append({**entry, "dependency": req["name"]})
+                continue
+            if version_satisfies(target["version"], req["specifier"]) is False:
+                conflicts.append({**entry, "dependency": target["name"], "installed": target["version"]})
+    return missing, conflicts
+
+
+def _installed_dists(site_pkgs, listings):
+    """
+    {"name", "version", "requires"} per installed dist, first one per normalized name wins
+    (as in pip). Reuses the site-packages listings of the scan when given.
+    """
+    seen = set()
+    out = []
+    for site_pkg in site_pkgs or []:
+        listing = (listings or {}).get(site_pkg)
+        if listing is not None:
+            names = sorted((n for n, _is_dir in listing["entries"] if is_dist_metadata_name(n)), key=str.lower)
+            paths = [Path(site_pkg) / n for n in names]
+        else:
+            paths = list(iter_dist_infos(site_pkg))
+        for path in paths:
+            name, version = read_dist_name_version(path)
+            if not name or not version or normalize_name(name) in seen:
+                continue
+            seen.add(normalize_name(name))
+            out.append({"name": name, "version": version, "requires": read_requires(path)})
+    return out
+
+
+def scan_requirements(env_path, site_pkgs, listings=None, *, conda=True):
+    """
+    Native `pip check`: Requires-Dist of every installed dist against installed versions,
+    markers evaluated for the env's interpreter. No pip import, no subprocess.
+    Returns a single `unmet-requirements` issue, or [].
+    """
+    dists = _installed_dists(site_pkgs, listings)
+    environment = marker_environment(env_path, site_pkgs, conda=conda)
+    missing, conflicts = check_requirements(dists, environment)
+    if not missing and not conflicts:
+        return []
+    return [
+        {
+            "type": "unmet-requirements",
+            "count": len(missing) + len(conflicts),
+            "missing": missing[:REPORT_LIMIT],
+            "conflicts": conflicts[:REPORT_LIMIT],
+            "packages": sorted({e["package"] for e in missing + conflicts}, key=str.lower),
+        }
+    ]
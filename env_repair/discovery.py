@@ -100,6 +100,35 @@ def get_site_packages(python_exe):
     except ValueError:
         return []
 
+
+def env_prefix_from_python(python_exe):
+    """
+    Env prefix for an interpreter path (<prefix>/bin/python, <prefix>/Scripts/python.exe, <prefix>/python.exe).
+    """
+    parent = Path(python_exe).parent
+    if parent.name.lower() in ("bin", "scripts"):
+        return str(parent.parent)
+    return str(parent)
+
+
+def find_site_packages(env_path):
+    """
+    Locate site-packages from the env layout alone (no interpreter spawn).
+    Windows conda/venv: <prefix>/Lib/site-packages, POSIX: <prefix>/lib/pythonX.Y/site-packages.
+    """
+    env = Path(env_path)
+    out = []
+    win = env / "Lib" / "site-packages"
+    if win.is_dir():
+        out.append(str(win))
+    lib = env / "lib"
+    if lib.is_dir():
+        for p in sorted(lib.glob("python*/site-packages")):
+            if p.is_dir():
+                out.append(str(p))
+    return out
+
+
 def env_name_from_path(path):
     p = Path(path)
     if p.name:
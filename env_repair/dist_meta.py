@@ -0,0 +1,251 @@
+import csv
+import json
+import os
+import posixpath
+import sys
+from pathlib import Path
+
+from .naming import normalize_name
+
+# `pip freeze` leaves these out unless `--all` is given.
+FREEZE_EXCLUDE = {"pip", "setuptools", "wheel", "distribute"}
+
+
+def package_list_mode():
+    """
+    ENV_REPAIR_PACKAGE_LIST: native (default) | cli | verify.
+    """
+    mode = (os.environ.get("ENV_REPAIR_PACKAGE_LIST") or "native").strip().lower()
+    return mode if mode in ("native", "cli", "verify") else "native"
+
+
+def report_entry_mismatch(env_path, native, cli):
+    """
+    Print differences between natively read and CLI-reported package entries to stderr.
+    """
+
+    def keys(entries):
+        return {(e.get("name"), e.get("version"), (e.get("channel") or "").lower()) for e in entries}
+
+    only_native = sorted(keys(native) - keys(cli), key=str)
+    only_cli = sorted(keys(cli) - keys(native), key=str)
+    if not only_native and not only_cli:
+        return
+    sys.stderr.write(f"[verify] package list mismatch for {env_path}\n")
+    for name, version, channel in only_native:
+        sys.stderr.write(f"[verify]   native only: {name} {version} ({channel})\n")
+    for name, version, channel in only_cli:
+        sys.stderr.write(f"[verify]   cli only: {name} {version} ({channel})\n")
+    sys.stderr.flush()
+
+
+def is_dist_metadata_name(name):
+    lower = name.lower()
+    return lower.endswith(".dist-info") or lower.endswith(".egg-info")
+
+
+def iter_dist_infos(site_pkg):
+    """
+    Yield Path objects for `*.dist-info` / `*.egg-info` entries directly inside `site_pkg`.
+    """
+    try:
+        with os.scandir(site_pkg) as it:
+            entries = [e for e in it if is_dist_metadata_name(e.name)]
+    except OSError:
+        return
+    for e in sorted(entries, key=lambda e: e.name.lower()):
+        yield Path(e.path)
+
+
+def _metadata_file(dist_info):
+    dist_info = Path(dist_info)
+    if dist_info.name.lower().endswith(".egg-info"):
+        if dist_info.is_file():
+            return dist_info
+        return dist_info / "PKG-INFO"
+    return dist_info / "METADATA"
+
+
+def read_metadata_headers(dist_info):
+    """
+    Parse the RFC 822 header block of METADATA / PKG-INFO (the body is never read).
+    Returns dict[lowercase header] = list[str] (headers like Requires-Dist repeat), or {} if unreadable.
+    """
+    headers = {}
+    last = None
+    try:
+        with open(_metadata_file(dist_info), "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                if not line:
+                    break
+                if line[0] in " \t" and last is not None:
+                    values = headers[last]
+                    values[-1] = values[-1] + "\n" + line.strip()
+                    continue
+                if ":" not in line:
+                    continue
+                key, value = line.split(":", 1)
+                last = key.strip().lower()
+                headers.setdefault(last, []).append(value.strip())
+    except OSError:
+        return {}
+    return headers
+
+
+def split_dist_dirname(name):
+    """
+    Split `<name>-<version>.dist-info` (or .egg-info) into (name, version). Version may be None.
+    """
+    base = name
+    for suffix in (".dist-info", ".egg-info"):
+        if base.lower().endswith(suffix):
+            base = base[: -len(suffix)]
+            break
+    if "-" not in base:
+        return base, None
+    dist_name, rest = base.split("-", 1)
+    # egg-info names can carry a python tag: foo-1.0-py3.11.egg-info
+    version = rest.split("-py", 1)[0] if "-py" in rest else rest
+    return dist_name, version or None
+
+
+def read_dist_name_version(dist_info):
+    """
+    Return (name, version) from METADATA, falling back to the directory name.
+    """
+    dist_info = Path(dist_info)
+    headers = read_metadata_headers(dist_info)
+    name = (headers.get("name") or [None])[0]
+    version = (headers.get("version") or [None])[0]
+    if not name or not version:
+        dir_name, dir_version = split_dist_dirname(dist_info.name)
+        name = name or dir_name
+        version = version or dir_version
+    return name or None, version or None
+
+
+def read_installer(dist_info):
+    """
+    Content of the INSTALLER file (e.g. "pip", "conda", "uv"), lowercased; "" if missing.
+    """
+    try:
+        return (Path(dist_info) / "INSTALLER").read_text(encoding="utf-8", errors="ignore").strip().lower()
+    except OSError:
+        return ""
+
+
+def read_direct_url(dist_info):
+    """
+    Parsed PEP 610 direct_url.json, or None.
+    """
+    try:
+        data = json.loads((Path(dist_info) / "direct_url.json").read_text(encoding="utf-8", errors="ignore"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def read_record_paths(dist_info):
+    """
+    Files installed by a dist, as posix paths relative to its site-packages directory
+    (may start with `../` for scripts/data). Uses RECORD, or installed-files.txt for
+    egg-info; [] if neither exists.
+    """
+    dist_info = Path(dist_info)
+    paths = []
+    try:
+        with open(dist_info / "RECORD", "r", encoding="utf-8", errors="ignore", newline="") as f:
+            for row in csv.reader(f):
+                if row and row[0]:
+                    paths.append(row[0].replace("\\", "/"))
+    except OSError:
+        try:
+            text = (dist_info / "installed-files.txt").read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return []
+        for line in text.splitlines():
+            line = line.strip().replace("\\", "/")
+            if line:
+                paths.append(posixpath.normpath(f"{dist_info.name}/{line}"))
+    return paths
+
+
+def _dist_record(dist, name, version):
+    return {
+        "name": name,
+        "version": version,
+        "path": str(dist),
+        "installer": read_installer(dist),
+        "direct_url": read_direct_url(dist),
+    }
+
+
+def read_installed_dists(site_pkgs):
+    """
+    Read installed distributions from site-packages metadata only (no pip import, no subprocess).
+    Returns a list of dicts: name, version, path, installer, direct_url.
+    Like pip, the first dist found for a normalized name wins.
+    """
+    seen = set()
+    out = []
+    for site_pkg in site_pkgs or []:
+        for dist in iter_dist_infos(site_pkg):
+            name, version = read_dist_name_version(dist)
+            if not name or not version:
+                continue
+            key = normalize_name(name)
+            if key in seen:
+                continue
+            seen.add(key)
+            out.append(_dist_record(dist, name, version))
+    return sorted(out, key=lambda d: d["name"].lower())
+
+
+def find_installed_dist(site_pkgs, package):
+    """
+    Look up a single dist by (normalized) name; only METADATA of name-matching dirs is read.
+    """
+    want = normalize_name(package or "")
+    if not want:
+        return None
+    for site_pkg in site_pkgs or []:
+        for dist in iter_dist_infos(site_pkg):
+            dir_name, _ = split_dist_dirname(dist.name)
+            if normalize_name(dir_name) != want:
+                continue
+            name, version = read_dist_name_version(dist)
+            if name and version:
+                return _dist_record(dist, name, version)
+    return None
+
+
+def freeze_line(dist):
+    """
+    Render one installed dist the way `pip freeze` does (PEP 610 aware).
+    """
+    name = dist["name"]
+    direct = dist.get("direct_url") or {}
+    url = direct.get("url") if isinstance(direct.get("url"), str) else None
+    if url:
+        dir_info = direct.get("dir_info") if isinstance(direct.get("dir_info"), dict) else {}
+        vcs_info = direct.get("vcs_info") if isinstance(direct.get("vcs_info"), dict) else None
+        if dir_info.get("editable"):
+            return f"-e {url}"
+        if vcs_info and vcs_info.get("vcs"):
+            ref = vcs_info.get("commit_id") or vcs_info.get("requested_revision")
+            suffix = f"@{ref}" if ref else ""
+            subdir = direct.get("subdirectory")
+            frag = f"#subdirectory={subdir}" if subdir else ""
+            return f"{name} @ {vcs_info['vcs']}+{url}{suffix}{frag}"
+        return f"{name} @ {url}"
+    return f"{name}=={dist['version']}"
+
+
+def freeze_lines(dists, *, include_all=False):
+    lines = []
+    for dist in dists:
+        if not include_all and normalize_name(dist["name"]) in FREEZE_EXCLUDE:
+            continue
+        lines.append(freeze_line(dist))
+    return lines
@@ -1,11 +1,13 @@
+import concurrent.futures
+import contextlib
 import json
 import os
-import re
 import time
 import sys
+import tempfile
 from pathlib import Path
 
-from .conda_config import ensure_default_channels, load_conda_channels, load_pinned_specs
+from .conda_config import ensure_default_channels, load_conda_channels, load_pinned_specs, load_pkgs_dirs
 from .conda_ops import (
     conda_install,
     conda_health_check,
@@ -19,10 +21,11 @@ from .conda_ops import (
     conda_info_json,
     extract_pkgs_dirs,
     clean_cache_level,
-    export_env_yaml,
     get_env_package_entries,
+    install_explicit,
     is_conda_env,
     list_revisions,
+    remove_forced,
     rollback_to_revision,
 )
 from .conflicts import find_same_version_case_conflicts
@@ -40,26 +43,46 @@ from .naming import build_search_variants, normalize_name
 from .pip_ops import pip_freeze, pip_install_requirements, pip_list_json, pip_reinstall, pip_uninstall
 from .progress import Progress
 from .scan import (
+    extension_abi_tag,
+    list_site_packages,
+    python_abi_tag_for,
     remove_dist_info_paths,
     remove_invalid_artifact,
     scan_conda_meta_json,
     scan_dist_info,
+    scan_extension_abi,
     scan_invalid_artifacts,
-    scan_pyd_duplicates,
 )
 from .search_parse import parse_search_output
+from .snapshot import (
+    export_yaml,
+    load_snapshot,
+    plan_pip_restore,
+    snapshot_state,
+    take_snapshot,
+    write_snapshot,
+)
+from .startup import profile_startup as _profile_startup
 from .subprocess_utils import OperationInterrupted, run_json_cmd
 from .subprocess_utils import run_cmd_capture
 
-from .clobber import build_conda_file_owner_map, extract_paths_from_text, to_relpath
+from .checks import run_optional_checks
+from .clobber import conda_owner_of, extract_paths_from_file, to_relpath
+from .conda_deps import check_conda_dependencies
+from .conda_meta import load_conda_meta_index
+from .dependencies import scan_requirements
+from .history import plan_rollback, plan_to_state, write_explicit_file
 from .inconsistent import parse_inconsistent
+from .ownership import find_file_overlaps
 from .repair import (
     _adopt_pip,
     _apply_same_version_case_conflicts,
     _cleanup_duplicate_dist_info,
     _cleanup_duplicate_pyd,
     _fix_conda_meta_issues,
+    _fix_damaged_conda_files,
     _fix_duplicates,
+    _recompile_bytecode,
     _remove_invalid_artifacts,
 )
 
@@ -71,7 +94,7 @@ def _debug(enabled, event, payload):
 
 
 
-def scan_env(env_path):
+def scan_env(env_path, checks=()):
     env = {"path": env_path, "python": None, "issues": []}
     python_exe = get_python_exe(env_path)
     if not python_exe:
@@ -84,16 +107,25 @@ def scan_env(env_path):
         env["issues"].append({"type": "missing-site-packages"})
         return env
 
+    listings = {}
     for site_pkg in site_pkgs:
-        if not Path(site_pkg).exists():
+        listing = list_site_packages(site_pkg)
+        if listing is None:
             continue
-        env["issues"].extend(scan_dist_info(site_pkg))
-        env["issues"].extend(scan_pyd_duplicates(site_pkg))
-        env["issues"].extend(scan_invalid_artifacts(site_pkg))
-
-    if is_conda_env(env_path):
+        listings[site_pkg] = listing
+        env["issues"].extend(scan_dist_info(site_pkg, listing))
+        env["issues"].extend(scan_extension_abi(site_pkg, listing, abi_tag=python_abi_tag_for(site_pkg, env_path)))
+        env["issues"].extend(scan_invalid_artifacts(site_pkg, listing))
+
+    conda = is_conda_env(env_path)
+    env["issues"].extend(scan_requirements(env_path, site_pkgs, listings, conda=conda))
+    if conda:
         env["issues"].extend(scan_conda_meta_json(env_path))
 
+    if checks:
+        ctx = {"env_path": env_path, "python": python_exe, "site_pkgs": site_pkgs, "listings": listings, "conda": conda}
+        env["issues"].extend(run_optional_checks(checks, ctx))
+
     return env
 
 
@@ -158,6 +190,94 @@ def _approve(*, yes, plan, prompt, lang):
     return ans in ("y", "yes", "j", "ja")
 
 
+def _write_snapshot(env_path, path):
+    """
+    Native rescue snapshot (conda-meta records + pip metadata, read from disk). A `.yml`/`.yaml`
+    path gets the `conda env export` style YAML derived from it instead. Returns (ok, type).
+    """
+    path = Path(path)
+    yaml_out = path.suffix.lower() in (".yml", ".yaml")
+    kind = "conda-yaml" if yaml_out else "native"
+    snapshot = take_snapshot(env_path)
+    if snapshot is None:
+        return False, kind
+    try:
+        if yaml_out:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(export_yaml(snapshot), encoding="utf-8")
+        else:
+            write_snapshot(path, snapshot)
+    except OSError:
+        return False, kind
+    return True, kind
+
+
+def _plan_native_restore(env_path, data, pkgs_dirs):
+    """
+    Conda part of a snapshot restore: exact diff to the snapshot's records, installs in the
+    snapshot's dependency order.
+    """
+    plan = plan_to_state(env_path, snapshot_state(data), pkgs_dirs)
+    order = {rec["name"]: i for i, rec in enumerate(data.get("conda") or [])}
+    plan["install"].sort(key=lambda item: order.get(item["name"], len(order)))
+    return plan
+
+
+def _restore_native_snapshot(env_path, manager, python_exe, snap_path, *, pkgs_dirs, dry_run=False, solver=False):
+    """
+    Replay a native snapshot without the solver: the conda records as an exact `@EXPLICIT`
+    install (cached packages in `pkgs_dirs` are reused) plus `remove --force` of newer extras,
+    then the pip dists pinned with `--no-deps`. Uses `env update` from the derived YAML when
+    a build is unfetchable (see `plan_to_state`) or `solver` is set.
+
+    The derived files go next to the snapshot; a dry run writes nothing there (the spec file
+    conda needs for `--dry-run` lives in a temporary directory).
+    """
+    data = load_snapshot(snap_path)
+    if data is None:
+        return {"ok": False, "method": None, "error": "invalid snapshot"}
+    snap_dir = Path(snap_path).parent
+    plan = _plan_native_restore(env_path, data, pkgs_dirs)
+    result = {
+        "ok": True,
+        "method": "explicit",
+        "install": [item["dist"] for item in plan["install"]],
+        "remove": list(plan["remove"]),
+        "unfetchable": list(plan["unfetchable"]),
+        "pip_install": [],
+        "pip_uninstall": [],
+    }
+    if solver or not plan["explicit"]:
+        result["method"] = "solver"
+        if not dry_run:
+            yaml_path = snap_dir / "restore-env.yml"
+            yaml_path.write_text(export_yaml(data), encoding="utf-8")
+            result["ok"] = bool(manager) and env_update_from_yaml(env_path, manager, yaml_path)
+        return result
+
+    ok = True
+    if plan["install"]:
+        with tempfile.TemporaryDirectory(prefix="env-repair-") if dry_run else contextlib.nullcontext(snap_dir) as out_dir:
+            explicit = write_explicit_file(Path(out_dir) / "restore-explicit.txt", plan["install"])
+            ok = install_explicit(env_path, manager, explicit, dry_run=dry_run)
+    if ok and plan["remove"]:
+        ok = remove_forced(env_path, manager, plan["remove"], dry_run=dry_run)
+    pip_plan = plan_pip_restore(data, (take_snapshot(env_path) or {}).get("pip"))
+    result["pip_install"] = pip_plan["install"]
+    result["pip_uninstall"] = pip_plan["uninstall"]
+    if ok and not dry_run and (pip_plan["install"] or pip_plan["uninstall"]):
+        if not python_exe:
+            ok = False
+        else:
+            ok = pip_uninstall(python_exe, pip_plan["uninstall"])
+            if ok and pip_plan["install"]:
+                req = snap_dir / "restore-requirements.txt"
+                req.write_text("".join(line + "\n" for line in pip_plan["install"]), encoding="utf-8")
+                ok = pip_install_requirements(python_exe, req, no_deps=True)
+    result["ok"] = ok
+    return result
+
+
 def _check_and_repair_conda_core(*, args, base_prefix, manager, channels):
     """
     Detect broken conda core and optionally repair it via force-reinstall.
@@ -176,18 +296,11 @@ def _check_and_repair_conda_core(*, args, base_prefix, manager, channels):
         return True
 
     def _has_python_abi_residue(issues):
-        cp_tag = re.compile(r"\.cp(\d+)-", flags=re.IGNORECASE)
         for issue in issues or []:
             if issue.get("type") != "duplicate-pyd":
                 continue
-            tags = set()
-            for filename in issue.get("files") or []:
-                if not isinstance(filename, str):
-                    continue
-                m = cp_tag.search(filename)
-                if m:
-                    tags.add(m.group(1))
-            if len(tags) > 1:
+            tags = {extension_abi_tag(f) for f in issue.get("files") or [] if isinstance(f, str)}
+            if len({tag for tag in tags if tag and tag.startswith("cp")}) > 1:
                 return True
         return False
 
@@ -313,8 +426,24 @@ def rollback(args):
             print(t("rollback_invalid_target", lang=lang, to=to))
         return report
 
+    plan = plan_rollback(env_path, target, load_pkgs_dirs(base_prefix=base_prefix))
     if not args.json:
         print(t("rollback_plan", lang=lang, from_rev=current, to_rev=target))
+        if plan is not None:
+            print(
+                t(
+                    "rollback_diff",
+                    lang=lang,
+                    install=len(plan["install"]),
+                    remove=len(plan["remove"]),
+                    unfetchable=len(plan["unfetchable"]),
+                )
+            )
+            for item in plan["install"]:
+                print(f" + {item['dist']}")
+            for name in plan["remove"]:
+                print(f" - {name}")
+            print(t("rollback_explicit", lang=lang) if plan["explicit"] else t("rollback_solver", lang=lang))
     if getattr(args, "plan", False):
         if not args.json:
             print(t("plan_only", lang=lang))
@@ -327,23 +456,122 @@ def rollback(args):
 
     # Snapshot (reuse existing mechanism by forcing a snapshot path)
     ts = time.strftime("%Y%m%d-%H%M%S")
-    snap = Path(".env_repair") / "snapshots" / f"{env_name_from_path(env_path)}-{ts}" / "env.yml"
+    snap = Path(".env_repair") / "snapshots" / f"{env_name_from_path(env_path)}-{ts}" / "snapshot.json"
     snap.parent.mkdir(parents=True, exist_ok=True)
-    snap_ok = False
-    if is_conda_env(env_path) and manager:
-        snap_ok = export_env_yaml(env_path, manager, snap)
+    snap_ok, snap_type = _write_snapshot(env_path, snap)
 
-    ok = rollback_to_revision(env_path, target, dry_run=bool(args.dry_run))
+    dry_run = bool(args.dry_run)
+    if plan is not None and plan["explicit"]:
+        # Exact diff from conda-meta/history, all builds cached: no solver needed.
+        method = "explicit"
+        ok = True
+        if plan["install"]:
+            explicit = write_explicit_file(snap.parent / "rollback-explicit.txt", plan["install"])
+            ok = install_explicit(env_path, manager, explicit, dry_run=dry_run)
+        if ok and plan["remove"]:
+            ok = remove_forced(env_path, manager, plan["remove"], dry_run=dry_run)
+    else:
+        method = "solver"
+        ok = rollback_to_revision(env_path, target, dry_run=dry_run)
     if not args.json:
         if ok:
             print(t("rollback_done", lang=lang, to_rev=target))
     post = scan_env(env_path)
-    post["snapshot"] = {"path": str(snap), "ok": snap_ok, "type": "conda-yaml"}
-    post["action"] = {"type": "rollback", "from": current, "to": target, "ok": ok}
+    post["snapshot"] = {"path": str(snap), "ok": snap_ok, "type": snap_type}
+    post["action"] = {
+        "type": "rollback",
+        "from": current,
+        "to": target,
+        "ok": ok,
+        "method": method,
+        "install": [item["dist"] for item in (plan or {}).get("install") or []],
+        "remove": list((plan or {}).get("remove") or []),
+    }
     exit_code = 0 if ok else 2
     return {"ok": ok, "exit_code": exit_code, "report": [post]}
 
 
+def restore(args):
+    """
+    Restore command handler: replay a native snapshot (explicit conda builds + pinned pip
+    dists, no solver) -> rescan.
+    """
+    show_json_output = bool(getattr(args, "debug", False))
+    lang = "auto"
+
+    managers = detect_managers()
+    if not any(managers.values()):
+        report = {"ok": False, "exit_code": 2, "error": t("manager_missing", lang=lang)}
+        if not args.json:
+            print(t("manager_missing", lang=lang))
+        return report
+
+    all_envs, base_prefix, manager = discover_envs(show_json_output=show_json_output)
+    targets = select_envs(all_envs, [args.env] if args.env else [], base_prefix)
+    if not targets:
+        return {"ok": False, "exit_code": 2, "error": "no target env"}
+    env_path = targets[0]
+
+    data = load_snapshot(args.snapshot)
+    if data is None:
+        report = {"ok": False, "exit_code": 2, "error": t("restore_invalid_snapshot", lang=lang, path=args.snapshot)}
+        if not args.json:
+            print(t("restore_invalid_snapshot", lang=lang, path=args.snapshot))
+        return report
+
+    pkgs_dirs = load_pkgs_dirs(base_prefix=base_prefix)
+    plan = _plan_native_restore(env_path, data, pkgs_dirs)
+    pip_plan = plan_pip_restore(data, (take_snapshot(env_path) or {}).get("pip"))
+    if not args.json:
+        print(t("restore_plan", lang=lang, env=env_path, path=args.snapshot))
+        print(
+            t(
+                "restore_diff",
+                lang=lang,
+                install=len(plan["install"]),
+                remove=len(plan["remove"]),
+                unfetchable=len(plan["unfetchable"]),
+                pip_install=len(pip_plan["install"]),
+                pip_uninstall=len(pip_plan["uninstall"]),
+            )
+        )
+        for item in plan["install"]:
+            print(f" + {item['dist']}")
+        for name in plan["remove"]:
+            print(f" - {name}")
+        for line in pip_plan["install"]:
+            print(f" + pip:{line}")
+        for name in pip_plan["uninstall"]:
+            print(f" - pip:{name}")
+        explicit = plan["explicit"] and not getattr(args, "solver", False)
+        print(t("restore_explicit", lang=lang) if explicit else t("restore_solver", lang=lang))
+    if getattr(args, "plan", False):
+        if not args.json:
+            print(t("plan_only", lang=lang))
+        return {"ok": True, "exit_code": 0, "planned": True}
+
+    if not _approve(yes=bool(args.yes), plan=False, prompt=t("prompt_approve", lang=lang), lang=lang):
+        if not args.json:
+            print(t("abort", lang=lang))
+        return {"ok": False, "exit_code": 2, "aborted": True}
+
+    result = _restore_native_snapshot(
+        env_path,
+        manager,
+        get_python_exe(env_path),
+        args.snapshot,
+        pkgs_dirs=pkgs_dirs,
+        dry_run=bool(args.dry_run),
+        solver=bool(getattr(args, "solver", False)),
+    )
+    ok = bool(result["ok"])
+    if not args.json and ok:
+        print(t("restore_done", lang=lang, env=env_path))
+    post = scan_env(env_path)
+    post["action"] = {"type": "restore", "snapshot": str(args.snapshot), **result}
+    return {"ok": ok, "exit_code": 0 if ok else 2, "report": [post]}
+
+
 def rebuild(args):
     """
     Rebuild command handler: export -> create new env -> optional verify scan.
@@ -399,9 +627,7 @@ def rebuild(args):
     ts = time.strftime("%Y%m%d-%H%M%S")
     snap = Path(".env_repair") / "snapshots" / f"{env_name_from_path(src)}-{ts}" / "env.yml"
     snap.parent.mkdir(parents=True, exist_ok=True)
-    snap_ok = False
-    if is_conda_env(src) and manager:
-        snap_ok = export_env_yaml(src, manager, snap)
+    snap_ok, snap_type = _write_snapshot(src, snap)
 
     created = env_create_from_yaml(manager=manager, src_yaml=snap, target=dst, target_is_path=target_is_path)
 
@@ -422,7 +648,7 @@ def rebuild(args):
         "report": [
             {
                 "source": src,
-                "snapshot": {"path": str(snap), "ok": snap_ok, "type": "conda-yaml"},
+                "snapshot": {"path": str(snap), "ok": snap_ok, "type": snap_type},
                 "action": {"type": "rebuild", "to": str(dst), "ok": bool(created), "verify": bool(args.verify)},
                 "result": result_report,
             }
@@ -433,6 +659,36 @@ def rebuild(args):
     return out
 
 
+def _owner_label(owner):
+    if owner.get("kind") == "pip":
+        return f"pip:{owner.get('dist')}"
+    return f"{owner.get('name')}-{owner.get('version')}-{owner.get('build')}"
+
+
+def _diagnose_clobber_proactive(env_path, *, args, lang):
+    """
+    Without a log: report every path claimed by more than one conda record / pip RECORD.
+    """
+    overlaps = find_file_overlaps(env_path)
+    conflicts = []
+    for item in overlaps:
+        rel = item["relpath"]
+        owners = item["owners"]
+        conda_owner = next((o for o in owners if o.get("kind") == "conda"), None)
+        conflicts.append(
+            {"path": str(Path(env_path) / rel), "relpath": rel, "conda_owner": conda_owner, "owners": owners}
+        )
+    if not args.json:
+        print(t("clobber_header", lang=lang))
+        print(t("clobber_proactive", lang=lang))
+        if not conflicts:
+            print(t("clobber_no_overlaps", lang=lang))
+        for c in conflicts:
+            print(t("clobber_overlap", lang=lang, path=c["relpath"], owners=", ".join(_owner_label(o) for o in c["owners"])))
+    ok = not conflicts
+    return {"ok": ok, "exit_code": 0 if ok else 1, "report": [{"env": env_path, "mode": "proactive", "conflicts": conflicts}]}
+
+
 def diagnose_clobber(args):
     show_json_output = bool(getattr(args, "debug", False))
     lang = "auto"
@@ -444,15 +700,11 @@ def diagnose_clobber(args):
     env_path = targets[0]
 
     if not args.logfile:
-        msg = t("clobber_no_log", lang=lang)
-        if not args.json:
-            print(t("clobber_header", lang=lang))
-            print(msg)
-        return {"ok": False, "exit_code": 2, "error": msg, "report": []}
+        return _diagnose_clobber_proactive(env_path, args=args, lang=lang)
 
     log_path = Path(args.logfile)
     try:
-        text = log_path.read_text(encoding="utf-8", errors="ignore")
+        paths = extract_paths_from_file(log_path, env_prefix=env_path)
     except OSError:
         msg = t("clobber_log_read_failed", lang=lang, path=str(log_path))
         if not args.json:
@@ -460,13 +712,14 @@ def diagnose_clobber(args):
             print(msg)
         return {"ok": False, "exit_code": 2, "error": msg, "report": []}
 
-    paths = extract_paths_from_text(text, env_prefix=env_path)
-    owners = build_conda_file_owner_map(env_path)
+    # Owners are looked up per path in the (persisted) conda-meta index; the full
+    # path -> owner map is only built lazily if there is anything to look up.
+    index = load_conda_meta_index(env_path) if paths else None
 
     conflicts = []
     for p in paths:
         rel = to_relpath(env_path, p)
-        owner = owners.get(rel) if rel else None
+        owner = conda_owner_of(index, rel)
         conflicts.append({"path": p, "relpath": rel, "conda_owner": owner})
 
     ok = bool(conflicts)
@@ -478,6 +731,17 @@ def diagnose_clobber(args):
     return {"ok": ok, "exit_code": 0 if ok else 1, "report": [{"env": env_path, "conflicts": conflicts}]}
 
 
+def _unsatisfied_conda_dependencies(env_path):
+    """
+    In-process consistency check of conda-meta `depends`/`constrains` (no solver).
+    None if the env has no readable conda-meta.
+    """
+    index = load_conda_meta_index(env_path)
+    if index is None:
+        return None
+    return check_conda_dependencies(index)
+
+
 def diagnose_inconsistent(args):
     show_json_output = bool(getattr(args, "debug", False))
     lang = "auto"
@@ -488,15 +752,48 @@ def diagnose_inconsistent(args):
         return {"ok": False, "exit_code": 2, "error": "no target env"}
     env_path = targets[0]
 
-    rc, out, err = dry_run_install(env_path, ["python"])
-    inconsistent, pkgs = parse_inconsistent(out + "\n" + err)
+    unsatisfied = _unsatisfied_conda_dependencies(env_path)
+    rc = None
+    solver = None
+    if unsatisfied is None or getattr(args, "solver", False):
+        rc, out, err = dry_run_install(env_path, ["python"])
+        solver_inconsistent, solver_pkgs = parse_inconsistent(out + "\n" + err)
+        solver = {"rc": rc, "inconsistent": solver_inconsistent, "packages": solver_pkgs}
+    if unsatisfied is not None:
+        inconsistent = bool(unsatisfied)
+        pkgs = sorted({str(u["package"]) for u in unsatisfied})
+    else:
+        inconsistent, pkgs = solver["inconsistent"], solver["packages"]
     if not args.json:
         print(t("inconsistent_header", lang=lang))
         print(t("inconsistent_found", lang=lang) if inconsistent else t("inconsistent_not_found", lang=lang))
+        for u in unsatisfied or []:
+            print(
+                t(
+                    "inconsistent_unsatisfied",
+                    lang=lang,
+                    package=f"{u['package']}-{u['version']}-{u['build']}",
+                    kind=u["kind"],
+                    spec=u["spec"],
+                    installed=u["installed"] or t("inconsistent_not_installed", lang=lang),
+                )
+            )
+        if solver is not None and unsatisfied is not None and solver["inconsistent"] != inconsistent:
+            print(t("inconsistent_solver_differs", lang=lang, value=solver["inconsistent"]))
     return {
         "ok": True,
         "exit_code": 0,
-        "report": [{"env": env_path, "dry_run_rc": rc, "inconsistent": inconsistent, "packages": pkgs}],
+        "report": [
+            {
+                "env": env_path,
+                "method": "solver" if unsatisfied is None else ("local+solver" if solver else "local"),
+                "dry_run_rc": rc,
+                "inconsistent": inconsistent,
+                "packages": pkgs,
+                "unsatisfied": unsatisfied,
+                "solver": solver,
+            }
+        ],
     }
 
 
@@ -544,9 +841,16 @@ def fix_inconsistent(args):
         ok = clean_index_cache(yes=True)
         actions.append({"type": "clean_index_cache", "ok": ok})
         if ok and level == "normal":
-            # Best-effort: reinstall packages listed in warning, if any.
-            rc, out, err = dry_run_install(env_path, ["python"])
-            inconsistent, pkgs = parse_inconsistent(out + "\n" + err)
+            # Best-effort: reinstall the packages whose dependencies are unsatisfied
+            # (local check; the solver's warning only when conda-meta is unreadable).
+            unsatisfied = _unsatisfied_conda_dependencies(env_path)
+            if unsatisfied is None:
+                rc, out, err = dry_run_install(env_path, ["python"])
+                inconsistent, pkgs = parse_inconsistent(out + "\n" + err)
+            else:
+                pkgs = sorted({str(u["package"]) for u in unsatisfied})
+                inconsistent = bool(pkgs)
+                actions.append({"type": "local_check", "unsatisfied": unsatisfied, "ok": True})
             if inconsistent and pkgs:
                 ok2 = conda_install(
                     env_path,
@@ -662,6 +966,64 @@ def diagnose_ssl(args):
     }
 
 
+def profile_startup(args):
+    show_json_output = bool(getattr(args, "debug", False))
+    lang = "auto"
+
+    all_envs, base_prefix, _manager = discover_envs(show_json_output=show_json_output)
+    env_single = getattr(args, "env_single", None)
+    targets = select_envs(all_envs, [env_single] if env_single else [], base_prefix)
+    if not targets:
+        return {"ok": False, "exit_code": 2, "error": "no target env"}
+
+    top = max(0, int(getattr(args, "top", 10) or 0))
+    report = []
+    for env_path in targets:
+        python_exe = get_python_exe(env_path)
+        if not python_exe:
+            report.append({"env": env_path, "python": None})
+            if not args.json:
+                print(t("startup_no_python", lang=lang, env=env_path))
+            continue
+        item = {"env": env_path, **_profile_startup(python_exe, get_site_packages(python_exe), top=top)}
+        report.append(item)
+        if args.json:
+            continue
+        print(
+            t(
+                "startup_env",
+                lang=lang,
+                env=env_path,
+                total=item["startup_ms"],
+                site=item["site_ms"],
+                paths=item["sys_path_len"],
+                eggs=item["egg_links"],
+            )
+        )
+        for pth in item["pth_files"]:
+            if pth["code_lines"] or pth["missing_paths"]:
+                print(
+                    t(
+                        "startup_pth",
+                        lang=lang,
+                        file=pth["file"],
+                        code=pth["code_lines"],
+                        paths=pth["path_lines"],
+                        missing=pth["missing_paths"],
+                        ms=pth["import_ms"],
+                    )
+                )
+        for offender in item["top"]:
+            print(t("startup_offender", lang=lang, module=offender["module"], ms=offender["ms"], source=offender["source"]))
+
+    return {"ok": True, "exit_code": 0, "report": report}
+
+
+def _timed_scan(env_path, checks):
+    started = time.monotonic()
+    return started, scan_env(env_path, checks)
+
+
 def run(args):
     show_json_output = bool(getattr(args, "debug", False))
     lang = "auto"
@@ -705,170 +1067,208 @@ def run(args):
     if not args.json and targets:
         env_progress = Progress(total=len(targets), label=t("progress_envs", lang=lang))
 
-    for env_idx, env_path in enumerate(targets, start=1):
-        if env_progress:
-            env_progress.update(env_idx)
-        if not args.json:
-            print(t("step_scan", lang=lang) + ": " + env_path)
-        env_report = scan_env(env_path)
-        env_report["managers"] = {
-            "conda": {"found": bool(managers.get("conda")), "path": managers.get("conda")},
-            "mamba": {"found": bool(managers.get("mamba")), "path": managers.get("mamba")},
-            "micromamba": {"found": bool(managers.get("micromamba")), "path": managers.get("micromamba")},
-        }
-        env_report["channels"] = list(channels)
-        env_report["pinned"] = load_pinned_specs(env_path)
-
-        python_exe = env_report.get("python")
-        conda_here = bool(manager) and is_conda_env(env_path)
-        if conda_here:
-            entries = get_env_package_entries(env_path, manager, show_json_output=show_json_output)
-        else:
-            entries = pip_list_json(python_exe) if python_exe else []
-        env_report["initial_entries"] = entries
-
-        snapshot = None
-        if args.snapshot:
-            snapshot = Path(args.snapshot)
-        elif args.fix:
-            # Always create a rescue snapshot before modifications.
-            ts = time.strftime("%Y%m%d-%H%M%S")
-            base = Path(".env_repair") / "snapshots"
-            name = env_name_from_path(env_path)
-            snapshot = base / f"{name}-{ts}" / ("env.yml" if conda_here else "requirements.txt")
-
-        if snapshot:
-            if conda_here and manager:
-                if not args.json:
-                    print(t("step_snapshot", lang=lang) + ": " + env_path)
-                snap_ok = export_env_yaml(env_path, manager, snapshot)
-                env_report["snapshot"] = {"path": str(snapshot), "ok": snap_ok, "type": "conda-yaml"}
-            elif python_exe:
+    # Scans only read the envs, so all of them run up front in parallel; repairs below
+    # stay sequential per env. A scan that started before an earlier env was repaired is
+    # redone, since repairs can touch shared state (nested envs, package caches).
+    checks = getattr(args, "check", None) or ()
+    scan_workers = max(1, min(4, len(targets)))
+    last_fix_at = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=scan_workers) as scan_pool:
+        scans = {env_path: scan_pool.submit(_timed_scan, env_path, checks) for env_path in targets}
+        try:
+            for env_idx, env_path in enumerate(targets, start=1):
+                if env_progress:
+                    env_progress.update(env_idx)
                 if not args.json:
-                    print(t("step_snapshot", lang=lang) + ": " + env_path)
-                snap_ok = pip_freeze(python_exe, snapshot)
-                env_report["snapshot"] = {"path": str(snapshot), "ok": snap_ok, "type": "pip-freeze"}
-            else:
-                env_report["snapshot"] = {"path": str(snapshot), "ok": False, "reason": "no-python"}
+                    print(t("step_scan", lang=lang) + ": " + env_path)
+                scanned_at, env_report = scans[env_path].result()
+                if last_fix_at is not None and scanned_at < last_fix_at:
+                    env_report = scan_env(env_path, checks)
+                env_report["managers"] = {
+                    "conda": {"found": bool(managers.get("conda")), "path": managers.get("conda")},
+                    "mamba": {"found": bool(managers.get("mamba")), "path": managers.get("mamba")},
+                    "micromamba": {"found": bool(managers.get("micromamba")), "path": managers.get("micromamba")},
+                }
+                env_report["channels"] = list(channels)
+                env_report["pinned"] = load_pinned_specs(env_path)
 
-        if args.fix:
-            fixes = []
-            try:
-                fixes.extend(_remove_invalid_artifacts(env_report, args.debug))
+                python_exe = env_report.get("python")
+                # One predicate for everything read from disk (package list, snapshot); steps
+                # that run the manager CLI check `manager` themselves.
+                conda_here = is_conda_env(env_path)
                 if conda_here:
-                    fixes.extend(
-                        _fix_conda_meta_issues(
-                            env_report,
-                            manager,
-                            channels,
-                            args.ignore_pinned,
-                            args.force_reinstall,
-                            args.debug,
+                    # Native conda-meta reader: works even without a (working) manager CLI.
+                    entries = get_env_package_entries(env_path, manager, show_json_output=show_json_output)
+                else:
+                    entries = pip_list_json(python_exe) if python_exe else []
+                env_report["initial_entries"] = entries
+
+                snapshot = None
+                if args.snapshot:
+                    snapshot = Path(args.snapshot)
+                elif args.fix:
+                    # Always create a rescue snapshot before modifications.
+                    ts = time.strftime("%Y%m%d-%H%M%S")
+                    base = Path(".env_repair") / "snapshots"
+                    name = env_name_from_path(env_path)
+                    snapshot = base / f"{name}-{ts}" / ("snapshot.json" if conda_here else "requirements.txt")
+
+                if snapshot:
+                    if conda_here:
+                        if not args.json:
+                            print(t("step_snapshot", lang=lang) + ": " + env_path)
+                        snap_ok, snap_type = _write_snapshot(env_path, snapshot)
+                        env_report["snapshot"] = {"path": str(snapshot), "ok": snap_ok, "type": snap_type}
+                    elif python_exe:
+                        if not args.json:
+                            print(t("step_snapshot", lang=lang) + ": " + env_path)
+                        snap_ok = pip_freeze(python_exe, snapshot)
+                        env_report["snapshot"] = {"path": str(snapshot), "ok": snap_ok, "type": "pip-freeze"}
+                    else:
+                        env_report["snapshot"] = {"path": str(snapshot), "ok": False, "reason": "no-python"}
+
+                if args.fix:
+                    fixes = []
+                    try:
+                        fixes.extend(_remove_invalid_artifacts(env_report, args.debug))
+                        if conda_here and manager:
+                            fixes.extend(
+                                _fix_conda_meta_issues(
+                                    env_report,
+                                    manager,
+                                    channels,
+                                    args.ignore_pinned,
+                                    args.force_reinstall,
+                                    args.debug,
+                                )
+                            )
+                            fixes.extend(
+                                _fix_damaged_conda_files(
+                                    env_report,
+                                    manager,
+                                    channels,
+                                    args.ignore_pinned,
+                                    args.debug,
+                                )
+                            )
+                        fixes.extend(_cleanup_duplicate_dist_info(env_report, args.debug))
+                        fixes.extend(_cleanup_duplicate_pyd(env_report, args.debug))
+                        fixes.extend(
+                            _apply_same_version_case_conflicts(
+                                env_report,
+                                entries,
+                                manager,
+                                channels,
+                                args.ignore_pinned,
+                                args.force_reinstall,
+                                args.debug,
+                            )
+                            )
+                        fixes.extend(
+                            _fix_duplicates(
+                                env_report,
+                                entries,
+                                manager if conda_here else None,
+                                channels,
+                                args.ignore_pinned,
+                                args.force_reinstall,
+                                args.prefer,
+                                pip_fallback,
+                                args.debug,
+                                in_conda_env=bool(conda_here),
+                            )
                         )
-                    )
-                fixes.extend(_cleanup_duplicate_dist_info(env_report, args.debug))
-                fixes.extend(_cleanup_duplicate_pyd(env_report, args.debug))
-                fixes.extend(
-                    _apply_same_version_case_conflicts(
-                        env_report,
-                        entries,
-                        manager,
-                        channels,
-                        args.ignore_pinned,
-                        args.force_reinstall,
-                        args.debug,
-                    )
-                    )
-                fixes.extend(
-                    _fix_duplicates(
-                        env_report,
-                        entries,
-                        manager if conda_here else None,
-                        channels,
-                        args.ignore_pinned,
-                        args.force_reinstall,
-                        args.prefer,
-                        pip_fallback,
-                        args.debug,
-                        in_conda_env=bool(conda_here),
-                    )
-                )
 
-                if args.adopt_pip and conda_here:
-                    if not args.json:
-                        print(t("step_adopt_pip", lang=lang) + ": " + env_path)
-                    fixes.extend(
-                        _adopt_pip(
-                            env_report,
-                            entries,
-                            manager,
-                            channels,
-                            args.ignore_pinned,
-                            args.force_reinstall,
-                            not args.keep_pip,
-                            args.debug,
-                            show_json_output=show_json_output,
-                            lang=lang,
-                        )
-                    )
-            except OperationInterrupted as e:
-                env_report["interrupted"] = {
-                    "cmd": e.cmd,
-                    "returncode": e.returncode,
-                    "snapshot": env_report.get("snapshot"),
-                }
-                exit_code = max(exit_code, e.returncode)
-                ok_all = False
-                fixes.append({"fixed": False, "method": "interrupted", "package": "<operation>"})
-
-                state_path = Path(".env_repair") / "state.json"
-                state_path.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    state_path.write_text(
-                        json.dumps(
-                            {
-                                "env_path": env_path,
-                                "snapshot": env_report.get("snapshot"),
-                                "cmd": e.cmd,
-                                "when": time.strftime("%Y-%m-%d %H:%M:%S"),
-                            },
-                            indent=2,
-                        ),
-                        encoding="utf-8",
-                    )
-                except OSError:
-                    pass
+                        if args.adopt_pip and conda_here and manager:
+                            if not args.json:
+                                print(t("step_adopt_pip", lang=lang) + ": " + env_path)
+                            fixes.extend(
+                                _adopt_pip(
+                                    env_report,
+                                    entries,
+                                    manager,
+                                    channels,
+                                    args.ignore_pinned,
+                                    args.force_reinstall,
+                                    not args.keep_pip,
+                                    args.debug,
+                                    show_json_output=show_json_output,
+                                    lang=lang,
+                                )
+                            )
+                        fixes.extend(_recompile_bytecode(env_report, args.debug))
+                    except OperationInterrupted as e:
+                        env_report["interrupted"] = {
+                            "cmd": e.cmd,
+                            "returncode": e.returncode,
+                            "snapshot": env_report.get("snapshot"),
+                        }
+                        exit_code = max(exit_code, e.returncode)
+                        ok_all = False
+                        fixes.append({"fixed": False, "method": "interrupted", "package": "<operation>"})
+
+                        state_path = Path(".env_repair") / "state.json"
+                        state_path.parent.mkdir(parents=True, exist_ok=True)
+                        try:
+                            state_path.write_text(
+                                json.dumps(
+                                    {
+                                        "env_path": env_path,
+                                        "snapshot": env_report.get("snapshot"),
+                                        "cmd": e.cmd,
+                                        "when": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                    },
+                                    indent=2,
+                                ),
+                                encoding="utf-8",
+                            )
+                        except OSError:
+                            pass
+
+                        if args.json or not sys.stdin.isatty():
+                            env_report["fixes"] = fixes
+                            report.append(env_report)
+                            break
+                        try:
+                            choice = input(t("prompt_interrupted", lang=lang)).strip().lower()
+                        except KeyboardInterrupt:
+                            choice = "a"
+                        if choice == "r":
+                            snap = env_report.get("snapshot") or {}
+                            snap_path = snap.get("path")
+                            restored = False
+                            if snap_path and snap.get("ok"):
+                                if conda_here and manager and snap.get("type") == "conda-yaml":
+                                    restored = env_update_from_yaml(env_path, manager, snap_path)
+                                elif conda_here and manager and snap.get("type") == "native":
+                                    restored = _restore_native_snapshot(
+                                        env_path,
+                                        manager,
+                                        python_exe,
+                                        snap_path,
+                                        pkgs_dirs=load_pkgs_dirs(base_prefix=base_prefix),
+                                    )["ok"]
+                                elif python_exe and snap.get("type") == "pip-freeze":
+                                    restored = pip_install_requirements(python_exe, snap_path, no_deps=True)
+                            fixes.append({"fixed": restored, "method": "restore", "package": "<snapshot>"})
+                            if not restored:
+                                exit_code = max(exit_code, 1)
+                                break
+                        elif choice == "c":
+                            pass
+                        else:
+                            break
 
-                if args.json or not sys.stdin.isatty():
                     env_report["fixes"] = fixes
-                    report.append(env_report)
-                    break
-                try:
-                    choice = input(t("prompt_interrupted", lang=lang)).strip().lower()
-                except KeyboardInterrupt:
-                    choice = "a"
-                if choice == "r":
-                    snap = env_report.get("snapshot") or {}
-                    snap_path = snap.get("path")
-                    restored = False
-                    if snap_path and snap.get("ok"):
-                        if conda_here and manager and snap.get("type") == "conda-yaml":
-                            restored = env_update_from_yaml(env_path, manager, snap_path)
-                        elif python_exe and snap.get("type") == "pip-freeze":
-                            restored = pip_install_requirements(python_exe, snap_path)
-                    fixes.append({"fixed": restored, "method": "restore", "package": "<snapshot>"})
-                    if not restored:
-                        exit_code = max(exit_code, 1)
-                        break
-                elif choice == "c":
-                    pass
-                else:
-                    break
-
-            env_report["fixes"] = fixes
-            ok_all = ok_all and all(f.get("fixed") for f in fixes)
+                    ok_all = ok_all and all(f.get("fixed") for f in fixes)
+                    if any(f.get("fixed") for f in fixes):
+                        last_fix_at = time.monotonic()
 
-        report.append(env_report)
+                report.append(env_report)
+        finally:
+            # Interrupted or stopped early: don't wait for scans nobody will read.
+            for future in scans.values():
+                future.cancel()
 
     if not args.json:
         if env_progress:
@@ -907,8 +1307,133 @@ def run(args):
                         )
                     elif issue_type == "duplicate-pyd":
                         print(t("issue_duplicate_pyd", lang=lang, base=issue.get("base"), files=issue.get("files")))
+                    elif issue_type == "stale-extension-abi":
+                        files = issue.get("files") or []
+                        print(
+                            t(
+                                "issue_stale_extension_abi",
+                                lang=lang,
+                                count=len(files),
+                                tag=issue.get("abi_tag"),
+                                first=files[0] if files else "-",
+                            )
+                        )
                     elif issue_type == "invalid-artifact":
                         print(t("issue_invalid_artifact", lang=lang, name=issue.get("name")))
+                    elif issue_type == "file-overlaps":
+                        print(
+                            t(
+                                "issue_file_overlaps",
+                                lang=lang,
+                                count=issue.get("count"),
+                                packages=", ".join(str(p) for p in issue.get("packages") or []),
+                            )
+                        )
+                    elif issue_type == "elf-unresolved":
+                        print(
+                            t(
+                                "issue_elf_unresolved",
+                                lang=lang,
+                                path=issue.get("path"),
+                                package=issue.get("package") or "-",
+                                missing=", ".join(issue.get("missing") or []) or "-",
+                                glibc=", ".join(issue.get("glibc") or []) or "-",
+                            )
+                        )
+                    elif issue_type == "elf-off-search-path":
+                        libs = issue.get("libraries") or []
+                        print(
+                            t(
+                                "issue_elf_off_search_path",
+                                lang=lang,
+                                path=issue.get("path"),
+                                package=issue.get("package") or "-",
+                                libs=", ".join(f"{lib['library']} ({', '.join(lib['found'])})" for lib in libs) or "-",
+                            )
+                        )
+                    elif issue_type == "duplicate-native-libs":
+                        libs = issue.get("libraries") or []
+                        print(
+                            t(
+                                "issue_duplicate_native_libs",
+                                lang=lang,
+                                count=issue.get("count"),
+                                size=f"{(issue.get('redundant_bytes') or 0) / (1024 * 1024):.1f}",
+                                largest=libs[0]["library"] if libs else "-",
+                            )
+                        )
+                    elif issue_type == "foreign-prefix":
+                        files = issue.get("files") or []
+                        print(
+                            t(
+                                "issue_foreign_prefix",
+                                lang=lang,
+                                package=issue.get("package") or "-",
+                                count=len(files),
+                                prefixes=", ".join(issue.get("prefixes") or []) or "-",
+                            )
+                        )
+                    elif issue_type == "namespace-collisions":
+                        items = issue.get("collisions") or []
+                        print(
+                            t(
+                                "issue_namespace_collisions",
+                                lang=lang,
+                                count=issue.get("count"),
+                                names=", ".join(str(c.get("name")) for c in items[:8]) or "-",
+                            )
+                        )
+                    elif issue_type == "stale-bytecode":
+                        counts = issue.get("counts") or {}
+                        print(
+                            t(
+                                "issue_stale_bytecode",
+                                lang=lang,
+                                count=issue.get("count"),
+                                detail=", ".join(f"{k}: {v}" for k, v in sorted(counts.items())),
+                            )
+                        )
+                    elif issue_type == "unmet-requirements":
+                        items = (issue.get("missing") or []) + (issue.get("conflicts") or [])
+                        print(
+                            t(
+                                "issue_unmet_requirements",
+                                lang=lang,
+                                count=issue.get("count"),
+                                first=f"{items[0]['package']}: {items[0]['requirement']}" if items else "-",
+                            )
+                        )
+                    elif issue_type == "dangling-symlinks":
+                        links = issue.get("links") or []
+                        print(
+                            t(
+                                "issue_dangling_symlinks",
+                                lang=lang,
+                                count=issue.get("count"),
+                                first=links[0]["path"] if links else "-",
+                            )
+                        )
+                    elif issue_type == "orphan-files":
+                        files = issue.get("files") or []
+                        print(
+                            t(
+                                "issue_orphan_files",
+                                lang=lang,
+                                count=issue.get("count"),
+                                size=f"{(issue.get('total_bytes') or 0) / (1024 * 1024):.1f}",
+                                largest=files[0]["path"] if files else "-",
+                            )
+                        )
+                    elif issue_type == "conda-files-damaged":
+                        print(
+                            t(
+                                "issue_conda_files_damaged",
+                                lang=lang,
+                                package=issue.get("package"),
+                                missing=len(issue.get("missing") or []),
+                                modified=len(issue.get("modified") or []),
+                            )
+                        )
                     else:
                         print(t("issue_generic", lang=lang, type=issue_type))
             if env.get("pinned"):
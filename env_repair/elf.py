@@ -0,0 +1,504 @@
+import concurrent.futures
+import glob
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+
+from .conda_meta import file_owner, load_conda_meta_index
+from .hashing import hash_files
+from .ownership import REPORT_LIMIT, iter_pip_owned_files
+
+_ELF_MAGIC = b"\x7fELF"
+_PT_LOAD = 1
+_PT_DYNAMIC = 2
+_DT_NEEDED = 1
+_DT_STRTAB = 5
+_DT_STRSZ = 10
+_DT_SONAME = 14
+_DT_RPATH = 15
+_DT_RUNPATH = 29
+_DT_VERNEED = 0x6FFFFFFE
+_DT_VERNEEDNUM = 0x6FFFFFFF
+
+# Directories the dynamic loader always searches (in addition to /etc/ld.so.conf).
+_DEFAULT_LIB_DIRS = ("/lib64", "/usr/lib64", "/lib", "/usr/lib")
+_SHARED_LIB_RE = re.compile(r"\.so(\.\d+)*$")
+_GLIBC_VERSION_RE = re.compile(r"^GLIBC_(\d+(?:\.\d+)*)$")
+# Vendoring tools (auditwheel, delocate, delvewheel) rename libraries to name-<hash>.
+_ELF_LIB_KEY_RE = re.compile(r"^(?P<stem>.+?)(?:-[0-9a-f]{8,32}(?:\.\d+)*)?\.so(?:\.(?P<major>\d+))?(?:\.\d+)*$")
+_DLL_KEY_RE = re.compile(r"^(?P<stem>.+?)(?:-[0-9a-f]{8,32})?\.dll$", flags=re.IGNORECASE)
+
+
+def is_shared_library_name(name):
+    return bool(_SHARED_LIB_RE.search(name))
+
+
+def _cstr(blob, offset):
+    end = blob.find(b"\0", offset)
+    if offset < 0 or offset >= len(blob) or end < 0:
+        return None
+    return blob[offset:end].decode("utf-8", errors="replace")
+
+
+def parse_elf_dynamic(path):
+    """
+    Read the dynamic section of an ELF shared object without loading it.
+    Returns {"soname", "needed", "rpath", "runpath", "versions"} (versions maps a needed
+    library to the symbol versions required from it, e.g. {"libc.so.6": ["GLIBC_2.34"]}),
+    or None for non-ELF / truncated / statically linked files.
+    """
+    try:
+        with open(path, "rb") as f:
+            ident = f.read(16)
+            if len(ident) < 16 or ident[:4] != _ELF_MAGIC or ident[4] not in (1, 2) or ident[5] not in (1, 2):
+                return None
+            is64 = ident[4] == 2
+            end = "<" if ident[5] == 1 else ">"
+            if is64:
+                hdr = f.read(48)
+                if len(hdr) < 48:
+                    return None
+                phoff = struct.unpack_from(end + "Q", hdr, 16)[0]
+                phentsize, phnum = struct.unpack_from(end + "HH", hdr, 38)
+                ph_fmt = end + "IIQQQQQQ"
+            else:
+                hdr = f.read(36)
+                if len(hdr) < 36:
+                    return None
+                phoff = struct.unpack_from(end + "I", hdr, 12)[0]
+                phentsize, phnum = struct.unpack_from(end + "HH", hdr, 26)
+                ph_fmt = end + "IIIIIIII"
+            if not phoff or phentsize < struct.calcsize(ph_fmt):
+                return None
+
+            f.seek(phoff)
+            table = f.read(phentsize * phnum)
+            loads = []
+            dynamic = None
+            for i in range(phnum):
+                fields = struct.unpack_from(ph_fmt, table, i * phentsize)
+                if is64:
+                    p_type, _flags, p_offset, p_vaddr, _paddr, p_filesz = fields[:6]
+                else:
+                    p_type, p_offset, p_vaddr, _paddr, p_filesz = fields[:5]
+                if p_type == _PT_LOAD:
+                    loads.append((p_vaddr, p_offset, p_filesz))
+                elif p_type == _PT_DYNAMIC:
+                    dynamic = (p_offset, p_filesz)
+            if dynamic is None:
+                return None
+
+            def to_offset(vaddr):
+                for base, offset, size in loads:
+                    if base <= vaddr < base + size:
+                        return offset + (vaddr - base)
+                return None
+
+            f.seek(dynamic[0])
+            dyn = f.read(dynamic[1])
+            dyn_fmt = end + ("qQ" if is64 else "iI")
+            dyn_size = struct.calcsize(dyn_fmt)
+            entries = []
+            for pos in range(0, len(dyn) - dyn_size + 1, dyn_size):
+                tag, val = struct.unpack_from(dyn_fmt, dyn, pos)
+                if tag == 0:
+                    break
+                entries.append((tag, val))
+            tags = {}
+            for tag, val in entries:
+                tags.setdefault(tag, val)
+            strtab_off = to_offset(tags.get(_DT_STRTAB, -1))
+            if strtab_off is None:
+                return None
+            f.seek(strtab_off)
+            strtab = f.read(tags.get(_DT_STRSZ) or 0)
+
+            versions = {}
+            verneed_off = to_offset(tags.get(_DT_VERNEED, -1))
+            if verneed_off is not None:
+                pos = verneed_off
+                for _ in range(tags.get(_DT_VERNEEDNUM) or 0):
+                    f.seek(pos)
+                    need = f.read(16)
+                    if len(need) < 16:
+                        break
+                    _ver, cnt, file_off, aux, nxt = struct.unpack(end + "HHIII", need)
+                    lib = _cstr(strtab, file_off)
+                    aux_pos = pos + aux
+                    for _ in range(cnt):
+                        f.seek(aux_pos)
+                        vna = f.read(16)
+                        if len(vna) < 16:
+                            break
+                        _hash, _flags, _other, name_off, vna_next = struct.unpack(end + "IHHII", vna)
+                        name = _cstr(strtab, name_off)
+                        if lib and name:
+                            versions.setdefault(lib, []).append(name)
+                        if not vna_next:
+                            break
+                        aux_pos += vna_next
+                    if not nxt:
+                        break
+                    pos += nxt
+    except (OSError, struct.error):
+        return None
+
+    def strings(tag):
+        return [s for s in (_cstr(strtab, val) for t, val in entries if t == tag) if s]
+
+    def search_path(tag):
+        return [p for s in strings(tag) for p in s.split(":") if p]
+
+    soname = strings(_DT_SONAME)
+    return {
+        "soname": soname[0] if soname else None,
+        "needed": strings(_DT_NEEDED),
+        "rpath": search_path(_DT_RPATH),
+        "runpath": search_path(_DT_RUNPATH),
+        "versions": versions,
+    }
+
+
+def _ld_so_conf_dirs(path="/etc/ld.so.conf", _seen=None):
+    seen = _seen if _seen is not None else set()
+    if path in seen:
+        return []
+    seen.add(path)
+    dirs = []
+    try:
+        lines = Path(path).read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return dirs
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("include "):
+            pattern = line.split(None, 1)[1].strip()
+            if not os.path.isabs(pattern):
+                pattern = os.path.join(os.path.dirname(path), pattern)
+            for inc in sorted(glob.glob(pattern)):
+                dirs.extend(_ld_so_conf_dirs(inc, seen))
+        else:
+            dirs.append(line)
+    return dirs
+
+
+def system_library_dirs():
+    """
+    Loader search directories: /etc/ld.so.conf (with includes) plus the built-in defaults.
+    """
+    return list(dict.fromkeys([*_ld_so_conf_dirs(), *_DEFAULT_LIB_DIRS]))
+
+
+def system_glibc_version():
+    """
+    Host glibc version as a tuple (e.g. (2, 36)), or None (musl, non-Linux).
+    """
+    try:
+        value = os.confstr("CS_GNU_LIBC_VERSION") or ""
+    except (AttributeError, OSError, ValueError):
+        return None
+    m = re.match(r"^glibc\s+(\d+(?:\.\d+)*)", value)
+    return tuple(int(x) for x in m.group(1).split(".")) if m else None
+
+
+class _DirListing:
+    """
+    Memoized directory listings: membership tests instead of one stat per candidate.
+    """
+
+    def __init__(self):
+        self._names = {}
+
+    def contains(self, directory, name):
+        names = self._names.get(directory)
+        if names is None:
+            try:
+                names = frozenset(os.listdir(directory))
+            except OSError:
+                names = frozenset()
+            self._names[directory] = names
+        return name in names
+
+
+def _expand_origin(entry, origin):
+    return entry.replace("${ORIGIN}", origin).replace("$ORIGIN", origin)
+
+
+def _resolve_needed(lib, path, info, *, env_lib, system_dirs, listing):
+    """
+    True if the loader would find `lib` for the object at `path`
+    (DT_RPATH unless DT_RUNPATH is set, DT_RUNPATH, the env's lib/, system dirs).
+    """
+    if "/" in lib:
+        return os.path.exists(lib if os.path.isabs(lib) else os.path.join(os.path.dirname(path), lib))
+    origin = os.path.dirname(path)
+    dirs = [] if info["runpath"] else [_expand_origin(p, origin) for p in info["rpath"]]
+    dirs += [_expand_origin(p, origin) for p in info["runpath"]]
+    dirs.append(env_lib)
+    dirs.extend(system_dirs)
+    for d in dirs:
+        if listing.contains(os.path.normpath(d), lib) and os.path.exists(os.path.join(d, lib)):
+            return True
+    return False
+
+
+def _iter_library_files(roots, match=is_shared_library_name):
+    """
+    Yield (path, is_symlink) for entries below `roots` whose name satisfies `match`, plus
+    every symlink (iterative scandir; directory symlinks are not followed).
+    """
+    seen_dirs = set()
+    stack = [str(r) for r in roots]
+    while stack:
+        path = stack.pop()
+        if path in seen_dirs:
+            continue
+        seen_dirs.add(path)
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for e in entries:
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                    continue
+                is_link = e.is_symlink()
+            except OSError:
+                continue
+            if is_link or match(e.name):
+                yield e.path, is_link
+
+
+def _too_new_glibc(info, host):
+    if host is None:
+        return []
+    needed = set()
+    for names in info["versions"].values():
+        for name in names:
+            m = _GLIBC_VERSION_RE.match(name)
+            if m and tuple(int(x) for x in m.group(1).split(".")) > host:
+                needed.add(name)
+    return sorted(needed, key=lambda n: tuple(int(x) for x in n[6:].split(".")))
+
+
+def _owners_for(env_path, site_pkgs, rels):
+    """
+    Owning package names for relpaths: conda-meta first, then pip RECORD files.
+    """
+    owners = {}
+    index = load_conda_meta_index(env_path)
+    if index is not None:
+        for rel in rels:
+            rec = file_owner(index, rel)
+            if rec is not None:
+                owners[rel] = rec["meta"].get("name")
+    pending = set(rels) - set(owners)
+    if pending:
+        for rel, dist_name, _dist_rel in iter_pip_owned_files(env_path, site_pkgs):
+            if rel in pending:
+                owners[rel] = dist_name.split("-", 1)[0]
+                pending.discard(rel)
+                if not pending:
+                    break
+    return owners
+
+
+def scan_elf_dependencies(env_path, site_pkgs=None):
+    """
+    Static `ImportError: libxyz.so` detection for Linux envs: parse the ELF dynamic section
+    of every shared library below lib/ and site-packages (in parallel, nothing is imported
+    or loaded) and resolve DT_NEEDED entries like the loader would.
+
+    Every needed library is resolved against the object's real search path first. One that
+    only exists elsewhere in the env (by SONAME/file name) is reported separately: it loads
+    only if something preloads it (torch does this for its vendored libraries), so it is
+    a weaker finding than a library that is missing outright.
+    Returns one `elf-unresolved` issue per affected library (missing libraries and GLIBC
+    symbol versions newer than the host's), one `elf-off-search-path` issue per library
+    whose dependencies are present but not on its search path, and one `dangling-symlinks`
+    issue.
+    """
+    if not sys.platform.startswith("linux"):
+        return []
+    prefix = Path(env_path)
+    env_lib = str(prefix / "lib")
+    roots = [env_lib]
+    for sp in site_pkgs or []:
+        if not str(Path(sp)).startswith(env_lib + os.sep):
+            roots.append(str(sp))
+
+    dangling = []
+    libraries = {}
+    for path, is_link in _iter_library_files(roots):
+        if is_link:
+            if not os.path.exists(path):
+                try:
+                    target = os.readlink(path)
+                except OSError:
+                    target = None
+                dangling.append({"path": os.path.relpath(path, prefix).replace("\\", "/"), "target": target})
+                continue
+            if not is_shared_library_name(os.path.basename(path)):
+                continue
+        libraries.setdefault(os.path.realpath(path), path)
+
+    paths = list(libraries.values())
+    workers = min(16, (os.cpu_count() or 1) * 2, max(1, len(paths)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        infos = list(ex.map(parse_elf_dynamic, paths))
+
+    # Library name (file name and SONAME) -> env objects providing it.
+    provided = {}
+    for path, info in zip(paths, infos):
+        rel = os.path.relpath(path, prefix).replace("\\", "/")
+        names = {os.path.basename(path), info["soname"] if info else None} - {None}
+        for name in names:
+            provided.setdefault(name, []).append(rel)
+    system_dirs = system_library_dirs()
+    host_glibc = system_glibc_version()
+    listing = _DirListing()
+
+    found = []
+    off_path = []
+    for path, info in zip(paths, infos):
+        if info is None:
+            continue
+        unresolved = [
+            lib
+            for lib in info["needed"]
+            if not _resolve_needed(lib, path, info, env_lib=env_lib, system_dirs=system_dirs, listing=listing)
+        ]
+        missing = [lib for lib in unresolved if lib not in provided]
+        elsewhere = [{"library": lib, "found": sorted(provided[lib])[:3]} for lib in unresolved if lib in provided]
+        glibc = _too_new_glibc(info, host_glibc)
+        rel = os.path.relpath(path, prefix).replace("\\", "/")
+        if missing or glibc:
+            found.append((rel, missing, glibc))
+        if elsewhere:
+            off_path.append((rel, elsewhere))
+
+    issues = []
+    if found or off_path:
+        owners = _owners_for(env_path, site_pkgs, [rel for rel, *_rest in found + off_path])
+        for rel, missing, glibc in sorted(found):
+            issues.append({"type": "elf-unresolved", "path": rel, "package": owners.get(rel), "missing": missing, "glibc": glibc})
+        for rel, elsewhere in sorted(off_path):
+            issues.append({"type": "elf-off-search-path", "path": rel, "package": owners.get(rel), "libraries": elsewhere})
+    if dangling:
+        dangling.sort(key=lambda d: d["path"])
+        issues.append({"type": "dangling-symlinks", "count": len(dangling), "links": dangling[:REPORT_LIMIT]})
+    return issues
+
+
+def library_key(name):
+    """
+    Identity of a shared library across copies: libgomp-a34b3233.so.1.0.0 and libgomp.so.1
+    both map to "libgomp.so.1"; openblas-5f2a1c3d.dll maps to "openblas.dll". None for
+    names that are not shared libraries.
+    """
+    m = _ELF_LIB_KEY_RE.match(name)
+    if m:
+        return f"{m.group('stem')}.so.{m.group('major')}" if m.group("major") else f"{m.group('stem')}.so"
+    m = _DLL_KEY_RE.match(name)
+    if m:
+        return f"{m.group('stem').lower()}.dll"
+    return None
+
+
+def _is_native_library_name(name):
+    """
+    Shared libraries (lib*.so*, *.dll), not Python extension modules.
+    """
+    lower = name.lower()
+    if lower.endswith(".dll"):
+        return True
+    return lower.startswith("lib") and is_shared_library_name(name) and ".cpython-" not in lower and ".abi3." not in lower
+
+
+def _library_roots(env_path, site_pkgs):
+    prefix = Path(env_path)
+    if os.name == "nt":
+        roots = [str(prefix / "Library" / "bin"), str(prefix / "DLLs")]
+    else:
+        roots = [str(prefix / "lib")]
+    for sp in site_pkgs or []:
+        if not any(str(Path(sp)).startswith(root + os.sep) for root in roots):
+            roots.append(str(sp))
+    return roots
+
+
+def scan_duplicate_libraries(env_path, site_pkgs=None):
+    """
+    Shared libraries present in several copies (wheel-vendored OpenBLAS/libgomp/CUDA
+    runtimes next to the conda-provided ones). Copies are grouped by SONAME (ELF) or by
+    the de-mangled file name, then hashed in parallel to tell byte-identical copies from
+    different builds of the same library. Symlinks and hardlinks are not copies.
+    Returns one `duplicate-native-libs` issue or [].
+    """
+    prefix = Path(env_path)
+    groups = {}
+    seen = set()
+    for path, is_link in _iter_library_files(_library_roots(env_path, site_pkgs), match=_is_native_library_name):
+        if is_link:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        groups.setdefault(library_key(os.path.basename(path)), []).append((path, st.st_size))
+    groups = {key: copies for key, copies in groups.items() if key and len(copies) > 1}
+    if not groups:
+        return []
+
+    # Refine by SONAME where available (libfoo.so.1 from two unrelated projects is rare,
+    # but a vendored copy keeps the upstream SONAME even when its file name is mangled).
+    paths = [path for copies in groups.values() for path, _size in copies]
+    workers = min(16, (os.cpu_count() or 1) * 2, len(paths))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        sonames = dict(zip(paths, ex.map(lambda p: (parse_elf_dynamic(p) or {}).get("soname"), paths)))
+    refined = {}
+    for key, copies in groups.items():
+        for path, size in copies:
+            soname = sonames.get(path)
+            refined.setdefault((library_key(soname) or key) if soname else key, []).append((path, size))
+    groups = {key: copies for key, copies in refined.items() if len(copies) > 1}
+    if not groups:
+        return []
+
+    digests = hash_files(path for copies in groups.values() for path, _size in copies)
+    rels = {path: os.path.relpath(path, prefix).replace("\\", "/") for copies in groups.values() for path, _size in copies}
+    owners = _owners_for(env_path, site_pkgs, list(rels.values()))
+
+    libraries = []
+    for key, copies in groups.items():
+        copies.sort(key=lambda c: rels[c[0]])
+        sizes = [size for _path, size in copies]
+        libraries.append(
+            {
+                "library": key,
+                "identical": len({digests.get(path) for path, _size in copies}) == 1,
+                "redundant_bytes": sum(sizes) - max(sizes),
+                "copies": [
+                    {"path": rels[path], "size": size, "sha256": digests.get(path), "package": owners.get(rels[path])}
+                    for path, size in copies
+                ],
+            }
+        )
+    libraries.sort(key=lambda lib: (-lib["redundant_bytes"], lib["library"]))
+    return [
+        {
+            "type": "duplicate-native-libs",
+            "count": len(libraries),
+            "redundant_bytes": sum(lib["redundant_bytes"] for lib in libraries),
+            "libraries": libraries[:REPORT_LIMIT],
+        }
+    ]
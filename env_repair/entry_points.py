@@ -0,0 +1,158 @@
+import configparser
+import json
+import re
+import subprocess
+from pathlib import Path
+
+# Entry point groups that become executables in bin/ (Scripts/).
+SCRIPT_GROUPS = ("console_scripts", "gui_scripts")
+# Result lines of the helper are tagged so output printed by imported modules is ignored.
+_RESULT_TAG = "@@env-repair-ep@@ "
+_ENTRY_RE = re.compile(r"^(?P<module>[\w.]+)\s*(?::\s*(?P<attr>[\w.]+))?\s*(?:\[(?P<extras>[^\]]*)\])?\s*$")
+
+# Runs inside the target env's interpreter: resolve every target (import + getattr chain),
+# each one isolated in its own try block, one tagged JSON line per target.
+_RESOLVER = r"""
+import importlib, json, sys, traceback
+out = sys.stdout
+sys.stdout = sys.stderr
+for i, target in enumerate(json.loads(sys.stdin.read())):
+    error = None
+    try:
+        obj = importlib.import_module(target["module"])
+        for part in (target.get("attr") or "").split("."):
+            if part:
+                obj = getattr(obj, part)
+    except BaseException as exc:
+        lines = traceback.format_exception_only(type(exc), exc)
+        error = (lines[-1] if lines else repr(exc)).strip()
+    out.write(TAG + json.dumps({"i": i, "error": error}) + "\n")
+    out.flush()
+"""
+
+
+def entry_point_dists(site_pkg, entries):
+    """
+    (name, metadata dir) for everything in one site-packages that can declare scripts:
+    `*.dist-info` (pip installs, including PEP 660 editable ones), legacy `*.egg-info` dirs and
+    the `*.egg-info` of `setup.py develop` projects referenced by a `.egg-link` file.
+    `entries` is the (name, is_dir) list of `scan.list_site_packages`.
+    """
+    site_pkg = Path(site_pkg)
+    found = []
+    for name, is_dir in entries:
+        lower = name.lower()
+        if is_dir and lower.endswith((".dist-info", ".egg-info")):
+            found.append((name, site_pkg / name))
+        elif not is_dir and lower.endswith(".egg-link"):
+            # First line is the project directory (absolute or relative to site-packages).
+            try:
+                lines = (site_pkg / name).read_text(encoding="utf-8", errors="replace").splitlines()
+                project = site_pkg / lines[0].strip() if lines and lines[0].strip() else None
+                eggs = sorted(p for p in project.iterdir() if p.is_dir() and p.name.lower().endswith(".egg-info")) if project else []
+            except OSError:
+                continue
+            found += [(egg.name, egg) for egg in eggs]
+    return found
+
+
+def read_entry_points(dist_info, groups=SCRIPT_GROUPS):
+    """
+    Parse `entry_points.txt` of a dist-info/egg-info directory.
+    Returns [{"group", "name", "module", "attr"}] for the requested groups.
+    """
+    path = Path(dist_info) / "entry_points.txt"
+    parser = configparser.ConfigParser(delimiters=("=",), interpolation=None)
+    parser.optionxform = str
+    try:
+        parser.read_string(path.read_text(encoding="utf-8", errors="replace"))
+    except (OSError, configparser.Error):
+        return []
+    entries = []
+    for group in groups:
+        if not parser.has_section(group):
+            continue
+        for name, value in parser.items(group):
+            m = _ENTRY_RE.match(value.strip())
+            if not m:
+                entries.append({"group": group, "name": name, "module": value.strip(), "attr": None, "invalid": True})
+                continue
+            entries.append({"group": group, "name": name, "module": m.group("module"), "attr": m.group("attr")})
+    return entries
+
+
+def _run_resolver(python_exe, targets, timeout):
+    """
+    One helper process for `targets`. Returns ({index: error}, crashed_detail) where
+    results cover a prefix of `targets` if the helper died or timed out.
+    Raises OSError if the interpreter cannot be started.
+    """
+    code = _RESOLVER.replace("TAG", json.dumps(_RESULT_TAG))
+    payload = json.dumps([{"module": t["module"], "attr": t.get("attr")} for t in targets])
+    detail = None
+    try:
+        proc = subprocess.run(
+            [python_exe, "-c", code],
+            input=payload,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
+        )
+        stdout, stderr = proc.stdout, proc.stderr
+        if proc.returncode != 0:
+            detail = (stderr or "").strip().splitlines()[-1:] or [f"exit code {proc.returncode}"]
+            detail = detail[0]
+    except subprocess.TimeoutExpired as exc:
+        stdout = exc.stdout or ""
+        if isinstance(stdout, bytes):
+            stdout = stdout.decode("utf-8", errors="replace")
+        detail = f"Entry point resolution timed out (>{timeout}s)"
+
+    results = {}
+    for line in (stdout or "").splitlines():
+        if not line.startswith(_RESULT_TAG):
+            continue
+        try:
+            item = json.loads(line[len(_RESULT_TAG) :])
+        except ValueError:
+            continue
+        results[item.get("i")] = item.get("error")
+    return results, detail
+
+
+def verify_entry_points(python_exe, targets, *, timeout=120):
+    """
+    Resolve all entry point targets inside one helper process of the target env.
+    If the helper crashes or hangs on a target (segfault, os._exit, endless import),
+    that target is recorded as failed and the helper restarts with the remaining ones.
+    Returns one {**target, "ok", "error"} per target, in order.
+    """
+    results = [None] * len(targets)
+    for i, target in enumerate(targets):
+        if target.get("invalid"):
+            results[i] = {**target, "ok": False, "error": f"invalid entry point: {target['module']}"}
+    pending = [i for i, r in enumerate(results) if r is None]
+    while pending:
+        batch = [targets[i] for i in pending]
+        try:
+            errors, detail = _run_resolver(python_exe, batch, timeout)
+        except OSError as exc:
+            for idx in pending:
+                results[idx] = {**targets[idx], "ok": False, "error": str(exc)}
+            break
+        done = 0
+        for pos, idx in enumerate(pending):
+            if pos not in errors:
+                break
+            error = errors[pos]
+            results[idx] = {**targets[idx], "ok": error is None, "error": error}
+            done += 1
+        if done == len(pending):
+            break
+        # The helper died on pending[done]; blame that target and continue after it.
+        culprit = pending[done]
+        results[culprit] = {**targets[culprit], "ok": False, "error": detail or "entry point helper crashed"}
+        pending = pending[done + 1 :]
+    return results
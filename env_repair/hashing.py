@@ -0,0 +1,133 @@
+import atexit
+import concurrent.futures
+import hashlib
+import mmap
+import os
+import threading
+import time
+
+from .cache import cache_dir, load_json_cache, save_json_cache
+
+_CHUNK = 1024 * 1024
+HASH_CACHE_VERSION = 1
+# Keep at most this many digests; older entries not used in the current run are dropped first.
+HASH_CACHE_MAX_ENTRIES = 500_000
+# Files modified this recently may still change within the same mtime tick: never cache them.
+_RACY_SECONDS = 2.0
+
+_cache_lock = threading.Lock()
+_cache = None
+_cache_file = None
+_cache_used = set()
+_cache_dirty = False
+_save_registered = False
+
+
+def sha256_file(path):
+    """
+    Hex sha256 of a file. Reads through mmap (hashlib releases the GIL on large buffers,
+    so threads hash in parallel); falls back to chunked reads where mmap is unavailable.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+                return h.hexdigest()
+            except (OSError, ValueError):
+                f.seek(0)
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_cache_path():
+    return cache_dir() / "file-hashes.json"
+
+
+def _load_cache():
+    global _cache, _cache_file, _cache_dirty, _save_registered
+    path = hash_cache_path()
+    with _cache_lock:
+        if _cache is None or _cache_file != path:
+            if _cache_dirty:
+                _save_locked()
+            data = load_json_cache(path, version=HASH_CACHE_VERSION)
+            _cache = data if isinstance(data, dict) else {}
+            _cache_file = path
+            _cache_used.clear()
+            _cache_dirty = False
+            if not _save_registered:
+                atexit.register(save_hash_cache)
+                _save_registered = True
+        return _cache
+
+
+def _stat_key(st):
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _cached_sha256(path, use_cache):
+    global _cache_dirty
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    # Without a real inode number (some filesystems/platforms report 0) the key cannot tell
+    # files apart, so such files are never cached.
+    key = _stat_key(st) if use_cache and st.st_ino else None
+    if key is not None:
+        digest = _load_cache().get(key)
+        if digest:
+            with _cache_lock:
+                _cache_used.add(key)
+            return digest
+    try:
+        digest = sha256_file(path)
+    except OSError:
+        return None
+    if key is not None and time.time() - st.st_mtime_ns / 1e9 > _RACY_SECONDS:
+        with _cache_lock:
+            _cache[key] = digest
+            _cache_used.add(key)
+            _cache_dirty = True
+    return digest
+
+
+def _save_locked():
+    global _cache_dirty
+    if len(_cache) > HASH_CACHE_MAX_ENTRIES:
+        for key in [k for k in _cache if k not in _cache_used][: len(_cache) - HASH_CACHE_MAX_ENTRIES]:
+            del _cache[key]
+    _cache_dirty = False
+    return save_json_cache(_cache_file, _cache, version=HASH_CACHE_VERSION)
+
+
+def save_hash_cache():
+    """
+    Persist new digests (no-op if nothing was hashed since the last save).
+    Runs once at interpreter exit; call it directly to flush earlier.
+    """
+    with _cache_lock:
+        if _cache is None or not _cache_dirty:
+            return False
+        return _save_locked()
+
+
+def hash_files(paths, *, max_workers=None, use_cache=True):
+    """
+    Hash many files in parallel. Returns dict[path] = hex sha256 (None if unreadable).
+
+    Digests are shared through a persistent cache (`.env_repair/cache/file-hashes.json`)
+    keyed by (device, inode, size, mtime_ns), so unchanged files are never re-read. New
+    digests are written once per run (see `save_hash_cache`).
+    """
+    paths = list(dict.fromkeys(str(p) for p in paths))
+    if len(paths) < 4:
+        digests = {p: _cached_sha256(p, use_cache) for p in paths}
+    else:
+        workers = max_workers or min(16, (os.cpu_count() or 1) * 2)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(paths))) as ex:
+            digests = dict(zip(paths, ex.map(lambda p: _cached_sha256(p, use_cache), paths)))
+    return digests
@@ -0,0 +1,182 @@
+import json
+import re
+from pathlib import Path
+
+from .conda_meta import conda_meta_dir, index_records, load_conda_meta_index
+
+_HEADER_RE = re.compile(r"^==>\s*(.*?)\s*<==\s*$")
+_TARBALL_SUFFIXES = (".conda", ".tar.bz2")
+
+
+def parse_dist(text):
+    """
+    "conda-forge/linux-64::numpy-1.26.4-py312h0_0" -> {"channel", "name", "version", "build", "dist"}.
+    None if the string has no name-version-build part.
+    """
+    text = (text or "").strip()
+    channel = None
+    if "::" in text:
+        channel, text = text.rsplit("::", 1)
+    for suffix in _TARBALL_SUFFIXES:
+        if text.endswith(suffix):
+            text = text[: -len(suffix)]
+    parts = text.rsplit("-", 2)
+    if len(parts) != 3 or not all(parts):
+        return None
+    name, version, build = parts
+    return {"channel": channel, "name": name, "version": version, "build": build, "dist": f"{name}-{version}-{build}"}
+
+
+def parse_history(env_path):
+    """
+    Revision model of `conda-meta/history`, without the conda CLI:
+    [{"rev", "date", "cmd", "added", "removed", "state"}] with rev numbered from 0 like
+    `conda list --revisions`; `state` maps package name -> parsed dist after that revision.
+    Returns [] if the file is missing.
+    """
+    try:
+        text = (conda_meta_dir(env_path) / "history").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    blocks = []
+    for line in text.splitlines():
+        m = _HEADER_RE.match(line)
+        if m:
+            blocks.append({"date": m.group(1), "cmd": None, "lines": []})
+            continue
+        line = line.strip()
+        if not line or not blocks:
+            continue
+        if line.startswith("#"):
+            if line.startswith("# cmd:"):
+                blocks[-1]["cmd"] = line[len("# cmd:") :].strip()
+            continue
+        blocks[-1]["lines"].append(line)
+
+    revisions = []
+    state = {}
+    for rev, block in enumerate(blocks):
+        lines = block["lines"]
+        added = []
+        removed = []
+        if lines and all(line[0] in "+-" for line in lines):
+            for line in lines:
+                dist = parse_dist(line[1:])
+                if dist is None:
+                    continue
+                (added if line[0] == "+" else removed).append(dist)
+            for dist in removed:
+                current = state.get(dist["name"])
+                if current is not None and current["dist"] == dist["dist"]:
+                    del state[dist["name"]]
+            for dist in added:
+                state[dist["name"]] = dist
+        elif lines:
+            # Old conda wrote the complete package list instead of a diff.
+            previous = state
+            state = {}
+            for line in lines:
+                dist = parse_dist(line)
+                if dist is not None:
+                    state[dist["name"]] = dist
+            added = [d for n, d in state.items() if previous.get(n, {}).get("dist") != d["dist"]]
+            removed = [d for n, d in previous.items() if state.get(n, {}).get("dist") != d["dist"]]
+        revisions.append({"rev": rev, "date": block["date"], "cmd": block["cmd"], "added": added, "removed": removed, "state": dict(state)})
+    return revisions
+
+
+def installed_state(env_path):
+    """
+    name -> parsed dist for the records currently in conda-meta.
+    """
+    state = {}
+    for rec in index_records(load_conda_meta_index(env_path)):
+        meta = rec["meta"]
+        name, version = meta.get("name"), meta.get("version")
+        build = meta.get("build") or meta.get("build_string")
+        if name and version and build:
+            state[name] = {
+                "channel": meta.get("channel"),
+                "name": name,
+                "version": str(version),
+                "build": str(build),
+                "dist": f"{name}-{version}-{build}",
+            }
+    return state
+
+
+def diff_states(current, target):
+    """
+    Exact change set to go from `current` to `target` (both name -> dist):
+    {"install": [dist], "remove": [name]} where install covers new and changed packages.
+    """
+    install = [target[n] for n in sorted(target) if current.get(n, {}).get("dist") != target[n]["dist"]]
+    remove = sorted(n for n in current if n not in target)
+    return {"install": install, "remove": remove}
+
+
+def find_cached_package(pkgs_dirs, dist):
+    """
+    Locate a dist in the package caches. Returns {"url", "md5", "path"} usable for an
+    `@EXPLICIT` install (cached extracted dirs and tarballs are reused by conda), or None.
+    """
+    for pkgs_dir in pkgs_dirs or []:
+        base = Path(pkgs_dir) / dist["dist"]
+        record = None
+        try:
+            record = json.loads((base / "info" / "repodata_record.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            record = None
+        tarball = next((base.with_name(base.name + s) for s in _TARBALL_SUFFIXES if base.with_name(base.name + s).is_file()), None)
+        url = record.get("url") if isinstance(record, dict) else None
+        if url:
+            return {"url": url, "md5": record.get("md5"), "path": str(tarball or base)}
+        if tarball is not None:
+            return {"url": tarball.resolve().as_uri(), "md5": None, "path": str(tarball)}
+    return None
+
+
+def plan_to_state(env_path, target_state, pkgs_dirs):
+    """
+    Package diff between the installed records and `target_state` (name -> dist), with each
+    package to install resolved against the caches; a dist carrying its own `url`/`md5` (from
+    a snapshot) can be fetched without the cache. `unfetchable` lists dists with neither a
+    cached package nor a recorded URL; `explicit` is True when there are none, i.e. nothing
+    needs the solver (removals alone never need it).
+    """
+    diff = diff_states(installed_state(env_path), target_state)
+    install = []
+    unfetchable = []
+    for dist in diff["install"]:
+        cached = find_cached_package(pkgs_dirs, dist)
+        if cached is None and dist.get("url"):
+            cached = {"url": dist["url"], "md5": dist.get("md5") or None, "path": None}
+        if cached is None:
+            unfetchable.append(dist["dist"])
+        install.append({**dist, "cached": cached})
+    return {"install": install, "remove": diff["remove"], "unfetchable": unfetchable, "explicit": not unfetchable}
+
+
+def plan_rollback(env_path, target_rev, pkgs_dirs, revisions=None):
+    """
+    `plan_to_state` for revision `target_rev` of `conda-meta/history` (None if unknown).
+    """
+    revisions = parse_history(env_path) if revisions is None else revisions
+    target = next((r for r in revisions if r["rev"] == target_rev), None)
+    if target is None:
+        return None
+    return {"rev": target_rev, **plan_to_state(env_path, target["state"], pkgs_dirs)}
+
+
+def write_explicit_file(path, install):
+    """
+    `@EXPLICIT` spec file (url#md5 per line) for the planned installs.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["@EXPLICIT"]
+    for item in install:
+        cached = item["cached"]
+        lines.append(f"{cached['url']}#{cached['md5']}" if cached.get("md5") else cached["url"])
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
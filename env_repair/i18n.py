@@ -13,6 +13,15 @@ MESSAGES = {
         "rollback_no_revisions": "no conda revisions found for this environment",
         "rollback_invalid_target": "invalid rollback target: {to}",
         "rollback_done": "rollback done: {to_rev}",
+        "rollback_diff": "package diff: {install} to install/change, {remove} to remove ({unfetchable} not in pkgs_dirs)",
+        "rollback_explicit": "all builds cached: explicit install/remove, no solver",
+        "rollback_solver": "some builds are not cached: falling back to `conda install --revision` (solver)",
+        "restore_plan": "restore plan: {env} <- {path}",
+        "restore_diff": "package diff: {install} to install/change, {remove} to remove ({unfetchable} neither cached nor with a URL); pip: {pip_install} to install (--no-deps), {pip_uninstall} to uninstall",
+        "restore_explicit": "explicit restore: exact builds (cached packages reused) and pinned pip dists, no solver",
+        "restore_solver": "solver restore: `env update` from the YAML derived from the snapshot",
+        "restore_done": "restore done: {env}",
+        "restore_invalid_snapshot": "not a native snapshot: {path}",
         "rebuild_plan": "rebuild plan: {src} -> {dst}",
         "rebuild_done": "rebuild done: {dst}",
         "rebuild_target_exists": "rebuild target already exists: {dst}",
@@ -20,11 +29,17 @@ MESSAGES = {
         "plan_only": "plan-only (no changes applied)",
         "clobber_header": "clobber diagnosis:",
         "clobber_no_log": "no logfile provided",
+        "clobber_proactive": "no logfile: checking installed file ownership for overlaps",
+        "clobber_no_overlaps": "no file is claimed by more than one package",
+        "clobber_overlap": " - {path}: {owners}",
         "clobber_no_paths": "no conflict paths found in log",
         "clobber_log_read_failed": "failed to read logfile: {path}",
         "inconsistent_header": "inconsistent diagnosis:",
         "inconsistent_found": "environment is inconsistent",
         "inconsistent_not_found": "no inconsistency warning detected",
+        "inconsistent_unsatisfied": "  {package}: {kind} `{spec}` not satisfied (installed: {installed})",
+        "inconsistent_not_installed": "not installed",
+        "inconsistent_solver_differs": "note: the dry-run solve reports inconsistent={value}",
         "inconsistent_fix_plan": "fix-inconsistent plan (level={level}): {env}",
         "inconsistent_fix_done": "fix-inconsistent done (level={level})",
         "cache_header": "cache check:",
@@ -35,10 +50,15 @@ MESSAGES = {
         "ssl_ok": "ssl import ok: {value}",
         "ssl_fail": "ssl import failed: {value}",
         "ssl_hint": "hint: try `mamba install -n base openssl ca-certificates certifi` (or `conda install ...`), and ensure proper conda activation in your shell",
+        "startup_env": "startup: {env}: {total} ms (site: {site} ms), sys.path entries: {paths}, egg-links: {eggs}",
+        "startup_pth": "  .pth {file}: {code} code line(s), {paths} path(s) ({missing} missing), imports: {ms} ms",
+        "startup_offender": "  {ms} ms  {module}  [{source}]",
+        "startup_no_python": "startup: {env}: no python interpreter found",
         "help_desc": "Scan and repair conda/mamba/micromamba environments with mixed conda/pip installs.",
         "help_help": "Show this help message and exit.",
         "help_env_multi": "Environment name(s) or path(s). Repeatable. Default: all discovered envs.",
         "help_fix": "Attempt repairs (safe-ish).",
+        "help_check": "Run an additional scan detector (repeatable): {choices}.",
         "help_adopt_pip": "Try to replace pip-installed packages with conda ones.",
         "help_keep_pip": "Keep the original pip-installed packages even if adopt-pip succeeds (default: uninstall pip version).",
         "help_prefer": "Preferred installer when fixing duplicates.",
@@ -49,17 +69,22 @@ MESSAGES = {
         "help_no_default_channels": "Do not auto-add defaults/anaconda.",
         "help_ignore_pinned": "Ignore conda pinned specs during installs.",
         "help_force_reinstall": "Force reinstall packages via conda.",
-        "help_snapshot": "Write env export YAML to this path (conda envs only).",
+        "help_snapshot": "Write the rescue snapshot to this path (conda envs: compact JSON, or env YAML for .yml/.yaml).",
         "help_json": "Output machine-readable JSON.",
         "help_debug": "Verbose debug logging + show JSON tool output.",
         "help_cmd_rollback": "Rollback a conda env to an earlier revision.",
+        "help_cmd_restore": "Restore a conda env from a native snapshot (explicit builds, pinned pip dists, no solver).",
+        "help_snapshot_file": "Path of the snapshot.json to restore.",
+        "help_restore_solver": "Restore via `env update` from the derived YAML (full solve) instead.",
         "help_cmd_rebuild": "Rebuild an env into a new env (export/import).",
-        "help_cmd_diagnose_clobber": "Parse a conda/mamba ClobberError log and find file owners.",
+        "help_cmd_diagnose_clobber": "Find file owners for a ClobberError log, or (without --logfile) find files claimed by several packages.",
         "help_cmd_diagnose_inconsistent": 'Check whether an env is "inconsistent" (conda warning).',
         "help_cmd_fix_inconsistent": 'Attempt to repair an "inconsistent" env.',
         "help_cmd_cache_check": "Show conda package cache locations.",
         "help_cmd_cache_fix": "Clean conda package caches.",
         "help_cmd_diagnose_ssl": "Diagnose SSL/OpenSSL issues (advisor).",
+        "help_cmd_profile_startup": "Measure interpreter startup cost per env and list the top offenders (.pth code, sitecustomize, sys.path).",
+        "help_top": "Number of top offenders to show per env.",
         "help_env_single": "Environment name or path.",
         "help_to": "Target: prev|latest|<N> (default: prev).",
         "help_dry_run": "Only simulate the action.",
@@ -67,8 +92,9 @@ MESSAGES = {
         "help_plan": "Only show plan (no changes).",
         "help_to_rebuild": "Target env name or path.",
         "help_verify": "Scan the new env after creation.",
-        "help_logfile": "Path to conda/mamba output log text.",
+        "help_logfile": "Path to conda/mamba output log text (optional; omit for a proactive overlap check).",
         "help_level_inconsistent": "Fix level.",
+        "help_solver": "Also confirm with a conda dry-run solve (slow; the local depends/constrains check needs no solver).",
         "help_level_cache": "Clean level.",
         "help_base": "Diagnose base/root prefix.",
     "progress_envs": "envs",
@@ -92,7 +118,19 @@ MESSAGES = {
         "fixes": "fixes:",
         "issue_duplicate_dist_info": " - duplicate-dist-info: {package} {versions}",
         "issue_duplicate_pyd": " - duplicate-pyd: {base} {files}",
+        "issue_stale_extension_abi": " - stale-extension-abi: {count} extension module(s) built for another Python than {tag} (first: {first})",
         "issue_invalid_artifact": " - invalid-artifact: {name}",
+        "issue_conda_files_damaged": " - conda-files-damaged: {package} (missing: {missing}, modified: {modified})",
+        "issue_orphan_files": " - orphan-files: {count} file(s) owned by no package, {size} MB (largest: {largest})",
+        "issue_file_overlaps": " - file-overlaps: {count} path(s) claimed by several packages ({packages})",
+        "issue_elf_unresolved": " - elf-unresolved: {path} ({package}) missing libs: {missing}; too new GLIBC: {glibc}",
+        "issue_elf_off_search_path": " - elf-off-search-path: {path} ({package}) needs libs present in the env but not on its search path: {libs}",
+        "issue_dangling_symlinks": " - dangling-symlinks: {count} broken link(s) (first: {first})",
+        "issue_foreign_prefix": " - foreign-prefix: {package} ({count} file(s) not relocated; old prefix: {prefixes})",
+        "issue_namespace_collisions": " - namespace-collisions: {count} module name(s) provided more than once ({names})",
+        "issue_stale_bytecode": " - stale-bytecode: {count} .pyc file(s) out of date or incompatible ({detail})",
+        "issue_unmet_requirements": " - unmet-requirements: {count} requirement(s) missing or conflicting (like `pip check`; first: {first})",
+        "issue_duplicate_native_libs": " - duplicate-native-libs: {count} shared librar(y/ies) installed more than once, {size} MB redundant (largest: {largest})",
         "issue_generic": " - {type}",
         "fix_line": " - {label} {method} {status}",
         "fix_ok": "ok",
@@ -104,8 +142,10 @@ MESSAGES = {
         "col_result": "result",
         "col_reason": "reason",
         "reason_stale_artifact": "stale/invalid artifact in site-packages",
+        "reason_bytecode_recompile": "out-of-date bytecode recompiled (compileall -j 0)",
         "reason_duplicate_dist_info": "duplicate .dist-info entries detected",
         "reason_conda_meta_reinstall": "broken conda-meta record(s) (missing depends / invalid json)",
+        "reason_conda_files_reinstall": "installed files missing, modified or not relocated (conda-meta paths_data)",
         "reason_case_conflict_pip_uninstall": "pip+conda installed same version with different name casing",
         "reason_case_conflict_conda_relink": "relink conda package after removing pip duplicate",
         "reason_reinstall_duplicates": "reinstall to resolve duplicates",
@@ -126,6 +166,15 @@ MESSAGES = {
         "rollback_no_revisions": "keine conda Revisions fuer dieses Environment gefunden",
         "rollback_invalid_target": "ungueltiges Rollback-Ziel: {to}",
         "rollback_done": "Rollback fertig: {to_rev}",
+        "rollback_diff": "Paket-Diff: {install} installieren/aendern, {remove} entfernen ({unfetchable} nicht in pkgs_dirs)",
+        "rollback_explicit": "alle Builds im Cache: explizites Install/Remove, kein Solver",
+        "rollback_solver": "nicht alle Builds im Cache: Fallback auf `conda install --revision` (Solver)",
+        "restore_plan": "Restore-Plan: {env} <- {path}",
+        "restore_diff": "Paket-Diff: {install} installieren/aendern, {remove} entfernen ({unfetchable} weder im Cache noch mit URL); pip: {pip_install} installieren (--no-deps), {pip_uninstall} deinstallieren",
+        "restore_explicit": "expliziter Restore: exakte Builds (Pakete aus dem Cache wiederverwendet) und gepinnte pip Dists, kein Solver",
+        "restore_solver": "Restore mit Solver: `env update` aus dem vom Snapshot abgeleiteten YAML",
+        "restore_done": "Restore fertig: {env}",
+        "restore_invalid_snapshot": "kein nativer Snapshot: {path}",
         "rebuild_plan": "Rebuild-Plan: {src} -> {dst}",
         "rebuild_done": "Rebuild fertig: {dst}",
         "rebuild_target_exists": "Rebuild-Ziel existiert bereits: {dst}",
@@ -133,11 +182,17 @@ MESSAGES = {
         "plan_only": "nur Plan (keine Aenderungen)",
         "clobber_header": "Clobber-Diagnose:",
         "clobber_no_log": "keine Logdatei angegeben",
+        "clobber_proactive": "keine Logdatei: pruefe Datei-Eigentuemer auf Ueberschneidungen",
+        "clobber_no_overlaps": "keine Datei gehoert mehreren Paketen",
+        "clobber_overlap": " - {path}: {owners}",
         "clobber_no_paths": "keine Konfliktpfade im Log gefunden",
         "clobber_log_read_failed": "Logdatei konnte nicht gelesen werden: {path}",
         "inconsistent_header": "Inconsistent-Diagnose:",
         "inconsistent_found": "Environment ist inconsistent",
         "inconsistent_not_found": "keine Inconsistency-Warnung erkannt",
+        "inconsistent_unsatisfied": "  {package}: {kind} `{spec}` nicht erfuellt (installiert: {installed})",
+        "inconsistent_not_installed": "nicht installiert",
+        "inconsistent_solver_differs": "Hinweis: der Dry-Run Solve meldet inconsistent={value}",
         "inconsistent_fix_plan": "Fix-Inconsistent Plan (level={level}): {env}",
         "inconsistent_fix_done": "Fix-Inconsistent fertig (level={level})",
         "cache_header": "Cache-Check:",
@@ -148,10 +203,15 @@ MESSAGES = {
         "ssl_ok": "ssl import ok: {value}",
         "ssl_fail": "ssl import fehlgeschlagen: {value}",
         "ssl_hint": "Hinweis: ggf. `mamba install -n base openssl ca-certificates certifi` (oder `conda install ...`) und korrekte conda Aktivierung im Terminal pruefen",
+        "startup_env": "Startup: {env}: {total} ms (site: {site} ms), sys.path Eintraege: {paths}, egg-links: {eggs}",
+        "startup_pth": "  .pth {file}: {code} Code-Zeile(n), {paths} Pfad(e) ({missing} fehlend), Imports: {ms} ms",
+        "startup_offender": "  {ms} ms  {module}  [{source}]",
+        "startup_no_python": "Startup: {env}: kein Python Interpreter gefunden",
         "help_desc": "Scan und Repair fuer conda/mamba/micromamba Environments mit gemischten conda/pip Installationen.",
         "help_help": "Hilfe anzeigen und beenden.",
         "help_env_multi": "Environment Name(n) oder Pfad(e). Wiederholbar. Default: alle gefundenen Envs.",
         "help_fix": "Reparaturen ausfuehren (safe-ish).",
+        "help_check": "Zusaetzlichen Scan-Detektor ausfuehren (mehrfach moeglich): {choices}.",
         "help_adopt_pip": "Versuche pip-installierte Pakete durch conda Pakete zu ersetzen.",
         "help_keep_pip": "pip-Version behalten, auch wenn adopt-pip erfolgreich ist (Default: pip-Version entfernen).",
         "help_prefer": "Bevorzugter Installer beim Fixen von Duplikaten.",
@@ -162,17 +222,22 @@ MESSAGES = {
         "help_no_default_channels": "defaults/anaconda nicht automatisch hinzufuegen.",
         "help_ignore_pinned": "Conda Pins (pinned specs) beim Install ignorieren.",
         "help_force_reinstall": "Pakete via conda/mamba erneut installieren (force-reinstall).",
-        "help_snapshot": "Env-Export YAML nach diesem Pfad schreiben (nur conda Envs).",
+        "help_snapshot": "Rettungs-Snapshot nach diesem Pfad schreiben (conda Envs: kompaktes JSON, oder Env-YAML bei .yml/.yaml).",
         "help_json": "Maschinenlesbares JSON ausgeben.",
         "help_debug": "Debug-Ausgabe + JSON Tool-Output anzeigen.",
         "help_cmd_rollback": "Rollback eines conda Envs auf eine fruehere Revision.",
+        "help_cmd_restore": "Conda Env aus einem nativen Snapshot wiederherstellen (explizite Builds, gepinnte pip Dists, kein Solver).",
+        "help_snapshot_file": "Pfad der snapshot.json fuer den Restore.",
+        "help_restore_solver": "Stattdessen per `env update` aus dem abgeleiteten YAML wiederherstellen (voller Solve).",
         "help_cmd_rebuild": "Rebuild: Env exportieren und als neues Env neu erstellen.",
-        "help_cmd_diagnose_clobber": "ClobberError Log parsen und Datei-Owner bestimmen.",
+        "help_cmd_diagnose_clobber": "Datei-Owner fuer ein ClobberError Log bestimmen, oder (ohne --logfile) Dateien finden, die mehreren Paketen gehoeren.",
         "help_cmd_diagnose_inconsistent": 'Pruefen, ob ein Env "inconsistent" ist (conda Warnung).',
         "help_cmd_fix_inconsistent": 'Versuch, ein "inconsistent" Env zu reparieren.',
         "help_cmd_cache_check": "Conda Package Cache Locations anzeigen.",
         "help_cmd_cache_fix": "Conda Package Caches bereinigen.",
         "help_cmd_diagnose_ssl": "SSL/OpenSSL Probleme diagnostizieren (Advisor).",
+        "help_cmd_profile_startup": "Interpreter-Startkosten pro Env messen und die groessten Verursacher auflisten (.pth Code, sitecustomize, sys.path).",
+        "help_top": "Anzahl der angezeigten Verursacher pro Env.",
         "help_env_single": "Environment Name oder Pfad.",
         "help_to": "Ziel: prev|latest|<N> (Default: prev).",
         "help_dry_run": "Aktion nur simulieren.",
@@ -180,8 +245,9 @@ MESSAGES = {
         "help_plan": "Nur Plan anzeigen (keine Aenderungen).",
         "help_to_rebuild": "Ziel-Environment Name oder Pfad.",
         "help_verify": "Neues Env nach Erstellung scannen.",
-        "help_logfile": "Pfad zur conda/mamba Output-Logdatei.",
+        "help_logfile": "Pfad zur conda/mamba Output-Logdatei (optional; ohne Log wird proaktiv geprueft).",
         "help_level_inconsistent": "Fix-Level.",
+        "help_solver": "Zusaetzlich mit einem conda Dry-Run Solve bestaetigen (langsam; der lokale depends/constrains Check braucht keinen Solver).",
         "help_level_cache": "Clean-Level.",
         "help_base": "Base/Root Prefix diagnostizieren.",
         "progress_envs": "Envs",
@@ -205,7 +271,19 @@ MESSAGES = {
         "fixes": "Fixes:",
         "issue_duplicate_dist_info": " - duplicate-dist-info: {package} {versions}",
         "issue_duplicate_pyd": " - duplicate-pyd: {base} {files}",
+        "issue_stale_extension_abi": " - stale-extension-abi: {count} Erweiterungsmodul(e) fuer eine andere Python-Version als {tag} (erstes: {first})",
         "issue_invalid_artifact": " - invalid-artifact: {name}",
+        "issue_conda_files_damaged": " - conda-files-damaged: {package} (fehlend: {missing}, veraendert: {modified})",
+        "issue_orphan_files": " - orphan-files: {count} Datei(en) ohne Paket-Eigentuemer, {size} MB (groesste: {largest})",
+        "issue_file_overlaps": " - file-overlaps: {count} Pfad(e) gehoeren mehreren Paketen ({packages})",
+        "issue_elf_unresolved": " - elf-unresolved: {path} ({package}) fehlende Bibliotheken: {missing}; zu neue GLIBC: {glibc}",
+        "issue_elf_off_search_path": " - elf-off-search-path: {path} ({package}) benötigt Bibliotheken, die im Env vorhanden, aber nicht im Suchpfad sind: {libs}",
+        "issue_dangling_symlinks": " - dangling-symlinks: {count} defekte(r) Link(s) (erster: {first})",
+        "issue_foreign_prefix": " - foreign-prefix: {package} ({count} Datei(en) nicht umgezogen; alter Prefix: {prefixes})",
+        "issue_namespace_collisions": " - namespace-collisions: {count} Modulname(n) mehrfach bereitgestellt ({names})",
+        "issue_stale_bytecode": " - stale-bytecode: {count} .pyc-Datei(en) veraltet oder inkompatibel ({detail})",
+        "issue_unmet_requirements": " - unmet-requirements: {count} Abhaengigkeit(en) fehlend oder in falscher Version (wie `pip check`; erste: {first})",
+        "issue_duplicate_native_libs": " - duplicate-native-libs: {count} Bibliothek(en) mehrfach installiert, {size} MB redundant (groesste: {largest})",
         "issue_generic": " - {type}",
         "fix_line": " - {label} {method} {status}",
         "fix_ok": "ok",
@@ -217,8 +295,10 @@ MESSAGES = {
         "col_result": "ergebnis",
         "col_reason": "grund",
         "reason_stale_artifact": "veraltetes/ungueltiges Artefakt in site-packages",
+        "reason_bytecode_recompile": "veralteter Bytecode neu kompiliert (compileall -j 0)",
         "reason_duplicate_dist_info": "doppelte .dist-info Eintraege erkannt",
         "reason_conda_meta_reinstall": "defekte conda-meta Records (depends fehlt / JSON ungueltig)",
+        "reason_conda_files_reinstall": "installierte Dateien fehlen, wurden veraendert oder nicht umgezogen (conda-meta paths_data)",
         "reason_case_conflict_pip_uninstall": "pip+conda haben gleiche Version mit unterschiedlicher Schreibweise installiert",
         "reason_case_conflict_conda_relink": "conda Paket nach pip-Uninstall erneut relinken",
         "reason_reinstall_duplicates": "Reinstall um Duplikate zu beheben",
@@ -0,0 +1,114 @@
+import concurrent.futures
+import os
+import stat
+from pathlib import Path
+
+from .conda_meta import conda_meta_dir, index_records, load_conda_meta_index, record_files
+from .hashing import hash_files
+from .record_stream import iter_record_paths_data, open_record
+
+# paths_data types that are (re)generated at link time; a missing/different one is not damage.
+_GENERATED_PATH_TYPES = {"pyc_file", "directory"}
+
+
+def _expected_sha256(entry):
+    """
+    Digest the installed file should have: `sha256_in_prefix` for files whose prefix
+    placeholder was rewritten, `sha256` otherwise; None when no reliable digest exists.
+    """
+    if entry.get("prefix_placeholder"):
+        value = entry.get("sha256_in_prefix")
+    else:
+        value = entry.get("sha256_in_prefix") or entry.get("sha256")
+    return value if isinstance(value, str) and value else None
+
+
+def _record_paths(env_path, rec):
+    """
+    (relpath, paths_data entry or None) for every file of a record. Records without
+    `paths_data` (older conda) fall back to their `files` list (existence check only).
+    """
+    entries = []
+    if "paths_data" in rec["keys"]:
+        try:
+            with open_record(conda_meta_dir(env_path) / rec["file"]) as f:
+                entries = [e for e in iter_record_paths_data(f) if isinstance(e, dict) and isinstance(e.get("_path"), str)]
+        except (OSError, ValueError):
+            entries = []
+    if entries:
+        return [(e["_path"].replace("\\", "/").lstrip("/"), e) for e in entries]
+    return [(f, None) for f in record_files(rec)]
+
+
+def _audit_record(env_path, rec, *, deep):
+    """
+    Check one package's files. Returns (missing, modified, to_hash, checked) where
+    to_hash is a list of (relpath, abs path, expected sha256) for the deep tier.
+    """
+    prefix = Path(env_path)
+    missing = []
+    modified = []
+    to_hash = []
+    checked = 0
+    for rel, entry in _record_paths(env_path, rec):
+        path_type = (entry or {}).get("path_type")
+        if path_type in _GENERATED_PATH_TYPES:
+            continue
+        full = prefix / rel
+        checked += 1
+        try:
+            st = os.lstat(full)
+        except OSError:
+            missing.append(rel)
+            continue
+        if entry is None or stat.S_ISLNK(st.st_mode) or path_type not in (None, "hardlink"):
+            continue
+        size = entry.get("size_in_bytes")
+        if isinstance(size, int) and not entry.get("prefix_placeholder") and st.st_size != size:
+            modified.append(rel)
+            continue
+        expected = _expected_sha256(entry) if deep else None
+        if expected:
+            to_hash.append((rel, str(full), expected))
+    return missing, modified, to_hash, checked
+
+
+def scan_conda_integrity(env_path, *, deep=False):
+    """
+    Audit installed files against each conda-meta record's `paths_data`:
+      - every listed file exists
+      - sizes match (files without prefix placeholders)
+      - deep: sha256 matches (parallel, mmap-backed hashing)
+    Returns one `conda-files-damaged` issue per affected package.
+    """
+    index = load_conda_meta_index(env_path)
+    if index is None:
+        return []
+    records = list(index_records(index))
+    workers = min(16, (os.cpu_count() or 1) * 2, max(1, len(records)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(lambda rec: _audit_record(env_path, rec, deep=deep), records))
+
+    digests = {}
+    if deep:
+        digests = hash_files(path for _m, _mod, to_hash, _c in results for _rel, path, _exp in to_hash)
+
+    issues = []
+    for rec, (missing, modified, to_hash, checked) in zip(records, results):
+        modified = modified + [rel for rel, path, expected in to_hash if digests.get(path) != expected]
+        if not missing and not modified:
+            continue
+        meta = rec["meta"]
+        issues.append(
+            {
+                "type": "conda-files-damaged",
+                "package": meta.get("name"),
+                "version": meta.get("version"),
+                "build": meta.get("build") or meta.get("build_string"),
+                "record": rec["file"],
+                "missing": sorted(missing),
+                "modified": sorted(modified),
+                "checked": checked,
+            }
+        )
+    return issues
@@ -0,0 +1,294 @@
+import os
+import posixpath
+from pathlib import Path
+
+from .conda_meta import file_owners, load_conda_meta_index
+from .discovery import find_site_packages
+from .dist_meta import iter_dist_infos, read_record_paths
+
+# Prefix-level directories that never hold package-owned files.
+_SKIP_TOP_DIRS = {"conda-meta", "pkgs", "envs", "conda-bld", ".env_repair"}
+# Files the conda installers/tools drop into a prefix root without any package record.
+_PREFIX_ROOT_FILES = {".condarc", ".nonadmin", "LICENSE.txt", "uninstall.sh", "_conda", "_conda.exe"}
+# Report at most this many orphan/overlap paths per env (counts always cover all).
+REPORT_LIMIT = 200
+
+
+def _key(relpath):
+    # Windows filesystems are case-insensitive: compare lowercase there.
+    return relpath.lower() if os.name == "nt" else relpath
+
+
+def _site_packages_rel(env_path, site_pkg):
+    try:
+        return Path(site_pkg).resolve().relative_to(Path(env_path).resolve()).as_posix()
+    except (OSError, ValueError):
+        return None
+
+
+def iter_pip_owned_files(env_path, site_pkgs=None):
+    """
+    Yield (relpath, dist_dir_name, dist_relpath) for every file listed in a dist-info RECORD
+    (or egg-info installed-files.txt), with paths relative to the env prefix. Files outside
+    the prefix are skipped.
+    """
+    for site_pkg in site_pkgs if site_pkgs is not None else find_site_packages(env_path):
+        sp_rel = _site_packages_rel(env_path, site_pkg)
+        if sp_rel is None:
+            continue
+        for dist in iter_dist_infos(site_pkg):
+            dist_rel = f"{sp_rel}/{dist.name}"
+            for path in read_record_paths(dist):
+                rel = posixpath.normpath(f"{sp_rel}/{path}")
+                if rel.startswith("../") or rel == "..":
+                    continue
+                yield rel, dist.name, dist_rel
+
+
+def _walk_files(root):
+    """
+    Yield (relpath, size) for every non-directory entry below `root` (iterative scandir,
+    symlinks are not followed), skipping top-level metadata/cache directories and
+    installer files.
+    """
+    stack = [(str(root), "")]
+    while stack:
+        path, rel_dir = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for e in entries:
+            rel = f"{rel_dir}{e.name}"
+            try:
+                is_dir = e.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if rel_dir or e.name not in _SKIP_TOP_DIRS:
+                    stack.append((e.path, rel + "/"))
+                continue
+            if not rel_dir and (e.name in _PREFIX_ROOT_FILES or e.name.startswith("Uninstall-")):
+                continue
+            try:
+                size = e.stat(follow_symlinks=False).st_size
+            except OSError:
+                size = 0
+            yield rel, size
+
+
+def _is_generated_pyc(rel, owned):
+    """
+    `pkg/__pycache__/mod.cpython-311.pyc` is owned when its source `pkg/mod.py` is.
+    """
+    parent, name = posixpath.split(rel)
+    if posixpath.basename(parent) != "__pycache__" or not name.endswith(".pyc"):
+        return False
+    source = posixpath.join(posixpath.dirname(parent), name.split(".", 1)[0] + ".py")
+    return _key(source) in owned
+
+
+def scan_orphan_files(env_path, site_pkgs=None):
+    """
+    Files in the env prefix owned by neither a conda-meta record nor a dist-info RECORD
+    (leftovers of interrupted installs, manual copies, stale shared libraries).
+    One scandir walk plus set membership; returns a single `orphan-files` issue or [].
+    """
+    index = load_conda_meta_index(env_path)
+    if index is None:
+        return []
+    owned = {_key(rel) for rel in file_owners(index)}
+    owned.update(_key(rel) for rel, _dist, _dist_rel in iter_pip_owned_files(env_path, site_pkgs))
+
+    orphans = []
+    for rel, size in _walk_files(env_path):
+        key = _key(rel)
+        if key in owned or _is_generated_pyc(rel, owned):
+            continue
+        orphans.append({"path": rel, "size": size})
+    if not orphans:
+        return []
+    orphans.sort(key=lambda o: (-o["size"], o["path"]))
+    return [
+        {
+            "type": "orphan-files",
+            "count": len(orphans),
+            "total_bytes": sum(o["size"] for o in orphans),
+            "files": orphans[:REPORT_LIMIT],
+        }
+    ]
+
+
+def _conda_owner(rec):
+    meta = rec["meta"]
+    return {
+        "kind": "conda",
+        "name": meta.get("name"),
+        "version": meta.get("version"),
+        "build": meta.get("build") or meta.get("build_string"),
+        "record": rec["file"],
+    }
+
+
+def _iter_pip_only_files(env_path, site_pkgs, conda_by_key):
+    """
+    (relpath, dist name) for RECORD entries of pip dists, skipping dists whose dist-info is
+    itself conda-owned (a conda package's own RECORD). `conda_by_key` maps `_key(relpath)`
+    of every conda-owned file to its records.
+    """
+    conda_dists = {}
+    for rel, dist_name, dist_rel in iter_pip_owned_files(env_path, site_pkgs):
+        owned_by_conda = conda_dists.get(dist_rel)
+        if owned_by_conda is None:
+            owned_by_conda = any(_key(f"{dist_rel}/{name}") in conda_by_key for name in ("METADATA", "RECORD", "PKG-INFO"))
+            conda_dists[dist_rel] = owned_by_conda
+        if not owned_by_conda:
+            yield rel, dist_name
+
+
+def find_file_overlaps(env_path, site_pkgs=None):
+    """
+    Paths claimed by more than one owner: several conda records, a conda record and a
+    pip-installed dist (RECORD), or several pip dists. Dists whose dist-info is itself
+    conda-owned count as part of that conda package.
+    Returns a list of {"relpath", "owners": [...]} sorted by relpath.
+    """
+    index = load_conda_meta_index(env_path)
+    conda = file_owners(index) if index is not None else {}
+    conda_by_key = {_key(rel): recs for rel, recs in conda.items()}
+
+    claims = {}
+    for rel, recs in conda.items():
+        if len(recs) > 1:
+            claims[_key(rel)] = (rel, [_conda_owner(r) for r in recs])
+
+    for rel, dist_name in _iter_pip_only_files(env_path, site_pkgs, conda_by_key):
+        key = _key(rel)
+        entry = claims.get(key)
+        if entry is None:
+            recs = conda_by_key.get(key) or []
+            entry = (rel, [_conda_owner(r) for r in recs])
+            claims[key] = entry
+        entry[1].append({"kind": "pip", "dist": dist_name})
+
+    overlaps = [{"relpath": rel, "owners": owners} for rel, owners in claims.values() if len(owners) > 1]
+    return sorted(overlaps, key=lambda o: o["relpath"])
+
+
+def scan_file_overlaps(env_path, site_pkgs=None):
+    """
+    Proactive clobber detection: one `file-overlaps` issue listing every multiply-owned path.
+    """
+    overlaps = find_file_overlaps(env_path, site_pkgs)
+    if not overlaps:
+        return []
+    packages = sorted(
+        {o.get("name") or o.get("dist") for item in overlaps for o in item["owners"]},
+        key=lambda n: str(n).lower(),
+    )
+    return [
+        {
+            "type": "file-overlaps",
+            "count": len(overlaps),
+            "packages": packages,
+            "overlaps": overlaps[:REPORT_LIMIT],
+        }
+    ]
+
+
+def _module_name(component):
+    """
+    Importable name of a top-level site-packages entry (six.py -> six,
+    _foo.cpython-312-x86_64-linux-gnu.so -> _foo, pkg -> pkg); None for metadata/other files.
+    """
+    lower = component.lower()
+    if lower.endswith((".dist-info", ".egg-info", ".pth", ".data")) or component == "__pycache__":
+        return None
+    if lower.endswith((".py", ".pyc", ".so", ".pyd")):
+        return component.split(".", 1)[0]
+    return component if "." not in component else None
+
+
+def build_module_index(env_path, site_pkgs=None):
+    """
+    Map (site-packages relpath, top-level module name) -> {owner label: [files]} from conda-meta
+    file lists and pip RECORDs (dists whose dist-info is conda-owned count as the conda package).
+    """
+    site_pkgs = list(site_pkgs if site_pkgs is not None else find_site_packages(env_path))
+    sp_rels = [r for r in (_site_packages_rel(env_path, sp) for sp in site_pkgs) if r]
+    index = load_conda_meta_index(env_path)
+    conda = file_owners(index) if index is not None else {}
+    conda_by_key = {_key(rel): recs for rel, recs in conda.items()}
+
+    modules = {}
+
+    def add(rel, owner):
+        for sp_rel in sp_rels:
+            if not rel.startswith(sp_rel + "/"):
+                continue
+            inner = rel[len(sp_rel) + 1 :]
+            name = _module_name(inner.split("/", 1)[0])
+            if name:
+                modules.setdefault((sp_rel, name), {}).setdefault(owner, []).append(inner)
+            return
+
+    for rel, recs in conda.items():
+        for rec in recs:
+            add(rel, f"conda:{rec['meta'].get('name')}")
+
+    for rel, dist_name in _iter_pip_only_files(env_path, site_pkgs, conda_by_key):
+        add(rel, f"pip:{dist_name.split('-', 1)[0]}")
+    return modules
+
+
+def _is_regular_provider(name, files):
+    """
+    False for PEP 420 namespace portions (files below name/ but no name/__init__.py).
+    """
+    return any(f == f"{name}/__init__.py" or "/" not in f for f in files)
+
+
+def _shadowed_modules(files):
+    """
+    `a/b.py` next to a package `a/b/__init__.py` (the package wins, the module is dead code).
+    """
+    paths = set(files)
+    shadows = []
+    for f in sorted(paths):
+        if f.endswith(".py") and f[:-3] + "/__init__.py" in paths:
+            shadows.append(f[:-3])
+    return shadows
+
+
+def scan_namespace_collisions(env_path, site_pkgs=None):
+    """
+    Static shadowing check over the module index:
+      - `duplicate`: one top-level module/package provided by several dists (vendored six.py,
+        a pip copy next to the conda package). PEP 420 namespace portions are not collisions.
+      - `shadow`: a module next to a package of the same name (e.g. jedi/common.py and
+        jedi/common/__init__.py from different installs).
+    Returns one `namespace-collisions` issue or [].
+    """
+    collisions = []
+    for (sp_rel, name), owners in sorted(build_module_index(env_path, site_pkgs).items()):
+        regular = sorted(owner for owner, files in owners.items() if _is_regular_provider(name, files))
+        if len(regular) > 1:
+            collisions.append({"name": name, "kind": "duplicate", "owners": regular, "site_packages": sp_rel})
+        all_files = [f for files in owners.values() for f in files]
+        for shadow in _shadowed_modules(all_files):
+            providers = sorted(
+                owner
+                for owner, files in owners.items()
+                if f"{shadow}.py" in files or f"{shadow}/__init__.py" in files
+            )
+            collisions.append({"name": shadow.replace("/", "."), "kind": "shadow", "owners": providers, "site_packages": sp_rel})
+    if not collisions:
+        return []
+    return [
+        {
+            "type": "namespace-collisions",
+            "count": len(collisions),
+            "collisions": collisions[:REPORT_LIMIT],
+        }
+    ]
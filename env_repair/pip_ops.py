@@ -1,11 +1,58 @@
 import json
+import os
 import subprocess
+import sys
 from pathlib import Path
 
+from .discovery import env_prefix_from_python, find_site_packages
+from .dist_meta import find_installed_dist, freeze_lines, package_list_mode, read_installed_dists, report_entry_mismatch
 from .subprocess_utils import run_cmd_live
 
 
-def pip_list_json(python_exe):
+def _includes_system_site_packages(prefix):
+    cfg = Path(prefix) / "pyvenv.cfg"
+    try:
+        lines = cfg.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return False
+    for line in lines:
+        key, _, value = line.partition("=")
+        if key.strip().lower() == "include-system-site-packages":
+            return value.strip().lower() == "true"
+    return False
+
+
+def _has_egg_links(site_pkgs):
+    for site_pkg in site_pkgs:
+        try:
+            with os.scandir(site_pkg) as it:
+                if any(e.name.lower().endswith(".egg-link") for e in it):
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def _native_site_packages(python_exe):
+    """
+    site-packages dirs to read metadata from directly, or None when pip must be asked
+    (CLI mode forced, unknown layout, a venv that also sees the system site-packages, or
+    `setup.py develop` installs whose metadata lives outside site-packages behind a
+    `.egg-link`). PEP 660 editable installs (`__editable__` hooks) have a dist-info with
+    `direct_url.json` and are read natively.
+    """
+    if not python_exe or package_list_mode() == "cli":
+        return None
+    prefix = env_prefix_from_python(python_exe)
+    if _includes_system_site_packages(prefix):
+        return None
+    site_pkgs = find_site_packages(prefix)
+    if not site_pkgs or _has_egg_links(site_pkgs):
+        return None
+    return site_pkgs
+
+
+def _pip_list_cli(python_exe):
     cmd = [python_exe, "-m", "pip", "list", "--format=json"]
     res = subprocess.run(cmd, capture_output=True, text=True, check=False)
     if res.returncode != 0:
@@ -27,21 +74,73 @@ def pip_list_json(python_exe):
     return out
 
 
+def pip_list_json(python_exe):
+    """
+    Installed dists as [{"name", "version", "channel": "pypi"}].
+    Read from dist-info metadata by default (no `python -m pip` spawn); see ENV_REPAIR_PACKAGE_LIST.
+    """
+    site_pkgs = _native_site_packages(python_exe)
+    native = None
+    if site_pkgs is not None:
+        native = [
+            {"name": d["name"], "version": d["version"], "channel": "pypi"} for d in read_installed_dists(site_pkgs)
+        ]
+        if package_list_mode() == "native":
+            return native
+    cli = _pip_list_cli(python_exe)
+    if native is not None:
+        report_entry_mismatch(python_exe, native, cli)
+        return cli or native
+    return cli
+
+
+def _report_freeze_mismatch(python_exe, native, cli):
+    """
+    Print requirement lines only one side of a `verify` freeze produced to stderr.
+    """
+    native = {line for line in native.splitlines() if line and not line.startswith("#")}
+    cli = {line for line in cli.splitlines() if line and not line.startswith("#")}
+    if native == cli:
+        return
+    sys.stderr.write(f"[verify] pip freeze mismatch for {python_exe}\n")
+    for line in sorted(native - cli):
+        sys.stderr.write(f"[verify]   native only: {line}\n")
+    for line in sorted(cli - native):
+        sys.stderr.write(f"[verify]   cli only: {line}\n")
+    sys.stderr.flush()
+
+
 def pip_freeze(python_exe, out_path):
+    """
+    Write a `pip freeze` snapshot to `out_path`, from dist-info metadata by default.
+    ENV_REPAIR_PACKAGE_LIST=verify also runs `pip freeze`, reports differences on stderr
+    and writes the pip output. Returns True on success.
+    """
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    res = subprocess.run([python_exe, "-m", "pip", "freeze"], capture_output=True, text=True, check=False)
-    if res.returncode != 0:
+    site_pkgs = _native_site_packages(python_exe)
+    native = None
+    if site_pkgs is not None:
+        native = "".join(line + "\n" for line in freeze_lines(read_installed_dists(site_pkgs)))
+    text = native
+    if native is None or package_list_mode() == "verify":
+        res = subprocess.run([python_exe, "-m", "pip", "freeze"], capture_output=True, text=True, check=False)
+        cli = res.stdout if res.returncode == 0 else None
+        if native is not None and cli is not None:
+            _report_freeze_mismatch(python_exe, native, cli)
+        text = cli if cli is not None else native
+    if text is None:
         return False
     try:
-        out_path.write_text(res.stdout, encoding="utf-8")
+        out_path.write_text(text, encoding="utf-8")
         return True
     except OSError:
         return False
 
 
-def pip_install_requirements(python_exe, req_path):
-    cmd = [python_exe, "-m", "pip", "install", "-r", str(req_path)]
+def pip_install_requirements(python_exe, req_path, *, no_deps=False):
+    no_deps_args = ["--no-deps"] if no_deps else []
+    cmd = [python_exe, "-m", "pip", "install"] + no_deps_args + ["-r", str(req_path)]
     return run_cmd_live(cmd) == 0
 
 
@@ -61,9 +160,13 @@ def pip_reinstall(python_exe, package, *, no_deps=False, only_binary=False, igno
 
 def pip_get_version(python_exe, package):
     """
-    Best-effort query of the installed version via `pip show`.
+    Best-effort query of the installed version (dist-info metadata, else `pip show`).
     Returns version string or None.
     """
+    site_pkgs = _native_site_packages(python_exe)
+    if site_pkgs is not None:
+        dist = find_installed_dist(site_pkgs, package)
+        return dist["version"] if dist else None
     cmd = [python_exe, "-m", "pip", "show", package]
     res = subprocess.run(cmd, capture_output=True, text=True, check=False)
     if res.returncode != 0 or not res.stdout:
@@ -0,0 +1,241 @@
+import re
+from json.decoder import scanstring
+
+# Large conda-meta keys that header readers never materialize.
+HEAVY_KEYS = ("files", "paths_data")
+
+# Characters read per refill; a record is never held in memory as a whole.
+CHUNK_CHARS = 1 << 20
+
+_TOKEN = re.compile(
+    r"[ \t\n\r]*(?:"
+    r"([{}\[\],:])"
+    r'|("(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*")'
+    r"|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)"
+    r"|(true|false|null)"
+    r")"
+)
+_WS_ONLY = re.compile(r"[ \t\n\r]*\Z")
+_LITERALS = {"true": True, "false": False, "null": None}
+_STRING = "s"
+_SCALAR = "v"
+
+
+def open_record(path):
+    """
+    Open a conda-meta record for the readers below (strict UTF-8; raises OSError).
+    """
+    return open(path, "r", encoding="utf-8", errors="strict", newline="")
+
+
+class _Tokens:
+    """
+    Validating JSON tokenizer over a text stream, refilled `CHUNK_CHARS` at a time.
+    Tokens are punctuation strings or (kind, raw) tuples; strings are decoded on demand.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        data = self._stream.read(CHUNK_CHARS)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def next(self):
+        """
+        Next token, or None at the end of the input. Raises ValueError on invalid JSON.
+        """
+        while True:
+            m = _TOKEN.match(self._buf, self._pos)
+            # A match touching the end of the buffer may continue in the next chunk.
+            if m is not None and (m.end() < len(self._buf) or self._eof):
+                self._pos = m.end()
+                punct, string, number, literal = m.groups()
+                if punct is not None:
+                    return punct
+                if string is not None:
+                    return (_STRING, string)
+                return (_SCALAR, number if number is not None else literal)
+            if not self._fill():
+                if m is not None:
+                    continue
+                if _WS_ONLY.match(self._buf, self._pos):
+                    self._pos = len(self._buf)
+                    return None
+                raise ValueError(f"invalid JSON near {self._buf[self._pos : self._pos + 20]!r}")
+
+    def expect(self, punct):
+        if self.next() != punct:
+            raise ValueError(f"expected {punct!r}")
+
+
+def _decode(tok):
+    kind, raw = tok
+    if kind == _STRING:
+        return scanstring(raw, 1)[0]
+    if raw in _LITERALS:
+        return _LITERALS[raw]
+    return float(raw) if any(c in raw for c in ".eE") else int(raw)
+
+
+def _key(tok):
+    if not isinstance(tok, tuple) or tok[0] != _STRING:
+        raise ValueError("expected object key")
+    return scanstring(tok[1], 1)[0]
+
+
+def _read_value(tokens, tok, *, build):
+    """
+    Read the value starting with `tok`; containers are validated but only built if `build`.
+    """
+    stack = []
+    while True:
+        if tok == "{":
+            nxt = tokens.next()
+            if nxt == "}":
+                value = {} if build else None
+            else:
+                key = _key(nxt)
+                tokens.expect(":")
+                stack.append([{} if build else None, key, "}"])
+                tok = tokens.next()
+                continue
+        elif tok == "[":
+            nxt = tokens.next()
+            if nxt == "]":
+                value = [] if build else None
+            else:
+                stack.append([[] if build else None, None, "]"])
+                tok = nxt
+                continue
+        elif isinstance(tok, tuple):
+            value = _decode(tok) if build else None
+        else:
+            raise ValueError(f"unexpected token {tok!r}")
+
+        while True:
+            if not stack:
+                return value
+            frame = stack[-1]
+            if build:
+                if frame[2] == "}":
+                    frame[0][frame[1]] = value
+                else:
+                    frame[0].append(value)
+            sep = tokens.next()
+            if sep == ",":
+                if frame[2] == "}":
+                    frame[1] = _key(tokens.next())
+                    tokens.expect(":")
+                tok = tokens.next()
+                break
+            if sep != frame[2]:
+                raise ValueError(f"expected ',' or {frame[2]!r}")
+            stack.pop()
+            value = frame[0]
+
+
+def _members(tokens):
+    """
+    Yield the keys of the object that starts at the next token. The caller must consume
+    each member's value (`_read_value` / `_iter_array`) before asking for the next key.
+    """
+    if tokens.next() != "{":
+        raise ValueError("expected object")
+    tok = tokens.next()
+    if tok == "}":
+        return
+    while True:
+        key = _key(tok)
+        tokens.expect(":")
+        yield key
+        sep = tokens.next()
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError("expected ',' or '}'")
+        tok = tokens.next()
+
+
+def _iter_array(tokens):
+    """
+    Decode the elements of the array that starts at the next token one at a time.
+    A non-array value is validated and skipped.
+    """
+    tok = tokens.next()
+    if tok != "[":
+        _read_value(tokens, tok, build=False)
+        return
+    tok = tokens.next()
+    if tok == "]":
+        return
+    while True:
+        yield _read_value(tokens, tok, build=True)
+        sep = tokens.next()
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError("expected ',' or ']'")
+        tok = tokens.next()
+
+
+def _expect_end(tokens):
+    if tokens.next() is not None:
+        raise ValueError("extra data after record")
+
+
+def read_record_header(stream, *, skip=HEAVY_KEYS):
+    """
+    Decode all top-level fields of a record except `skip` (validated, never materialized).
+    Returns (header, keys) where keys lists every top-level key in file order.
+    Raises ValueError on malformed JSON.
+    """
+    tokens = _Tokens(stream)
+    header = {}
+    keys = []
+    for key in _members(tokens):
+        keys.append(key)
+        value = _read_value(tokens, tokens.next(), build=key not in skip)
+        if key not in skip:
+            header[key] = value
+    _expect_end(tokens)
+    return header, keys
+
+
+def _iter_member_array(tokens, path):
+    """
+    Stream the array at `path` (a tuple of nested object keys) of the top-level object.
+    """
+    for key in _members(tokens):
+        if key != path[0]:
+            _read_value(tokens, tokens.next(), build=False)
+        elif len(path) == 1:
+            yield from _iter_array(tokens)
+            return
+        else:
+            yield from _iter_member_array(tokens, path[1:])
+            return
+
+
+def iter_record_files(stream):
+    """
+    Yield the entries of the top-level `files` list one by one (nothing else is decoded).
+    """
+    yield from _iter_member_array(_Tokens(stream), ("files",))
+
+
+def iter_record_paths_data(stream):
+    """
+    Yield the `paths_data.paths` entries (dicts) one by one.
+    """
+    yield from _iter_member_array(_Tokens(stream), ("paths_data", "paths"))
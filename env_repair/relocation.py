@@ -0,0 +1,232 @@
+import concurrent.futures
+import mmap
+import os
+from pathlib import Path
+
+from .conda_meta import conda_meta_dir, file_owner, index_records, load_conda_meta_index
+from .ownership import iter_pip_owned_files
+from .record_stream import iter_record_paths_data, open_record
+
+# Only the start of a script is needed to read its shebang (and conda's long-prefix form).
+_SHEBANG_READ = 1024
+
+
+def _prefix_variants(env_path):
+    """
+    Byte strings the current prefix can appear as inside relocated files.
+    """
+    variants = {str(env_path), str(Path(env_path).resolve())}
+    if os.name == "nt":
+        variants |= {v.replace("\\", "/") for v in variants}
+    return [v.rstrip("/\\").encode("utf-8") for v in variants if v]
+
+
+def _inside(path, prefixes):
+    value = path.rstrip("/\\")
+    if os.name == "nt":
+        value = value.lower()
+    for prefix in prefixes:
+        p = prefix.decode("utf-8")
+        if os.name == "nt":
+            p = p.lower()
+        if value == p or value.startswith(p + "/") or value.startswith(p + "\\"):
+            return True
+    return False
+
+
+def read_shebang_interpreter(path):
+    """
+    Interpreter path of a script, handling conda's long-prefix form
+    (`#!/bin/sh` followed by `'''exec' "/prefix/bin/python" "$0" "$@"`). None if absent.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_SHEBANG_READ)
+    except OSError:
+        return None
+    if not head.startswith(b"#!"):
+        return None
+    lines = head.split(b"\n", 2)
+    first = lines[0][2:].strip().decode("utf-8", errors="replace")
+    if first in ("/bin/sh", "/bin/bash") and len(lines) > 1 and lines[1].startswith(b"'''exec' "):
+        rest = lines[1][len(b"'''exec' ") :].decode("utf-8", errors="replace").strip()
+        if rest.startswith('"'):
+            return rest[1:].split('"', 1)[0] or None
+        return rest.split(" ", 1)[0] or None
+    if first.startswith('"'):
+        return first[1:].split('"', 1)[0] or None
+    return first.split(" ", 1)[0] or None
+
+
+def _python_prefix_of(interpreter):
+    """
+    Env prefix an interpreter path belongs to (…/bin/python3 -> …, C:\\env\\python.exe -> C:\\env).
+    """
+    name = os.path.basename(interpreter.replace("\\", "/")).lower()
+    if not name.startswith("python"):
+        return None
+    parent = os.path.dirname(interpreter.replace("\\", "/"))
+    if os.path.basename(parent).lower() in ("bin", "scripts"):
+        parent = os.path.dirname(parent)
+    return parent or None
+
+
+def _looks_like_env(prefix):
+    """
+    True for conda envs and venvs (`conda-meta/`, `pyvenv.cfg`) and for prefixes that no longer
+    exist (the env was moved away). System interpreters such as /usr/bin/python3 are not envs.
+    """
+    if not os.path.isdir(prefix):
+        return True
+    return os.path.isdir(os.path.join(prefix, "conda-meta")) or os.path.isfile(os.path.join(prefix, "pyvenv.cfg"))
+
+
+def _script_dir(env_path):
+    return Path(env_path) / ("Scripts" if os.name == "nt" else "bin")
+
+
+def _iter_scripts(env_path):
+    try:
+        with os.scandir(_script_dir(env_path)) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for e in entries:
+        try:
+            if not e.is_file(follow_symlinks=False):
+                continue
+        except OSError:
+            continue
+        if os.name == "nt" and not e.name.lower().endswith(".py"):
+            continue
+        yield e.path
+
+
+def _scan_shebangs(env_path, prefixes):
+    """
+    (relpath, foreign prefix) for scripts whose Python shebang points into another env.
+    """
+    found = []
+    root = Path(env_path)
+    scripts = list(_iter_scripts(env_path))
+    workers = min(16, (os.cpu_count() or 1) * 2, max(1, len(scripts)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        interpreters = list(ex.map(read_shebang_interpreter, scripts))
+    for path, interp in zip(scripts, interpreters):
+        if not interp or _inside(interp, prefixes):
+            continue
+        foreign = _python_prefix_of(interp)
+        if foreign and _looks_like_env(foreign):
+            found.append((os.path.relpath(path, root).replace("\\", "/"), foreign))
+    return found
+
+
+def _placeholder_files(env_path, index):
+    """
+    (rec, relpath, file_mode) for every installed file conda rewrote at link time.
+    """
+    out = []
+    for rec in index_records(index):
+        if "paths_data" not in rec["keys"]:
+            continue
+        try:
+            with open_record(conda_meta_dir(env_path) / rec["file"]) as f:
+                entries = list(iter_record_paths_data(f))
+        except (OSError, ValueError):
+            continue
+        for e in entries:
+            if not isinstance(e, dict) or not e.get("prefix_placeholder") or not isinstance(e.get("_path"), str):
+                continue
+            mode = e.get("file_mode") or "text"
+            if os.name == "nt" and mode == "binary":
+                # conda does not patch binaries on Windows.
+                continue
+            out.append((rec, e["_path"].replace("\\", "/").lstrip("/"), mode))
+    return out
+
+
+def _find_needles(path, needles):
+    """
+    Subset of `needles` occurring in the file (mmap-backed search, no full read into memory).
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return set()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return {n for n in needles if mm.find(n) >= 0}
+    except (OSError, ValueError):
+        return None
+
+
+def scan_foreign_prefix(env_path, site_pkgs=None):
+    """
+    Detect files that still embed another prefix after an env was copied or moved:
+      - scripts in bin/ (Scripts/) whose Python shebang points into another env (or a prefix
+        that no longer exists); system interpreters are left alone
+      - files conda relocated at install time (`paths_data` `prefix_placeholder`) that do not
+        contain the current prefix
+    Files are searched in parallel with mmap. Returns one `foreign-prefix` issue per owning
+    package (conda records carry version/build for a targeted force-reinstall).
+    """
+    prefixes = _prefix_variants(env_path)
+    shebangs = _scan_shebangs(env_path, prefixes)
+
+    flagged = {rel: {prefix} for rel, prefix in shebangs}
+    index = load_conda_meta_index(env_path)
+    if index is not None:
+        candidates = _placeholder_files(env_path, index)
+        root = Path(env_path)
+        workers = min(16, (os.cpu_count() or 1) * 2, max(1, len(candidates)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+            hits = list(ex.map(lambda c: _find_needles(root / c[1], prefixes), candidates))
+        for (_rec, rel, _mode), found in zip(candidates, hits):
+            if found is None:
+                # Missing/unreadable files are the `integrity` check's business.
+                continue
+            if not found:
+                flagged.setdefault(rel, set())
+    if not flagged:
+        return []
+
+    by_owner = {}
+    pending = set(flagged)
+    if index is not None:
+        for rel in list(pending):
+            rec = file_owner(index, rel)
+            if rec is None:
+                continue
+            meta = rec["meta"]
+            key = ("conda", meta.get("name"))
+            by_owner.setdefault(
+                key,
+                {
+                    "kind": "conda",
+                    "package": meta.get("name"),
+                    "version": meta.get("version"),
+                    "build": meta.get("build") or meta.get("build_string"),
+                    "files": [],
+                },
+            )["files"].append(rel)
+            pending.discard(rel)
+    if pending:
+        for rel, dist_name, _dist_rel in iter_pip_owned_files(env_path, site_pkgs):
+            if rel in pending:
+                name = dist_name.split("-", 1)[0]
+                by_owner.setdefault(("pip", name), {"kind": "pip", "package": name, "files": []})["files"].append(rel)
+                pending.discard(rel)
+    for rel in pending:
+        by_owner.setdefault((None, None), {"kind": None, "package": None, "files": []})["files"].append(rel)
+
+    issues = []
+    for owner in sorted(by_owner.values(), key=lambda o: (o["package"] is None, str(o["package"]).lower())):
+        files = sorted(owner["files"])
+        issues.append(
+            {
+                "type": "foreign-prefix",
+                **owner,
+                "files": files,
+                "prefixes": sorted({p for rel in files for p in flagged[rel]}),
+            }
+        )
+    return issues
@@ -3,11 +3,13 @@ import json
 import time
 import re
 from pathlib import Path
+from .conda_meta import find_package_records, load_conda_meta_index, site_packages_files
 from .conda_ops import (
     conda_install,
     conda_install_capture,
     get_env_package_entries,
 )
+from .bytecode import recompile_packages
 from .conflicts import find_same_version_case_conflicts
 from .discovery import which
 from .i18n import t
@@ -15,6 +17,7 @@ from .naming import normalize_name, normalize_name_simple
 from .pip_ops import pip_reinstall, pip_uninstall
 from .progress import Progress
 from .scan import (
+    extension_abi_tag,
     remove_dist_info_paths,
     remove_invalid_artifact,
 )
@@ -189,6 +192,84 @@ def _fix_conda_meta_issues(env, manager, channels, ignore_pinned, force_reinstal
     return fixes
 
 
+def _fix_damaged_conda_files(env, manager, channels, ignore_pinned, debug):
+    """
+    Force-reinstall exactly the packages whose installed files are missing or modified
+    (`conda-files-damaged`, from the `integrity` checks) or still embed a foreign prefix
+    (conda-owned `foreign-prefix`, from the `relocation` check), pinned to the installed build.
+    """
+    if not manager:
+        return []
+    specs = []
+    handled = []
+    for issue in env.get("issues") or []:
+        if issue.get("type") == "foreign-prefix" and issue.get("kind") != "conda":
+            continue
+        if issue.get("type") not in ("conda-files-damaged", "foreign-prefix"):
+            continue
+        name, version, build = issue.get("package"), issue.get("version"), issue.get("build")
+        if not isinstance(name, str) or not name:
+            continue
+        handled.append(issue)
+        if isinstance(version, str) and version and isinstance(build, str) and build:
+            specs.append(f"{name}={version}={build}")
+        else:
+            specs.append(name)
+    specs = sorted(set(specs))
+    if not specs:
+        return []
+    ok = conda_install(
+        env["path"],
+        specs,
+        manager,
+        channels,
+        ignore_pinned=ignore_pinned,
+        force_reinstall=True,
+    )
+    _debug(debug, "conda_files_reinstall", {"specs": specs, "ok": ok})
+    fixes = [
+        {
+            "fixed": ok,
+            "method": "mamba/conda",
+            "package": "conda-files",
+            "count": len(specs),
+            "reason_key": "reason_conda_files_reinstall",
+        }
+    ]
+    if ok:
+        env["issues"] = [i for i in env.get("issues") or [] if not any(i is h for h in handled)]
+    return fixes
+
+
+def _recompile_bytecode(env, debug):
+    """
+    Refresh out-of-date bytecode (`stale-bytecode` issues from `--check bytecode`) with a
+    parallel `compileall` in the env interpreter. Runs after all other repairs so freshly
+    reinstalled packages are compiled once.
+    """
+    fixes = []
+    for issue in list(env.get("issues") or []):
+        if issue.get("type") != "stale-bytecode":
+            continue
+        packages = issue.get("packages") or []
+        if not packages:
+            continue
+        ok = recompile_packages(env.get("python"), issue.get("site_pkg"), packages)
+        fixes.append(
+            {
+                "fixed": ok,
+                "method": "compileall",
+                "package": "bytecode",
+                "count": len(packages),
+                "reason_key": "reason_bytecode_recompile",
+            }
+        )
+        _debug(debug, "bytecode_recompile", {"site_pkg": issue.get("site_pkg"), "packages": packages, "ok": ok})
+        if ok:
+            env["issues"].remove(issue)
+    return fixes
+
+
 def _remove_invalid_artifacts(env, debug):
     fixes = []
     for issue in list(env.get("issues") or []):
@@ -246,11 +327,12 @@ def _python_abi_tag(python_exe):
 
 def _cleanup_duplicate_pyd(env, debug):
     """
-    Remove stale ABI .pyd files from duplicate-pyd issues.
-    Keeps the file matching the current env Python ABI tag when possible.
+    Remove stale ABI extension modules (.pyd/.so, any depth) from duplicate-pyd issues.
+    Keeps the file matching the current env Python ABI tag when possible; untagged and
+    abi3 modules are valid for every interpreter and are never removed.
     """
     fixes = []
-    keep_tag = _python_abi_tag(env.get("python"))
+    keep_tag = None
 
     for issue in list(env.get("issues") or []):
         if issue.get("type") != "duplicate-pyd":
@@ -261,19 +343,18 @@ def _cleanup_duplicate_pyd(env, debug):
         if not site_pkg or not files:
             continue
 
-        delete_candidates = []
-        if keep_tag:
-            keep_marker = f".{keep_tag}-"
-            for f in files:
-                if keep_marker not in f.lower():
-                    delete_candidates.append(f)
+        tag = issue.get("abi_tag")
+        if not tag:
+            if keep_tag is None:
+                keep_tag = _python_abi_tag(env.get("python")) or ""
+            tag = keep_tag
+        cp_files = [(extension_abi_tag(f), f) for f in files]
+        cp_files = [(ftag, f) for ftag, f in cp_files if ftag and ftag.startswith("cp")]
+        if tag:
+            delete_candidates = [f for ftag, f in cp_files if ftag != tag]
         else:
             # Fallback: keep highest cp tag, remove others.
-            by_tag = []
-            for f in files:
-                m = re.search(r"\.cp(\d+)-", f, flags=re.IGNORECASE)
-                by_tag.append((int(m.group(1)) if m else -1, f))
-            by_tag = sorted(by_tag, key=lambda x: x[0], reverse=True)
+            by_tag = sorted(((int(ftag[2:]) if ftag[2:].isdigit() else -1, f) for ftag, f in cp_files), reverse=True)
             keep_name = by_tag[0][1] if by_tag else None
             delete_candidates = [f for _tag, f in by_tag if f != keep_name]
 
@@ -300,7 +381,7 @@ def _cleanup_duplicate_pyd(env, debug):
         _debug(
             debug,
             "duplicate_pyd_cleanup",
-            {"base": issue.get("base"), "keep_tag": keep_tag, "removed": removed, "ok": ok},
+            {"base": issue.get("base"), "keep_tag": tag, "removed": removed, "ok": ok},
         )
         if ok:
             env["issues"].remove(issue)
@@ -517,31 +598,14 @@ def _build_channel_index(entries):
     return index
 
 
-def _conda_meta_record_paths(env_path, conda_pkg_name):
-    root = Path(env_path) / "conda-meta"
-    if not root.exists():
-        return []
-    prefix = f"{conda_pkg_name}-"
-    paths = [p for p in root.glob("*.json") if p.name.startswith(prefix)]
-    return sorted(paths, key=lambda p: p.name.lower())
-
-
 def _conda_meta_owns_distinfo(env_path, *, conda_pkg_name, dist_name, version):
     if not (env_path and conda_pkg_name and dist_name and version):
         return False
-    needle = f"Lib/site-packages/{dist_name}-{version}.dist-info/".lower()
-    for meta_path in _conda_meta_record_paths(env_path, conda_pkg_name):
-        try:
-            data = json.loads(meta_path.read_text(encoding="utf-8", errors="ignore"))
-        except Exception:
-            continue
-        files = data.get("files")
-        if not isinstance(files, list):
-            continue
-        for f in files:
-            if not isinstance(f, str):
-                continue
-            if f.replace("\\", "/").lower().startswith(needle):
+    needle = f"site-packages/{dist_name}-{version}.dist-info/".lower()
+    index = load_conda_meta_index(env_path)
+    for rec in find_package_records(index, conda_pkg_name):
+        for f in site_packages_files(rec):
+            if needle in f.lower():
                 return True
     return False
 
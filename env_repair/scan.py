@@ -1,16 +1,54 @@
-import json
+import concurrent.futures
+import os
+import re
 import shutil
 from pathlib import Path
 
+from .conda_meta import conda_meta_dir, conda_meta_verdicts
 from .naming import normalize_name
 
 
-def scan_dist_info(site_pkg):
+def list_site_packages(site_pkg):
+    """
+    List a site-packages directory once (single os.scandir) and classify its entries, so
+    all detectors (and verify-imports) can share one listing.
+    Returns dict: path, entries [(name, is_dir)], dist_infos, pyd, artifacts; None if unreadable.
+    """
+    try:
+        with os.scandir(site_pkg) as it:
+            raw = list(it)
+    except OSError:
+        return None
+    listing = {"path": str(site_pkg), "entries": [], "dist_infos": [], "pyd": [], "artifacts": []}
+    for e in raw:
+        name = e.name
+        lower = name.lower()
+        try:
+            is_dir = e.is_dir()
+        except OSError:
+            is_dir = False
+        listing["entries"].append((name, is_dir))
+        if lower.endswith(".dist-info"):
+            if is_dir:
+                listing["dist_infos"].append(name)
+        elif lower.endswith(".pyd"):
+            listing["pyd"].append(name)
+        if name.startswith("~") or name.endswith(".conda_trash"):
+            listing["artifacts"].append(name)
+    for key in ("entries", "dist_infos", "pyd", "artifacts"):
+        listing[key].sort()
+    return listing
+
+
+def _listing(site_pkg, listing):
+    if listing is None:
+        listing = list_site_packages(site_pkg)
+    return listing or {"entries": [], "dist_infos": [], "pyd": [], "artifacts": []}
+
+
+def scan_dist_info(site_pkg, listing=None):
     issues = []
-    dist_infos = []
-    for p in Path(site_pkg).iterdir():
-        if p.is_dir() and p.name.endswith(".dist-info"):
-            dist_infos.append(p.name)
+    dist_infos = _listing(site_pkg, listing)["dist_infos"]
 
     versions = {}
     paths = {}
@@ -36,36 +74,146 @@ def scan_dist_info(site_pkg):
     return issues
 
 
-def scan_pyd_duplicates(site_pkg):
+_EXTENSION_SUFFIXES = (".so", ".pyd")
+_CP_TAG_RE = re.compile(r"^(?:cpython-|cp)(\d+)", flags=re.IGNORECASE)
+_SITE_PY_VERSION_RE = re.compile(r"python(\d)\.(\d+)", flags=re.IGNORECASE)
+# Directories below site-packages that never contain extension modules.
+_NO_EXTENSION_DIR_SUFFIXES = (".dist-info", ".egg-info")
+
+
+def extension_abi_tag(filename):
+    """
+    Normalized ABI tag of an extension module file name:
+      _foo.cp312-win_amd64.pyd / _foo.cpython-312-x86_64-linux-gnu.so -> "cp312"
+      _foo.abi3.so -> "abi3"; untagged (_foo.so, _foo.pyd) -> None
+    """
+    parts = Path(filename).name.split(".")
+    if len(parts) < 3:
+        return None
+    tag = parts[-2]
+    if tag.lower() == "abi3":
+        return "abi3"
+    m = _CP_TAG_RE.match(tag)
+    return f"cp{m.group(1)}" if m else tag.lower()
+
+
+def python_abi_tag_for(site_pkg, env_path=None):
+    """
+    The env interpreter's tag ("cp312") derived from the layout, without spawning it:
+    lib/python3.12/site-packages on POSIX, python312.dll next to the interpreter on Windows.
+    """
+    m = _SITE_PY_VERSION_RE.search(str(site_pkg).replace("\\", "/"))
+    if m:
+        return f"cp{m.group(1)}{m.group(2)}"
+    if env_path:
+        try:
+            names = os.listdir(env_path)
+        except OSError:
+            names = []
+        for name in names:
+            m = re.match(r"^python(\d)(\d+)\.dll$", name, flags=re.IGNORECASE)
+            if m:
+                return f"cp{m.group(1)}{m.group(2)}"
+    return None
+
+
+def _is_extension_module(name):
+    return name.lower().endswith(_EXTENSION_SUFFIXES)
+
+
+def _walk_extension_modules(site_pkg, top):
+    """
+    Relative paths (posix) of extension modules below site_pkg/top (iterative scandir).
+    """
+    found = []
+    stack = [top]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(site_pkg, rel_dir)) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for e in entries:
+            rel = f"{rel_dir}/{e.name}"
+            try:
+                is_dir = e.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if e.name != "__pycache__" and not e.name.lower().endswith(_NO_EXTENSION_DIR_SUFFIXES):
+                    stack.append(rel)
+            elif _is_extension_module(e.name):
+                found.append(rel)
+    return found
+
+
+def list_extension_modules(site_pkg, listing=None):
+    """
+    All extension modules (.so/.pyd) in a site-packages tree, as sorted posix relpaths.
+    Top-level package directories are walked in parallel; the top level itself comes
+    from the shared listing.
+    """
+    listing = _listing(site_pkg, listing)
+    artifacts = set(listing["artifacts"])
+    found = [name for name, is_dir in listing["entries"] if not is_dir and _is_extension_module(name)]
+    tops = [
+        name
+        for name, is_dir in listing["entries"]
+        if is_dir
+        and name not in artifacts
+        and name != "__pycache__"
+        and not name.lower().endswith(_NO_EXTENSION_DIR_SUFFIXES)
+    ]
+    if tops:
+        workers = min(16, (os.cpu_count() or 1) * 2, len(tops))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+            for rels in ex.map(lambda top: _walk_extension_modules(str(site_pkg), top), tops):
+                found.extend(rels)
+    return sorted(found)
+
+
+def scan_extension_abi(site_pkg, listing=None, *, abi_tag=None):
+    """
+    Recursive ABI residue scan (e.g. cpython-39 modules left behind by a Python upgrade).
+    Extension modules are grouped by directory and module base name:
+      - a group with several files is a `duplicate-pyd` issue (files relative to site_pkg,
+        so `_cleanup_duplicate_pyd` handles nested modules too)
+      - lone modules whose CPython tag differs from `abi_tag` are reported once per
+        site-packages as `stale-extension-abi`
+    """
+    groups = {}
+    for rel in list_extension_modules(site_pkg, listing):
+        parent, _sep, name = rel.rpartition("/")
+        groups.setdefault((parent, name.split(".", 1)[0]), []).append(rel)
+
     issues = []
-    pyd_files = [p.name for p in Path(site_pkg).glob("*.pyd")]
-    base_map = {}
-    for name in pyd_files:
-        stem = name[:-4]
-        base = stem.split(".cp")[0]
-        base_map.setdefault(base, []).append(name)
-    for base, files in sorted(base_map.items()):
+    stale = []
+    for (parent, base), files in sorted(groups.items()):
         if len(files) > 1:
-            issues.append(
-                {
-                    "type": "duplicate-pyd",
-                    "base": base,
-                    "files": sorted(files),
-                    "site_pkg": str(site_pkg),
-                }
-            )
+            issue = {
+                "type": "duplicate-pyd",
+                "base": f"{parent}/{base}" if parent else base,
+                "files": sorted(files),
+                "site_pkg": str(site_pkg),
+            }
+            if abi_tag:
+                issue["abi_tag"] = abi_tag
+            issues.append(issue)
+            continue
+        tag = extension_abi_tag(files[0])
+        if abi_tag and tag and tag.startswith("cp") and tag != abi_tag:
+            stale.append(files[0])
+    if stale:
+        issues.append({"type": "stale-extension-abi", "abi_tag": abi_tag, "files": stale, "site_pkg": str(site_pkg)})
     return issues
 
 
-def scan_invalid_artifacts(site_pkg):
+def scan_invalid_artifacts(site_pkg, listing=None):
     issues = []
     root = Path(site_pkg)
-    if not root.exists():
-        return issues
-    for p in root.iterdir():
-        name = p.name
-        if name.startswith("~") or name.endswith(".conda_trash"):
-            issues.append({"type": "invalid-artifact", "path": str(p), "name": name})
+    for name in _listing(site_pkg, listing)["artifacts"]:
+        issues.append({"type": "invalid-artifact", "path": str(root / name), "name": name})
     return issues
 
 
@@ -117,62 +265,32 @@ def parse_conda_meta_filename(filename):
     return pkg_name, version, build
 
 
-def scan_conda_meta_json(env_path):
+def scan_conda_meta_json(env_path, *, strict=False):
     """
     Scan <env>/conda-meta/*.json for broken records.
     Current checks:
       - invalid JSON
       - missing required key: depends
+    New or changed records get a full parse (in parallel); unchanged ones reuse the
+    size/mtime verdict cache (see `conda_meta_verdicts`). `strict=True` ignores the cache.
     """
     issues = []
-    root = Path(env_path) / "conda-meta"
-    if not root.exists():
+    verdicts = conda_meta_verdicts(env_path, strict=strict)
+    if verdicts is None:
         return issues
-    for p in root.glob("*.json"):
-        pkg_name, version, build = parse_conda_meta_filename(p.name)
-        try:
-            data = json.loads(p.read_text(encoding="utf-8", errors="strict"))
-        except Exception:
-            issues.append(
-                {
-                    "type": "conda-meta-invalid-json",
-                    "path": str(p),
-                    "package": pkg_name,
-                    "version": version,
-                    "build": build,
-                }
-            )
+    root = conda_meta_dir(env_path)
+    for name in sorted(verdicts, key=str.lower):
+        verdict = verdicts[name]
+        if verdict == "ok":
             continue
-        if not isinstance(data, dict):
-            issues.append(
-                {
-                    "type": "conda-meta-invalid-json",
-                    "path": str(p),
-                    "package": pkg_name,
-                    "version": version,
-                    "build": build,
-                }
-            )
-            continue
-        if "depends" not in data:
-            # Some helper/ABI records can legitimately omit `depends`.
-            # Treat missing `depends` as broken when the record otherwise looks like a
-            # real package metadata record (not just a minimal helper marker).
-            noarch = data.get("noarch")
-            is_platform_record = not bool(noarch)
-            looks_real_record = any(
-                k in data for k in ("subdir", "files", "url", "channel", "md5", "sha256", "build_number")
-            )
-            required = ("name", "version", "build")
-            is_incomplete = not all(k in data for k in required)
-            if is_incomplete or (is_platform_record and looks_real_record):
-                issues.append(
-                    {
-                        "type": "conda-meta-missing-depends",
-                        "path": str(p),
-                        "package": pkg_name,
-                        "version": version,
-                        "build": build,
-                    }
-                )
+        pkg_name, version, build = parse_conda_meta_filename(name)
+        issues.append(
+            {
+                "type": f"conda-meta-{verdict}",
+                "path": str(root / name),
+                "package": pkg_name,
+                "version": version,
+                "build": build,
+            }
+        )
     return issues
@@ -0,0 +1,185 @@
+import json
+import time
+from pathlib import Path
+
+from .conda_deps import parse_match_spec
+from .conda_meta import channel_name, index_records, load_conda_meta_index, owned_dist_dirs, site_packages_files
+from .discovery import env_name_from_path, find_site_packages
+from .dist_meta import freeze_line, iter_dist_infos, read_direct_url, read_dist_name_version
+from .naming import normalize_name
+
+SNAPSHOT_VERSION = 1
+
+
+def _dependency_order(records):
+    """
+    Records sorted so that dependencies come first (like `conda list --explicit`);
+    ties and cycles are broken by name.
+    """
+    by_name = {r["name"].lower(): r for r in records}
+    deps = {}
+    for name, rec in by_name.items():
+        specs = [parse_match_spec(t) for t in rec.pop("depends", None) or [] if isinstance(t, str)]
+        deps[name] = {s["name"].lower() for s in specs if s and s["name"].lower() in by_name} - {name}
+    ordered = []
+    done = set()
+    while len(done) < len(by_name):
+        ready = sorted(n for n in by_name if n not in done and deps[n] <= done)
+        if not ready:
+            ready = [min(n for n in by_name if n not in done)]
+        for name in ready:
+            done.add(name)
+            ordered.append(by_name[name])
+    return ordered
+
+
+def take_snapshot(env_path):
+    """
+    Compact, metadata-only snapshot of a conda env read straight from disk (no conda/pip CLI):
+      - "conda": name/version/build/channel/subdir/url/md5 per conda-meta record, in dependency order
+      - "pip": name/version/requirement (`pip freeze` line) per dist not owned by a conda record
+    Returns None if the env has no conda-meta directory.
+    """
+    index = load_conda_meta_index(env_path)
+    if index is None:
+        return None
+    records = []
+    owned = set()
+    for rec in index_records(index):
+        meta = rec["meta"]
+        name, version = meta.get("name"), meta.get("version")
+        build = meta.get("build") or meta.get("build_string")
+        if not (isinstance(name, str) and isinstance(version, str) and isinstance(build, str)):
+            continue
+        records.append(
+            {
+                "name": name,
+                "version": version,
+                "build": build,
+                "channel": channel_name(meta),
+                "subdir": meta.get("subdir") or "",
+                "url": meta.get("url") or "",
+                "md5": meta.get("md5") or "",
+                "depends": meta.get("depends"),
+            }
+        )
+        owned |= owned_dist_dirs(site_packages_files(rec))
+
+    pip = []
+    seen = set()
+    for site_pkg in find_site_packages(env_path):
+        for dist in iter_dist_infos(site_pkg):
+            if dist.name.lower() in owned:
+                continue
+            name, version = read_dist_name_version(dist)
+            if not name or not version or normalize_name(name) in seen:
+                continue
+            seen.add(normalize_name(name))
+            requirement = freeze_line({"name": name, "version": version, "direct_url": read_direct_url(dist)})
+            pip.append({"name": name, "version": version, "requirement": requirement})
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "env": str(env_path),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "conda": _dependency_order(records),
+        "pip": sorted(pip, key=lambda d: d["name"].lower()),
+    }
+
+
+def write_snapshot(path, snapshot):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(snapshot, separators=(",", ":")) + "\n", encoding="utf-8")
+    return path
+
+
+def load_snapshot(path):
+    """
+    Snapshot written by `write_snapshot`, or None if missing/unreadable/unknown version.
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    return data
+
+
+def export_explicit(snapshot):
+    """
+    `conda list --explicit --md5` equivalent. Records without a URL cannot be replayed and
+    are left out (conda does the same).
+    """
+    subdirs = [r["subdir"] for r in snapshot.get("conda") or [] if r.get("subdir") and r["subdir"] != "noarch"]
+    lines = [
+        "# This file may be used to create an environment using:",
+        "# $ conda create --name <env> --file <this file>",
+    ]
+    if subdirs:
+        lines.append(f"# platform: {subdirs[0]}")
+    lines.append("@EXPLICIT")
+    for rec in snapshot.get("conda") or []:
+        if rec.get("url"):
+            lines.append(f"{rec['url']}#{rec['md5']}" if rec.get("md5") else rec["url"])
+    return "\n".join(lines) + "\n"
+
+
+def _yaml_item(text):
+    if all(c.isalnum() or c in "._-=<>!*+/" for c in text):
+        return text
+    return json.dumps(text)
+
+
+def export_yaml(snapshot, name=None):
+    """
+    `conda env export` equivalent (without the `prefix:` line, so the file can seed a new env).
+    """
+    channels = []
+    for rec in snapshot.get("conda") or []:
+        channel = rec.get("channel")
+        if channel and channel != "pypi" and channel not in channels:
+            channels.append(channel)
+    lines = [f"name: {_yaml_item(name or env_name_from_path(snapshot.get('env') or ''))}", "channels:"]
+    lines += [f"  - {_yaml_item(c)}" for c in channels]
+    lines.append("dependencies:")
+    for rec in sorted(snapshot.get("conda") or [], key=lambda r: r["name"].lower()):
+        lines.append(f"  - {_yaml_item(rec['name'] + '=' + rec['version'] + '=' + rec['build'])}")
+    pip = snapshot.get("pip") or []
+    if pip:
+        lines.append("  - pip:")
+        lines += [f"      - {_yaml_item(d['requirement'])}" for d in pip]
+    return "\n".join(lines) + "\n"
+
+
+def snapshot_state(snapshot):
+    """
+    name -> dist (with the recorded url/md5) for the conda records of a snapshot, in the shape
+    `history.plan_to_state` expects.
+    """
+    state = {}
+    for rec in snapshot.get("conda") or []:
+        state[rec["name"]] = {
+            "channel": rec.get("channel"),
+            "name": rec["name"],
+            "version": rec["version"],
+            "build": rec["build"],
+            "dist": f"{rec['name']}-{rec['version']}-{rec['build']}",
+            "url": rec.get("url") or None,
+            "md5": rec.get("md5") or None,
+        }
+    return state
+
+
+def plan_pip_restore(snapshot, current):
+    """
+    Exact pip changes to get from `current` (the "pip" list of a fresh snapshot) back to
+    `snapshot`: {"install": [requirement lines], "uninstall": [names]}. Installs are meant to
+    run with `--no-deps`, so nothing outside the snapshot gets pulled in.
+    """
+    have = {normalize_name(d["name"]): d["requirement"] for d in current or []}
+    want = {normalize_name(d["name"]): d["requirement"] for d in snapshot.get("pip") or []}
+    install = [want[k] for k in sorted(want) if have.get(k) != want[k]]
+    uninstall = sorted(d["name"] for d in current or [] if normalize_name(d["name"]) not in want)
+    return {"install": install, "uninstall": uninstall}
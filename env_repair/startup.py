@@ -0,0 +1,182 @@
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+
+# `import time: self [us] | cumulative | imported package`
+_IMPORTTIME_RE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+_PTH_IMPORT_RE = re.compile(r"^import[ \t]")
+_IMPORT_NAMES_RE = re.compile(r"\bimport\s+([\w.]+(?:\s*,\s*[\w.]+)*)")
+_DUNDER_IMPORT_RE = re.compile(r"__import__\(\s*['\"]([\w.]+)['\"]")
+# Modules imported by site itself for customization hooks.
+_CUSTOMIZE_MODULES = ("sitecustomize", "usercustomize")
+# Imported by site itself; a `.pth` line repeating them costs nothing.
+_SITE_MODULES = ("os", "sys")
+_TIMEOUT = 60
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into [{"module", "self_us", "cumulative_us", "depth"}]
+    in output order (children are printed before their parent).
+    """
+    entries = []
+    for line in (stderr or "").splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        entries.append(
+            {
+                "module": m.group(4),
+                "self_us": int(m.group(1)),
+                "cumulative_us": int(m.group(2)),
+                # One leading space is the separator; each nesting level adds two more.
+                "depth": max(0, (len(m.group(3)) - 1) // 2),
+            }
+        )
+    return entries
+
+
+def inspect_pth_files(site_pkg):
+    """
+    Static view of the `.pth` / `.egg-link` files of one site-packages directory:
+    [{"file", "code_lines", "path_lines", "missing_paths", "imports"}], egg_link_count.
+    """
+    root = Path(site_pkg)
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return [], 0
+    pth = []
+    egg_links = 0
+    for name in names:
+        lower = name.lower()
+        if lower.endswith(".egg-link"):
+            egg_links += 1
+            continue
+        if not lower.endswith(".pth"):
+            continue
+        try:
+            lines = (root / name).read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+        info = {"file": name, "code_lines": 0, "path_lines": 0, "missing_paths": 0, "imports": []}
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if _PTH_IMPORT_RE.match(line):
+                info["code_lines"] += 1
+                for group in _IMPORT_NAMES_RE.findall(line):
+                    info["imports"].extend(n.strip() for n in group.split(","))
+                info["imports"].extend(_DUNDER_IMPORT_RE.findall(line))
+                continue
+            info["path_lines"] += 1
+            if not (root / stripped).exists():
+                info["missing_paths"] += 1
+        pth.append(info)
+    return pth, egg_links
+
+
+def _best_wall_time(cmd, runs):
+    best = None
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run(cmd, capture_output=True, timeout=_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _ms(us):
+    return round(us / 1000.0, 2)
+
+
+def _s_to_ms(seconds):
+    return round(seconds * 1000.0, 2) if seconds is not None else None
+
+
+def profile_startup(python_exe, site_pkgs, *, runs=3, top=10):
+    """
+    Startup cost of an interpreter and what causes it:
+      - best-of-`runs` wall time of `python -c pass` and `python -S -c pass` (site cost = difference)
+      - `-X importtime` attribution of the imports triggered by site: `.pth` code lines,
+        sitecustomize/usercustomize and everything else
+      - sys.path length, `.pth` path entries (missing ones) and egg-links
+    """
+    report = {"python": python_exe}
+    report["startup_ms"] = _s_to_ms(_best_wall_time([python_exe, "-c", "pass"], runs))
+    report["no_site_ms"] = _s_to_ms(_best_wall_time([python_exe, "-S", "-c", "pass"], runs))
+    if report["startup_ms"] is not None and report["no_site_ms"] is not None:
+        report["site_ms"] = round(max(0.0, report["startup_ms"] - report["no_site_ms"]), 2)
+    else:
+        report["site_ms"] = None
+
+    entries = []
+    sys_path_len = None
+    try:
+        proc = subprocess.run(
+            [python_exe, "-X", "importtime", "-c", "import sys; print(len(sys.path))"],
+            capture_output=True,
+            text=True,
+            errors="replace",
+            timeout=_TIMEOUT,
+        )
+        entries = parse_importtime(proc.stderr)
+        if proc.returncode == 0 and proc.stdout.strip().isdigit():
+            sys_path_len = int(proc.stdout.strip())
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    report["sys_path_len"] = sys_path_len
+
+    # Imports done while `site` runs are printed at depth 1 right before the `site` line.
+    site_children = []
+    for entry in entries:
+        if entry["depth"] == 0:
+            if entry["module"] == "site":
+                break
+            site_children = []
+        elif entry["depth"] == 1:
+            site_children.append(entry)
+    site_entry = next((e for e in entries if e["depth"] == 0 and e["module"] == "site"), None)
+    report["site_import_ms"] = _ms(site_entry["cumulative_us"]) if site_entry else None
+
+    pth_files = []
+    egg_links = 0
+    owners = {}
+    for site_pkg in site_pkgs or []:
+        infos, eggs = inspect_pth_files(site_pkg)
+        egg_links += eggs
+        for info in infos:
+            info["site_pkg"] = str(site_pkg)
+            info["import_ms"] = 0.0
+            pth_files.append(info)
+            for name in info["imports"]:
+                if name not in _SITE_MODULES:
+                    owners.setdefault(name, info)
+    for entry in site_children:
+        info = owners.get(entry["module"])
+        if info is not None:
+            info["import_ms"] = round(info["import_ms"] + _ms(entry["cumulative_us"]), 2)
+    report["pth_files"] = pth_files
+    report["egg_links"] = egg_links
+
+    offenders = []
+    for entry in site_children:
+        info = owners.get(entry["module"])
+        if info is not None:
+            source = f"pth:{info['file']}"
+        elif entry["module"] in _CUSTOMIZE_MODULES:
+            source = entry["module"]
+        else:
+            source = "site"
+        offenders.append({"module": entry["module"], "ms": _ms(entry["cumulative_us"]), "source": source})
+    offenders.sort(key=lambda o: -o["ms"])
+    report["top"] = offenders[:top]
+    return report
@@ -8,12 +8,17 @@ import sys
 from urllib.parse import urlparse
 from pathlib import Path
 
+from .changes import changed_packages, parse_timestamp
+from .conda_meta import find_package_records, load_conda_meta_index, site_packages_files
 from .conda_ops import conda_install, conda_install_capture, conda_remove, get_env_package_entries, is_conda_env
 from .conda_config import load_conda_channels
 from .discovery import discover_envs, get_python_exe, select_envs, which
+from .dist_meta import read_direct_url, read_installer, read_metadata_headers
+from .entry_points import entry_point_dists, read_entry_points, verify_entry_points
 from .naming import normalize_name
 from .pip_ops import pip_get_version, pip_reinstall, pip_uninstall
 from .progress import Progress
+from .scan import list_site_packages
 from .subprocess_utils import run_json_cmd
 
 CRITICAL_PACKAGES = {
@@ -176,25 +181,13 @@ def _blacklist_add(blocked, *, pyver, conda_name, reason):
 
 
 def _read_metadata_name(dist_info):
-    meta = dist_info / "METADATA"
-    if not meta.exists():
-        return None
-    try:
-        for line in meta.read_text(encoding="utf-8", errors="ignore").splitlines():
-            if not line:
-                break
-            if line.lower().startswith("name:"):
-                val = line.split(":", 1)[1].strip()
-                return val or None
-    except OSError:
-        return None
-    return None
+    names = read_metadata_headers(dist_info).get("name") or []
+    return (names[0] or None) if names else None
 
 
 def _installed_by(dist_info):
-    installer_path = dist_info / "INSTALLER"
-    if installer_path.exists():
-        content = installer_path.read_text(encoding="utf-8", errors="ignore").strip().lower()
+    content = read_installer(dist_info)
+    if content:
         if "conda" in content:
             return "conda"
         if "pip" in content:
@@ -205,14 +198,8 @@ def _installed_by(dist_info):
 
 
 def _dist_has_local_direct_url(dist_info):
-    path = dist_info / "direct_url.json"
-    if not path.exists():
-        return False
-    try:
-        data = json.loads(path.read_text(encoding="utf-8", errors="ignore"))
-    except Exception:
-        return False
-    if not isinstance(data, dict):
+    data = read_direct_url(dist_info)
+    if not data:
         return False
     url = data.get("url")
     if not isinstance(url, str) or not url:
@@ -473,23 +460,11 @@ def _is_jedi_common_shadowing_error(err):
 
 def _conda_pkg_has_site_packages_files(prefix, conda_name):
     """
-    Return True if conda-meta for `conda_name` lists any Lib/site-packages files.
+    Return True if conda-meta for `conda_name` lists any site-packages files.
     Useful to distinguish non-Python conda packages that can't fix a Python import.
     """
-    try:
-        meta_dir = Path(prefix) / "conda-meta"
-        pats = sorted(meta_dir.glob(f"{conda_name}-*.json"))
-        if not pats:
-            return False
-        meta_path = pats[-1]
-        data = json.loads(meta_path.read_text(encoding="utf-8", errors="ignore"))
-        files = data.get("files") or []
-        for f in files:
-            if isinstance(f, str) and "Lib/site-packages" in f.replace("\\", "/"):
-                return True
-    except Exception:
-        return False
-    return False
+    index = load_conda_meta_index(prefix)
+    return any(site_packages_files(rec) for rec in find_package_records(index, conda_name))
 
 
 def _cleanup_jedi_common_pkg_dir(python_exe):
@@ -519,7 +494,7 @@ def attempt_fix(failures, python_exe, env_path, manager, *, base_prefix, debug):
         return {"ok": True, "actions": []}
 
     is_conda = is_conda_env(env_path)
-    entries = get_env_package_entries(env_path, manager, show_json_output=debug) if (is_conda and manager) else []
+    entries = get_env_package_entries(env_path, manager, show_json_output=debug) if is_conda else []
     conda_entries_by_name = {normalize_name(e.get("name") or ""): e for e in entries if isinstance(e, dict)}
     initially_installed = set(conda_entries_by_name.keys())
     pyver = _python_major_minor(python_exe) or "unknown"
@@ -1180,6 +1155,11 @@ def get_toplevel_imports(dist):
     name = dist.name.split("-")[0].replace("_", ".")
     return [name] if name else []
 
+
+def _entry_point_target(ep):
+    return f"{ep['module']}:{ep['attr']}" if ep.get("attr") else ep["module"]
+
+
 def check_import(package_name, python_exe):
     """
     Run `python -c "import <name>"` via subprocess.
@@ -1228,20 +1208,37 @@ def verify_imports(args):
     if not site_pkgs or not Path(site_pkgs[0]).exists():
          return {"ok": False, "exit_code": 2, "error": "missing site-packages"}
     
+    # Incremental mode: only packages changed since a revision/timestamp and their direct
+    # reverse dependencies; the critical-only filter does not apply.
+    incremental = None
+    since_revision = getattr(args, "since_revision", None)
+    since_text = getattr(args, "since", None)
+    if since_revision is not None or since_text:
+        try:
+            since = parse_timestamp(since_text) if since_revision is None else None
+            incremental = changed_packages(env_path, site_pkgs, revision=since_revision, since=since)
+        except ValueError as e:
+            if not args.json:
+                print(str(e))
+            return {"ok": False, "exit_code": 2, "error": str(e)}
+    selected = set(incremental["dist_infos"]) if incremental is not None else None
+    lazy = not getattr(args, "full", False) and incremental is None
+
     to_check = []
     dist_info_dirs = 0
     for sp_path in site_pkgs:
         sp = Path(sp_path)
-        if not sp.exists():
+        listing = list_site_packages(sp)
+        if listing is None:
             continue
-        dists = list(sp.glob("*.dist-info"))
+        dists = [sp / name for name in listing["dist_infos"] if selected is None or name in selected]
         dist_info_dirs += len(dists)
         
         for d in dists:
             # Get import names
             imports = get_toplevel_imports(d)
             for imp in imports:
-                if not getattr(args, "full", False):
+                if lazy:
                     if imp.lower() not in CRITICAL_PACKAGES:
                         continue
                 if imp.startswith("_"):
@@ -1254,6 +1251,18 @@ def verify_imports(args):
                 to_check.append((d.name, imp, sp))
     to_check = sorted(list(set(to_check)))
 
+    ep_targets = []
+    if getattr(args, "entry_points", False):
+        for sp_path in site_pkgs:
+            sp = Path(sp_path)
+            listing = list_site_packages(sp)
+            for name, meta_dir in entry_point_dists(sp, (listing or {}).get("entries") or []):
+                # Incremental mode only tracks dist-infos; egg-info dists are always checked.
+                if selected is not None and name.lower().endswith(".dist-info") and name not in selected:
+                    continue
+                for ep in read_entry_points(meta_dir):
+                    ep_targets.append({**ep, "dist": name})
+
     if not args.json:
         # Make it explicit which env we are checking (helps diagnose user confusion).
         print(f"Env: {env_path}")
@@ -1262,16 +1271,57 @@ def verify_imports(args):
             print("Site-packages:")
             for p in site_pkgs:
                 print(f"  - {p}")
+        if incremental is not None:
+            print(
+                f"Changed: {len(incremental['conda_changed'])} conda, {len(incremental['pip_changed'])} dist(s); "
+                f"reverse deps: {len(incremental['conda_reverse'])} conda, {len(incremental['pip_reverse'])} dist(s)"
+            )
         print(f"Distributions: {dist_info_dirs} (*.dist-info)")
         print(f"Import targets: {len(to_check)}")
+        if ep_targets:
+            print(f"Entry points: {len(ep_targets)}")
     
+    ep_failures = []
+    if ep_targets:
+        # One helper process resolves every console/gui script target.
+        ep_results = verify_entry_points(python_exe, ep_targets)
+        ep_failures = [
+            {"dist": r["dist"], "entry_point": r["name"], "target": _entry_point_target(r), "error": r["error"]}
+            for r in ep_results
+            if not r["ok"]
+        ]
+        if not args.json:
+            if ep_failures:
+                print(f"Found {len(ep_failures)} broken entry point(s):")
+                for f in ep_failures:
+                    print(f"  ❌ {f['entry_point']} -> {f['target']} (from {f['dist']})")
+                    if f.get("error"):
+                        print(f"      {f['error']}")
+            else:
+                print(f"All {len(ep_targets)} entry points resolved.")
+
     if not to_check:
          # Fallback: if no critical packages found in lazy mode, warn user or check a few random ones?
          # Or just return empty report.
-        if not getattr(args, "full", False):
+        if args.json:
+            pass
+        elif incremental is not None:
+            print("No changed packages to verify.")
+        elif lazy:
             # Avoid requiring a translation entry for this experimental path.
             print("No import candidates found in lazy mode.")
-        return {"ok": True, "exit_code": 0, "report": {"env": env_path, "checks": 0, "failures": []}}
+        ok_ep = not ep_failures
+        return {
+            "ok": ok_ep,
+            "exit_code": 0 if ok_ep else 1,
+            "report": {
+                "env": env_path,
+                "checks": 0,
+                "failures": [],
+                "entry_point_failures": ep_failures,
+                "incremental": incremental,
+            },
+        }
 
     # Parallel execution
     max_workers = min(32, (os.cpu_count() or 1) * 4) 
@@ -1348,7 +1398,7 @@ def verify_imports(args):
             {"dist": f.get("dist"), "import": f.get("import"), "error": f.get("error")} for f in failures
         ]
 
-    ok_all = len(post_failures) == 0 and (fix_report is None or bool(fix_report.get("ok")))
+    ok_all = len(post_failures) == 0 and not ep_failures and (fix_report is None or bool(fix_report.get("ok")))
 
     report = {
         "env": env_path,
@@ -1363,6 +1413,9 @@ def verify_imports(args):
             for f in failures
         ],
         "post_failures": post_failures,
+        "entry_points": len(ep_targets),
+        "entry_point_failures": ep_failures,
+        "incremental": incremental,
         "fix": fix_report,
     }
     return {"ok": ok_all, "exit_code": 0 if ok_all else 1, "report": report}
@@ -0,0 +1,51 @@
+"""
+Builders for the fake envs the tests scan: conda-meta records, site-packages dists, files.
+"""
+import json
+import os
+from pathlib import Path
+
+
+def sp_rel():
+    """
+    Site-packages of a fake env, relative to its prefix (platform layout).
+    """
+    return "Lib/site-packages" if os.name == "nt" else "lib/python3.11/site-packages"
+
+
+def touch(path, data=b"x"):
+    """
+    Write `data` (bytes, or str as UTF-8) to `path`, creating parent directories.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        path.write_text(data, encoding="utf-8")
+    else:
+        path.write_bytes(data)
+    return path
+
+
+def write_record(cm, name, version="1.0", build="0", *, depends=(), files=(), **extra):
+    """
+    conda-meta record `<name>-<version>-<build>.json` in `cm`; `extra` adds top-level keys.
+    """
+    record = {"name": name, "version": version, "build": build, "depends": list(depends), "files": list(files)}
+    record.update(extra)
+    return touch(Path(cm) / f"{name}-{version}-{build}.json", json.dumps(record))
+
+
+def write_dist(sp, name, version, *, requires=(), body=None, mtime=None):
+    """
+    `<name>-<version>.dist-info` with a METADATA header (plus `body`) in `sp`.
+    """
+    d = Path(sp) / f"{name}-{version}.dist-info"
+    lines = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+    lines += [f"Requires-Dist: {r}" for r in requires]
+    text = "\n".join(lines) + "\n"
+    if body is not None:
+        text += "\n" + body + "\n"
+    touch(d / "METADATA", text)
+    if mtime is not None:
+        os.utime(d, (mtime, mtime))
+    return d
@@ -0,0 +1,67 @@
+import os
+import py_compile
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from env_repair.bytecode import recompile_packages, scan_bytecode
+
+
+class TestBytecode(unittest.TestCase):
+    def _make_site_packages(self, td):
+        ver = f"python{sys.version_info[0]}.{sys.version_info[1]}"
+        sp = Path(td) / "lib" / ver / "site-packages"
+        pkg = sp / "pkg"
+        pkg.mkdir(parents=True)
+        tag = sys.implementation.cache_tag
+        for name in ("ok", "stale", "badmagic", "gone"):
+            src = pkg / f"{name}.py"
+            src.write_text(f"X = {name!r}\n", encoding="utf-8")
+            py_compile.compile(str(src), cfile=str(pkg / "__pycache__" / f"{name}.{tag}.pyc"), doraise=True)
+        (sp / "top.py").write_text("Y = 1\n", encoding="utf-8")
+        py_compile.compile(str(sp / "top.py"), cfile=str(sp / "__pycache__" / f"top.{tag}.pyc"), doraise=True)
+
+        st = (pkg / "stale.py").stat()
+        os.utime(pkg / "stale.py", (st.st_atime, st.st_mtime + 100))
+        bad = pkg / "__pycache__" / f"badmagic.{tag}.pyc"
+        bad.write_bytes(b"\0\0\r\n" + bad.read_bytes()[4:])
+        (pkg / "gone.py").unlink()
+        (pkg / "__pycache__" / "ok.cpython-27.pyc").write_bytes(b"\x03\xf3\r\n" + b"\0" * 12)
+        return sp
+
+    def test_scan_classifies_pycs(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            issues = scan_bytecode(td, sys.executable, [str(sp)])
+            self.assertEqual(len(issues), 1)
+            issue = issues[0]
+            self.assertEqual(issue["type"], "stale-bytecode")
+            self.assertEqual(issue["counts"], {"bad-magic": 1, "foreign-tag": 1, "orphaned": 1, "stale": 1})
+            self.assertEqual(issue["packages"], ["pkg"])
+            statuses = {Path(f["path"]).name.split(".")[0]: f["status"] for f in issue["files"]}
+            self.assertEqual(statuses["stale"], "stale")
+            self.assertNotIn("top", statuses)
+
+    def test_recompile_refreshes_out_of_date_pycs(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            self.assertTrue(recompile_packages(sys.executable, str(sp), ["pkg"], workers=2))
+            issues = scan_bytecode(td, sys.executable, [str(sp)])
+            self.assertEqual(issues[0]["counts"], {"foreign-tag": 1, "orphaned": 1})
+            self.assertEqual(issues[0]["packages"], [])
+
+    def test_stale_top_level_module_is_recompiled(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            st = (sp / "top.py").stat()
+            os.utime(sp / "top.py", (st.st_atime, st.st_mtime + 100))
+            issue = scan_bytecode(td, sys.executable, [str(sp)])[0]
+            self.assertEqual(issue["packages"], ["pkg", "top.py"])
+            self.assertTrue(recompile_packages(sys.executable, str(sp), issue["packages"], workers=2))
+            issue = scan_bytecode(td, sys.executable, [str(sp)])[0]
+            self.assertEqual(issue["counts"], {"foreign-tag": 1, "orphaned": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
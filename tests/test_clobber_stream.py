@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta
+from env_repair.clobber import conda_owner_of, extract_paths_from_file, extract_paths_from_lines
+
+
+class TestClobberStream(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_windows_paths_with_trailing_punctuation(self):
+        lines = [
+            "Preparing transaction: done\n",
+            r"  path: 'C:\Anaconda3\Lib\site-packages\a.py', other: C:\Anaconda3\Scripts\b.exe;" + "\n",
+            r"  outside: 'C:\Other\Lib\c.py'" + "\n",
+            r"  prefix lookalike: C:\Anaconda3x\Lib\d.py" + "\n",
+        ]
+        paths = extract_paths_from_lines(lines, env_prefix=r"C:\Anaconda3")
+        self.assertEqual(paths, [r"C:\Anaconda3\Lib\site-packages\a.py", r"C:\Anaconda3\Scripts\b.exe"])
+
+    def test_only_candidates_under_prefix_are_resolved(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = str(Path(td).resolve())
+            lines = [f"noise /usr/lib/libfoo.so {i}\n" for i in range(50)]
+            lines.append(f"ClobberError: path '{env}/lib/x.py' (conflict)\n")
+            with mock.patch("env_repair.clobber.Path.resolve", autospec=True, side_effect=lambda p: p) as resolve:
+                paths = extract_paths_from_lines(lines, env_prefix=env)
+            self.assertEqual(paths, [f"{env}/lib/x.py"])
+            # Prefix itself (twice) plus the single matching candidate.
+            self.assertLessEqual(resolve.call_count, 3)
+
+    @unittest.skipIf(os.name == "nt", "POSIX log paths")
+    def test_file_is_streamed_and_owner_looked_up_from_index(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = Path(td).resolve()
+            cm = env / "conda-meta"
+            cm.mkdir()
+            (cm / "demo-1.0-0.json").write_text(
+                json.dumps({"name": "demo", "version": "1.0", "build": "0", "files": ["lib/x.py"]}), encoding="utf-8"
+            )
+            log = env / "install.log"
+            log.write_bytes(
+                b"ERROR \xff conflict:\n"
+                + f"  path: '{env}/lib/x.py'\n  path: '{env}/lib/y.py',\n".encode("utf-8")
+            )
+            paths = extract_paths_from_file(log, env_prefix=str(env))
+            self.assertEqual(paths, [f"{env}/lib/x.py", f"{env}/lib/y.py"])
+
+            index = conda_meta.load_conda_meta_index(str(env))
+            owner = conda_owner_of(index, "lib/x.py")
+            self.assertEqual(owner, {"name": "demo", "version": "1.0", "build": "0", "record": "demo-1.0-0.json"})
+            self.assertIsNone(conda_owner_of(index, "lib/y.py"))
+            self.assertIsNone(conda_owner_of(None, "lib/x.py"))
+
+
+if __name__ == "__main__":
+    unittest.main()
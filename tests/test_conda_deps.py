@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from env_repair import conda_meta
+from env_repair.conda_deps import (
+    check_conda_dependencies,
+    compare_versions,
+    parse_match_spec,
+    version_matches,
+    version_order,
+)
+
+from env_fixtures import write_record
+
+
+class TestCondaDeps(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_version_order(self):
+        order = ["1.0dev1", "1.0a1", "1.0", "1.0.post1", "1.0.1_", "1.0.1a", "1.1", "2017.4.17", "1!0.5"]
+        for a, b in zip(order, order[1:]):
+            self.assertEqual(compare_versions(version_order(a), version_order(b)), -1, (a, b))
+        self.assertEqual(compare_versions(version_order("1.0"), version_order("1.0.0")), 0)
+        self.assertIsNone(version_order("1.0$"))
+
+    def test_version_specs(self):
+        self.assertTrue(version_matches(">=3.13,<3.14.0a0", "3.13.5"))
+        self.assertFalse(version_matches(">=3.13,<3.14.0a0", "3.14.0rc1"))
+        self.assertTrue(version_matches("3.13.*", "3.13.5"))
+        self.assertFalse(version_matches("3.13.*", "3.1.3"))
+        self.assertTrue(version_matches("1.2", "1.2.0"))
+        self.assertTrue(version_matches("1.*|>=3", "3.1"))
+        self.assertFalse(version_matches(">=1.5.6,<2.0,!=1.5.7", "1.5.7"))
+        self.assertTrue(version_matches("~=1.4", "1.9"))
+        self.assertIsNone(version_matches("(1.*|2.*),!=1.5", "1.2"))
+
+    def test_parse_match_spec(self):
+        self.assertEqual(parse_match_spec("python_abi 3.13.* *_cp313"), {"name": "python_abi", "version": "3.13.*", "build": "*_cp313"})
+        self.assertEqual(parse_match_spec("python >=3.9,<3.10.0a0"), {"name": "python", "version": ">=3.9,<3.10.0a0", "build": None})
+        self.assertEqual(parse_match_spec("numpy=1.26"), {"name": "numpy", "version": "1.26*", "build": None})
+        self.assertEqual(parse_match_spec("pkg=1.0=h123_0"), {"name": "pkg", "version": "1.0", "build": "h123_0"})
+        self.assertEqual(
+            parse_match_spec("conda-forge::numpy[version='>=1.2',build=py*]"),
+            {"name": "numpy", "version": ">=1.2", "build": "py*"},
+        )
+
+    def test_check_reports_unsatisfied_records(self):
+        with tempfile.TemporaryDirectory() as td:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            write_record(cm, "python", "3.12.1", "h1_0_cpython", depends=["__glibc >=2.17", "libzlib >=1.2.13,<2.0a0"])
+            write_record(cm, "libzlib", "1.3.1", "h0", constrains=["zlib 1.3.1 *_0"])
+            write_record(cm, "numpy", "1.26.4", "py311h0", depends=["python >=3.11,<3.12.0a0", "python_abi 3.11.* *_cp311", "libblas"])
+            write_record(cm, "python_abi", "3.12", "5_cp312")
+            write_record(cm, "zlib", "1.3.1", "h0_1")
+
+            unsatisfied = check_conda_dependencies(conda_meta.load_conda_meta_index(td))
+            got = sorted((u["package"], u["kind"], u["dependency"], u["installed"]) for u in unsatisfied)
+            self.assertEqual(
+                got,
+                [
+                    ("libzlib", "constrains", "zlib", "1.3.1 h0_1"),
+                    ("numpy", "depends", "libblas", None),
+                    ("numpy", "depends", "python", "3.12.1 h1_0_cpython"),
+                    ("numpy", "depends", "python_abi", "3.12 5_cp312"),
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
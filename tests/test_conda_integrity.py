@@ -0,0 +1,111 @@
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta
+from env_repair.hashing import hash_files, sha256_file
+from env_repair.integrity import scan_conda_integrity
+from env_repair.repair import _fix_damaged_conda_files
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _entry(path, data, **extra):
+    return {"_path": path, "path_type": "hardlink", "sha256": _sha(data), "size_in_bytes": len(data), **extra}
+
+
+def _make_env(td):
+    env = Path(td)
+    (env / "conda-meta").mkdir()
+    (env / "lib").mkdir()
+    (env / "bin").mkdir()
+    files = {
+        "lib/ok.so": b"intact",
+        "lib/resized.so": b"original",
+        "lib/flipped.so": b"abcdef",
+        "bin/script": b"#!/opt/placeholder/bin/python\n",
+    }
+    (env / "lib" / "ok.so").write_bytes(b"intact")
+    (env / "lib" / "resized.so").write_bytes(b"short")
+    (env / "lib" / "flipped.so").write_bytes(b"abcdeX")
+    relocated = f"#!{env}/bin/python\n".encode()
+    (env / "bin" / "script").write_bytes(relocated)
+    paths = [
+        _entry("lib/ok.so", files["lib/ok.so"]),
+        _entry("lib/resized.so", files["lib/resized.so"]),
+        _entry("lib/flipped.so", files["lib/flipped.so"]),
+        _entry("lib/gone.so", b"x"),
+        _entry(
+            "bin/script",
+            files["bin/script"],
+            prefix_placeholder="/opt/placeholder",
+            sha256_in_prefix=_sha(relocated),
+        ),
+        {"_path": "lib/mod.cpython-311.pyc", "path_type": "pyc_file"},
+    ]
+    record = {
+        "name": "libfoo",
+        "version": "1.0",
+        "build": "h0_0",
+        "depends": [],
+        "files": [p["_path"] for p in paths],
+        "paths_data": {"paths": paths, "paths_version": 1},
+    }
+    (env / "conda-meta" / "libfoo-1.0-h0_0.json").write_text(json.dumps(record, indent=2), encoding="utf-8")
+    # Older record without paths_data: existence is checked from `files`.
+    old = {"name": "old", "version": "2", "build": "0", "depends": [], "files": ["share/old.txt"]}
+    (env / "conda-meta" / "old-2-0.json").write_text(json.dumps(old), encoding="utf-8")
+    return env
+
+
+class TestCondaIntegrity(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_fast_tier_checks_existence_and_size(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = _make_env(td)
+            issues = {i["package"]: i for i in scan_conda_integrity(str(env))}
+            self.assertEqual(issues["libfoo"]["missing"], ["lib/gone.so"])
+            self.assertEqual(issues["libfoo"]["modified"], ["lib/resized.so"])
+            self.assertEqual(issues["libfoo"]["build"], "h0_0")
+            self.assertEqual(issues["old"]["missing"], ["share/old.txt"])
+
+    def test_deep_tier_hashes_contents(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = _make_env(td)
+            issues = {i["package"]: i for i in scan_conda_integrity(str(env), deep=True)}
+            self.assertEqual(issues["libfoo"]["modified"], ["lib/flipped.so", "lib/resized.so"])
+
+    def test_hash_files_parallel(self):
+        with tempfile.TemporaryDirectory() as td:
+            paths = []
+            for i in range(6):
+                p = Path(td) / f"f{i}"
+                p.write_bytes(b"data" * i)
+                paths.append(str(p))
+            digests = hash_files(paths + [str(Path(td) / "missing")])
+            self.assertEqual(digests[paths[3]], _sha(b"data" * 3))
+            self.assertEqual(sha256_file(paths[0]), _sha(b""))
+            self.assertIsNone(digests[str(Path(td) / "missing")])
+
+    def test_fixer_reinstalls_damaged_packages_pinned(self):
+        env = {
+            "path": "/env",
+            "issues": [{"type": "conda-files-damaged", "package": "libfoo", "version": "1.0", "build": "h0_0"}],
+        }
+        with mock.patch("env_repair.repair.conda_install", return_value=True) as install:
+            fixes = _fix_damaged_conda_files(env, "mamba", ["conda-forge"], False, False)
+        self.assertEqual(install.call_args[0][1], ["libfoo=1.0=h0_0"])
+        self.assertTrue(install.call_args[1]["force_reinstall"])
+        self.assertTrue(fixes[0]["fixed"])
+        self.assertEqual(env["issues"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair.conda_meta import channel_name, read_conda_package_entries
+from env_repair.conda_ops import get_env_package_entries
+
+
+def _site_packages(env):
+    if os.name == "nt":
+        return env / "Lib" / "site-packages"
+    return env / "lib" / "python3.11" / "site-packages"
+
+
+def _make_env(td):
+    env = Path(td)
+    cm = env / "conda-meta"
+    cm.mkdir(parents=True, exist_ok=True)
+    sp = _site_packages(env)
+    sp.mkdir(parents=True, exist_ok=True)
+    sp_rel = sp.relative_to(env).as_posix()
+
+    (cm / "numpy-1.26.4-py311h_0.json").write_text(
+        json.dumps(
+            {
+                "name": "numpy",
+                "version": "1.26.4",
+                "build": "py311h_0",
+                "build_number": 0,
+                "subdir": "linux-64",
+                "channel": "https://conda.anaconda.org/conda-forge/linux-64",
+                "depends": [],
+                "files": [f"{sp_rel}/numpy-1.26.4.dist-info/METADATA", f"{sp_rel}/numpy/__init__.py"],
+            }
+        ),
+        encoding="utf-8",
+    )
+    (cm / "broken-1.0-0.json").write_text("{not json", encoding="utf-8")
+
+    conda_dist = sp / "numpy-1.26.4.dist-info"
+    conda_dist.mkdir()
+    (conda_dist / "METADATA").write_text("Name: numpy\nVersion: 1.26.4\n", encoding="utf-8")
+
+    pip_dist = sp / "Typing_Extensions-4.12.2.dist-info"
+    pip_dist.mkdir()
+    (pip_dist / "METADATA").write_text("Metadata-Version: 2.1\nName: Typing_Extensions\nVersion: 4.12.2\n\nbody\n", encoding="utf-8")
+    return env
+
+
+class TestCondaMetaEntries(unittest.TestCase):
+    def test_channel_name_variants(self):
+        self.assertEqual(channel_name({"channel": "https://conda.anaconda.org/conda-forge/win-64"}), "conda-forge")
+        self.assertEqual(channel_name({"channel": "https://repo.anaconda.com/pkgs/main/win-64"}), "pkgs/main")
+        self.assertEqual(channel_name({"channel": "conda-forge"}), "conda-forge")
+        self.assertEqual(
+            channel_name({"url": "https://conda.anaconda.org/t/tk-123/private/noarch/x-1.0-0.conda"}), "private"
+        )
+
+    def test_reads_conda_and_pypi_entries(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = _make_env(td)
+            entries = read_conda_package_entries(str(env))
+            by_name = {e["name"]: e for e in entries}
+            self.assertEqual(by_name["numpy"]["channel"], "conda-forge")
+            self.assertEqual(by_name["numpy"]["build_string"], "py311h_0")
+            self.assertEqual(by_name["typing-extensions"]["channel"], "pypi")
+            self.assertEqual(by_name["typing-extensions"]["version"], "4.12.2")
+            # conda-owned dist-info must not show up again as a pypi entry
+            self.assertEqual(len([e for e in entries if e["name"] == "numpy"]), 1)
+            self.assertNotIn("broken", by_name)
+
+    def test_no_conda_meta_returns_none(self):
+        with tempfile.TemporaryDirectory() as td:
+            self.assertIsNone(read_conda_package_entries(td))
+
+    def test_get_env_package_entries_native_skips_cli(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = _make_env(td)
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_PACKAGE_LIST": "native"}):
+                with mock.patch("env_repair.conda_ops.run_json_cmd") as cli:
+                    entries = get_env_package_entries(str(env), "conda", show_json_output=False)
+            cli.assert_not_called()
+            self.assertTrue(any(e["name"] == "numpy" for e in entries))
+
+    def test_get_env_package_entries_cli_mode(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = _make_env(td)
+            fake = [{"name": "numpy", "version": "1.26.4", "channel": "conda-forge"}]
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_PACKAGE_LIST": "cli"}):
+                with mock.patch("env_repair.conda_ops.run_json_cmd", return_value=fake) as cli:
+                    entries = get_env_package_entries(str(env), "conda", show_json_output=False)
+            cli.assert_called_once()
+            self.assertEqual(entries, fake)
+
+
+if __name__ == "__main__":
+    unittest.main()
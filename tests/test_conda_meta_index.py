@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta
+from env_repair.clobber import build_conda_file_owner_map
+from env_repair.verify_imports import _conda_pkg_has_site_packages_files
+
+from env_fixtures import write_record
+
+
+class TestCondaMetaIndex(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_owner_lookups_and_package_records(self):
+        with tempfile.TemporaryDirectory() as td:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            write_record(cm, "aaa", "1.0", "0", files=["bin/tool", "lib/python3.11/site-packages/aaa/__init__.py"])
+            write_record(cm, "bbb", "2.0", "0", files=["bin\\tool", "share/doc.txt"])
+            (cm / "broken-1.0-0.json").write_text("{", encoding="utf-8")
+
+            index = conda_meta.load_conda_meta_index(td)
+            self.assertEqual([r["file"] for r in index["records"]][0], "aaa-1.0-0.json")
+            self.assertEqual(len(conda_meta.file_owners(index)["bin/tool"]), 2)
+            self.assertEqual(conda_meta.file_owner(index, "/bin/tool")["meta"]["name"], "aaa")
+
+            owners = build_conda_file_owner_map(td)
+            self.assertEqual(owners["bin/tool"]["record"], "aaa-1.0-0.json")
+            self.assertEqual(owners["share/doc.txt"]["name"], "bbb")
+
+            self.assertTrue(_conda_pkg_has_site_packages_files(td, "aaa"))
+            self.assertFalse(_conda_pkg_has_site_packages_files(td, "bbb"))
+            self.assertFalse(_conda_pkg_has_site_packages_files(td, "missing"))
+
+    def test_changed_record_is_reparsed(self):
+        with tempfile.TemporaryDirectory() as td:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            p = write_record(cm, "aaa", files=["a.txt"])
+            first = conda_meta.load_conda_meta_index(td)
+            self.assertIs(conda_meta.load_conda_meta_index(td), first)
+
+            p.write_text(json.dumps({"name": "aaa", "version": "1.0", "build": "0", "files": ["a.txt", "b.txt"]}), encoding="utf-8")
+            os.utime(p, ns=(1, 1))
+            second = conda_meta.load_conda_meta_index(td)
+            self.assertIsNot(second, first)
+            self.assertEqual(second["records"][0]["files"], ["a.txt", "b.txt"])
+
+    def test_persisted_index_skips_parsing(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            for i in range(3):
+                write_record(cm, f"pkg{i}", files=[f"f{i}.txt"])
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": cache}), mock.patch.object(
+                conda_meta, "PERSIST_MIN_RECORDS", 1
+            ):
+                conda_meta.load_conda_meta_index(td)
+                self.assertEqual(len(list(Path(cache).glob("conda-meta-index-*.json"))), 1)
+                conda_meta.clear_index_cache()
+                with mock.patch.object(conda_meta, "_parse_record_file") as parse:
+                    index = conda_meta.load_conda_meta_index(td)
+                parse.assert_not_called()
+            self.assertEqual(conda_meta.file_owner(index, "f2.txt")["meta"]["name"], "pkg2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta
+from env_repair.scan import scan_conda_meta_json
+
+
+class TestCondaMetaValidation(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def _write(self, cm, filename, text):
+        (cm / filename).write_text(text, encoding="utf-8")
+
+    def test_well_framed_but_broken_record_is_invalid(self):
+        with tempfile.TemporaryDirectory() as td:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            record = {"name": "ok", "version": "1", "build": "0", "depends": [], "files": ["a", "b"]}
+            text = json.dumps(record, indent=2)
+            # Starts with "{\n", ends with "\n}" and has a top-level "depends": still not JSON.
+            self._write(cm, "ok-1-0.json", text.replace('"a",', '"a"'))
+            self.assertEqual(
+                [(i["package"], i["type"]) for i in scan_conda_meta_json(td)],
+                [("ok", "conda-meta-invalid-json")],
+            )
+
+    def test_nested_depends_and_truncated_records(self):
+        with tempfile.TemporaryDirectory() as td:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            # Nested "depends" only: not a top-level key.
+            nested = {"name": "a", "version": "1", "build": "0", "subdir": "linux-64", "link": {"depends": []}}
+            self._write(cm, "a-1-0.json", json.dumps(nested, indent=2))
+            truncated = json.dumps({"name": "b", "version": "1", "build": "0", "depends": []}, indent=2)[:-3]
+            self._write(cm, "b-1-0.json", truncated)
+            self._write(cm, "c-1-0.json", json.dumps({"name": "c", "version": "1", "build": "0", "depends": []}))
+
+            issues = {i["package"]: i["type"] for i in scan_conda_meta_json(td)}
+            self.assertEqual(issues, {"a": "conda-meta-missing-depends", "b": "conda-meta-invalid-json"})
+            self.assertEqual(
+                {i["package"]: i["type"] for i in scan_conda_meta_json(td, strict=True)},
+                issues,
+            )
+
+    def test_verdict_cache_skips_unchanged_records(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            for i in range(3):
+                self._write(cm, f"p{i}-1-0.json", json.dumps({"name": f"p{i}", "version": "1", "build": "0"}))
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": cache}), mock.patch.object(
+                conda_meta, "PERSIST_MIN_RECORDS", 1
+            ):
+                first = conda_meta.conda_meta_verdicts(td)
+                with mock.patch.object(conda_meta, "_judge_record_file") as judge:
+                    second = conda_meta.conda_meta_verdicts(td)
+                judge.assert_not_called()
+            self.assertEqual(first, second)
+            self.assertEqual(set(first.values()), {"ok"})
+
+
+if __name__ == "__main__":
+    unittest.main()
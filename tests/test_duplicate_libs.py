@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, elf
+
+from env_fixtures import touch
+
+
+@unittest.skipIf(os.name == "nt", "POSIX library layout")
+class TestDuplicateLibraries(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        patcher = mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": self._td.name + "/cache"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_library_key_strips_vendoring_hashes(self):
+        self.assertEqual(elf.library_key("libgomp-a34b3233.so.1.0.0"), "libgomp.so.1")
+        self.assertEqual(elf.library_key("libgomp.so.1"), "libgomp.so.1")
+        self.assertEqual(elf.library_key("openblas-5f2a1c3d.dll"), "openblas.dll")
+        self.assertIsNone(elf.library_key("README.txt"))
+
+    def test_groups_copies_by_library_and_hash(self):
+        env = Path(self._td.name) / "env"
+        sp = env / "lib" / "python3.12" / "site-packages"
+        touch(env / "lib" / "libgomp.so.1", b"A" * 1000)
+        touch(sp / "torch.libs" / "libgomp-a34b3233.so.1.0.0", b"A" * 1000)
+        touch(sp / "sklearn.libs" / "libgomp-deadbeef.so.1", b"B" * 600)
+        touch(env / "lib" / "libz.so.1", b"Z" * 100)
+        os.link(env / "lib" / "libz.so.1", sp / "libz.so.1")
+        os.symlink("libgomp.so.1", env / "lib" / "libgomp.so")
+        touch(sp / "pkg" / "libfast.cpython-312-x86_64-linux-gnu.so", b"X")
+        touch(sp / "other" / "libfast.cpython-312-x86_64-linux-gnu.so", b"X")
+
+        issues = elf.scan_duplicate_libraries(str(env), [str(sp)])
+
+        self.assertEqual(len(issues), 1)
+        issue = issues[0]
+        self.assertEqual(issue["type"], "duplicate-native-libs")
+        self.assertEqual(issue["count"], 1)
+        lib = issue["libraries"][0]
+        self.assertEqual(lib["library"], "libgomp.so.1")
+        self.assertFalse(lib["identical"])
+        self.assertEqual(lib["redundant_bytes"], 1600)
+        self.assertEqual(
+            [c["path"] for c in lib["copies"]],
+            [
+                "lib/libgomp.so.1",
+                "lib/python3.12/site-packages/sklearn.libs/libgomp-deadbeef.so.1",
+                "lib/python3.12/site-packages/torch.libs/libgomp-a34b3233.so.1.0.0",
+            ],
+        )
+        digests = [c["sha256"] for c in lib["copies"]]
+        self.assertEqual(digests[0], digests[2])
+        self.assertNotEqual(digests[0], digests[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
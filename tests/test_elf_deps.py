@@ -0,0 +1,133 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, elf
+
+
+def _write_elf(path, *, needed=(), soname=None, rpath=None, versions=None):
+    """
+    Minimal little-endian ELF64 shared object: one PT_LOAD covering the file (vaddr == offset),
+    a PT_DYNAMIC segment, a string table and an optional DT_VERNEED chain.
+    """
+    strtab = bytearray(b"\0")
+
+    def add(s):
+        off = len(strtab)
+        strtab.extend(s.encode() + b"\0")
+        return off
+
+    dyn = [(elf._DT_NEEDED, add(n)) for n in needed]
+    if soname:
+        dyn.append((elf._DT_SONAME, add(soname)))
+    if rpath:
+        dyn.append((elf._DT_RPATH, add(rpath)))
+    verneed = bytearray()
+    libs = list((versions or {}).items())
+    for i, (lib, names) in enumerate(libs):
+        lib_off = add(lib)
+        name_offs = [add(n) for n in names]
+        nxt = 0 if i == len(libs) - 1 else 16 + 16 * len(names)
+        verneed += struct.pack("<HHIII", 1, len(names), lib_off, 16, nxt)
+        for j, name_off in enumerate(name_offs):
+            verneed += struct.pack("<IHHII", 0, 0, 0, name_off, 0 if j == len(names) - 1 else 16)
+
+    phoff = 64
+    dyn_off = phoff + 2 * 56
+    dyn_count = len(dyn) + 4 + (2 if verneed else 0)
+    str_off = dyn_off + dyn_count * 16
+    ver_off = str_off + len(strtab)
+    dyn += [(elf._DT_STRTAB, str_off), (elf._DT_STRSZ, len(strtab))]
+    if verneed:
+        dyn += [(elf._DT_VERNEED, ver_off), (elf._DT_VERNEEDNUM, len(libs))]
+    dyn += [(0, 0)] * (dyn_count - len(dyn))
+    total = ver_off + len(verneed)
+
+    ident = b"\x7fELF" + bytes([2, 1, 1]) + b"\0" * 9
+    header = ident + struct.pack("<HHIQQQIHHHHHH", 3, 62, 1, 0, phoff, 0, 0, 64, 56, 2, 64, 0, 0)
+    ph = struct.pack("<IIQQQQQQ", elf._PT_LOAD, 5, 0, 0, 0, total, total, 0x1000)
+    ph += struct.pack("<IIQQQQQQ", elf._PT_DYNAMIC, 6, dyn_off, dyn_off, dyn_off, dyn_count * 16, dyn_count * 16, 8)
+    body = b"".join(struct.pack("<qQ", tag, val) for tag, val in dyn)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + ph + body + bytes(strtab) + bytes(verneed))
+
+
+class TestElfParse(unittest.TestCase):
+    def test_parse_dynamic_section(self):
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "libdemo.so.1"
+            _write_elf(
+                p,
+                needed=["libfoo.so.2", "libc.so.6"],
+                soname="libdemo.so.1",
+                rpath="$ORIGIN/../lib:/opt/x",
+                versions={"libc.so.6": ["GLIBC_2.2.5", "GLIBC_2.34"]},
+            )
+            info = elf.parse_elf_dynamic(p)
+            self.assertEqual(info["soname"], "libdemo.so.1")
+            self.assertEqual(info["needed"], ["libfoo.so.2", "libc.so.6"])
+            self.assertEqual(info["rpath"], ["$ORIGIN/../lib", "/opt/x"])
+            self.assertEqual(info["runpath"], [])
+            self.assertEqual(info["versions"], {"libc.so.6": ["GLIBC_2.2.5", "GLIBC_2.34"]})
+
+    def test_non_elf_is_ignored(self):
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "fake.so"
+            p.write_bytes(b"not an elf file at all")
+            self.assertIsNone(elf.parse_elf_dynamic(p))
+
+    def test_shared_library_names(self):
+        self.assertTrue(elf.is_shared_library_name("_ssl.cpython-312-x86_64-linux-gnu.so"))
+        self.assertTrue(elf.is_shared_library_name("libz.so.1.3"))
+        self.assertFalse(elf.is_shared_library_name("libz.so.py"))
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "ELF/loader semantics are Linux-only")
+class TestElfScan(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_reports_unresolved_libs_glibc_and_dangling_links(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = Path(td)
+            sp = env / "lib" / "python3.12" / "site-packages"
+            _write_elf(env / "lib" / "libbar.so.1", soname="libbar.so.1")
+            # Resolved through RPATH $ORIGIN and through the env lib/; libvend.so.3 exists in the
+            # env but not on _vend.so's search path.
+            _write_elf(sp / "ok" / "libs" / "libvend.so.3", soname="libvend.so.3")
+            _write_elf(sp / "ok" / "_ok.so", needed=["libbar.so.1"], rpath="$ORIGIN/libs")
+            _write_elf(sp / "ok" / "_vend.so", needed=["libvend.so.3"])
+            _write_elf(
+                sp / "broken" / "_broken.so",
+                needed=["libbar.so.1", "libmissing.so.7"],
+                versions={"libc.so.6": ["GLIBC_2.2.5", "GLIBC_99.1"]},
+            )
+            os.symlink("libgone.so.5", env / "lib" / "libgone.so")
+
+            with mock.patch("env_repair.elf.system_library_dirs", return_value=[]), mock.patch(
+                "env_repair.elf.system_glibc_version", return_value=(2, 36)
+            ):
+                issues = elf.scan_elf_dependencies(str(env), [str(sp)])
+
+            unresolved = [i for i in issues if i["type"] == "elf-unresolved"]
+            self.assertEqual(len(unresolved), 1)
+            self.assertEqual(unresolved[0]["path"], "lib/python3.12/site-packages/broken/_broken.so")
+            self.assertEqual(unresolved[0]["missing"], ["libmissing.so.7"])
+            self.assertEqual(unresolved[0]["glibc"], ["GLIBC_99.1"])
+            off_path = [i for i in issues if i["type"] == "elf-off-search-path"]
+            self.assertEqual(len(off_path), 1)
+            self.assertEqual(off_path[0]["path"], "lib/python3.12/site-packages/ok/_vend.so")
+            self.assertEqual(
+                off_path[0]["libraries"],
+                [{"library": "libvend.so.3", "found": ["lib/python3.12/site-packages/ok/libs/libvend.so.3"]}],
+            )
+            dangling = [i for i in issues if i["type"] == "dangling-symlinks"]
+            self.assertEqual(dangling[0]["links"], [{"path": "lib/libgone.so", "target": "libgone.so.5"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
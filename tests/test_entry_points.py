@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair.entry_points import entry_point_dists, read_entry_points, verify_entry_points
+from env_repair.scan import list_site_packages
+
+
+class TestEntryPoints(unittest.TestCase):
+    def test_read_entry_points(self):
+        with tempfile.TemporaryDirectory() as td:
+            dist = Path(td) / "demo-1.0.dist-info"
+            dist.mkdir()
+            (dist / "entry_points.txt").write_text(
+                "[console_scripts]\n"
+                "Demo-CLI = demo.cli:main\n"
+                "demo-extra = demo.cli:Tool.run [extra]\n"
+                "[gui_scripts]\n"
+                "demo-gui = demo_gui\n"
+                "[demo.plugins]\n"
+                "x = demo.plugins:x\n",
+                encoding="utf-8",
+            )
+            eps = read_entry_points(dist)
+            self.assertEqual(
+                [(e["group"], e["name"], e["module"], e["attr"]) for e in eps],
+                [
+                    ("console_scripts", "Demo-CLI", "demo.cli", "main"),
+                    ("console_scripts", "demo-extra", "demo.cli", "Tool.run"),
+                    ("gui_scripts", "demo-gui", "demo_gui", None),
+                ],
+            )
+            self.assertEqual(read_entry_points(Path(td) / "missing.dist-info"), [])
+
+    def test_egg_info_and_develop_installs_are_collected(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            sp = root / "site-packages"
+            for meta in (sp / "wheel-1.0.dist-info", sp / "legacy-1.0-py3.11.egg-info", root / "proj" / "devpkg.egg-info"):
+                meta.mkdir(parents=True)
+                (meta / "entry_points.txt").write_text(f"[console_scripts]\n{meta.name.split('-')[0].split('.')[0]} = m:main\n", encoding="utf-8")
+            (sp / "devpkg.egg-link").write_text(f"{root / 'proj'}\n.\n", encoding="utf-8")
+            (sp / "broken.egg-link").write_text(f"{root / 'gone'}\n", encoding="utf-8")
+            dists = entry_point_dists(sp, list_site_packages(sp)["entries"])
+            self.assertEqual(
+                sorted((name, meta) for name, meta in dists),
+                [
+                    ("devpkg.egg-info", root / "proj" / "devpkg.egg-info"),
+                    ("legacy-1.0-py3.11.egg-info", sp / "legacy-1.0-py3.11.egg-info"),
+                    ("wheel-1.0.dist-info", sp / "wheel-1.0.dist-info"),
+                ],
+            )
+            self.assertEqual(
+                sorted(ep["name"] for _name, meta in dists for ep in read_entry_points(meta)), ["devpkg", "legacy", "wheel"]
+            )
+
+    def test_verify_in_one_helper_with_crash_isolation(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "ep_good.py").write_text("print('noise')\nclass Tool:\n    def run(self): pass\ndef main(): pass\n", encoding="utf-8")
+            (root / "ep_exit.py").write_text("raise SystemExit(2)\n", encoding="utf-8")
+            (root / "ep_crash.py").write_text("import os\nos._exit(3)\n", encoding="utf-8")
+            targets = [
+                {"name": "good", "module": "ep_good", "attr": "main"},
+                {"name": "nested", "module": "ep_good", "attr": "Tool.run"},
+                {"name": "noattr", "module": "ep_good", "attr": "missing"},
+                {"name": "nomod", "module": "ep_missing_mod", "attr": "main"},
+                {"name": "exit", "module": "ep_exit", "attr": "main"},
+                {"name": "crash", "module": "ep_crash", "attr": "main"},
+                {"name": "after", "module": "ep_good", "attr": "main"},
+            ]
+            env = {"PYTHONPATH": str(root)}
+            with mock.patch.dict(os.environ, env), mock.patch(
+                "env_repair.entry_points.subprocess.run", wraps=__import__("subprocess").run
+            ) as run:
+                results = verify_entry_points(sys.executable, targets)
+            self.assertEqual(run.call_count, 2)
+            status = {r["name"]: r["ok"] for r in results}
+            self.assertEqual(
+                status,
+                {"good": True, "nested": True, "noattr": False, "nomod": False, "exit": False, "crash": False, "after": True},
+            )
+            errors = {r["name"]: r["error"] for r in results}
+            self.assertIn("AttributeError", errors["noattr"])
+            self.assertIn("ModuleNotFoundError", errors["nomod"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import repair, scan
+
+from env_fixtures import touch
+
+
+class TestExtensionAbiScan(unittest.TestCase):
+    def _make_site_packages(self, td):
+        sp = Path(td) / "lib" / "python3.12" / "site-packages"
+        touch(sp / "numpy" / "core" / "_umath.cpython-39-x86_64-linux-gnu.so")
+        touch(sp / "numpy" / "core" / "_umath.cpython-312-x86_64-linux-gnu.so")
+        touch(sp / "numpy" / "core" / "_umath.abi3.so")
+        touch(sp / "numpy" / "__pycache__" / "x.cpython-39-x86_64-linux-gnu.so")
+        touch(sp / "old" / "_speedups.cpython-39-x86_64-linux-gnu.so")
+        touch(sp / "ok" / "_fast.cpython-312-x86_64-linux-gnu.so")
+        touch(sp / "ok" / "libs" / "libvendored.so")
+        touch(sp / "ok-1.0.dist-info" / "weird.cpython-39.so")
+        touch(sp / "_top.cp311-win_amd64.pyd")
+        touch(sp / "_top.cp312-win_amd64.pyd")
+        return sp
+
+    def test_tags(self):
+        self.assertEqual(scan.extension_abi_tag("_a.cpython-312-x86_64-linux-gnu.so"), "cp312")
+        self.assertEqual(scan.extension_abi_tag("_a.cp39-win_amd64.pyd"), "cp39")
+        self.assertEqual(scan.extension_abi_tag("_a.abi3.so"), "abi3")
+        self.assertIsNone(scan.extension_abi_tag("_a.pyd"))
+        self.assertEqual(scan.python_abi_tag_for("/env/lib/python3.12/site-packages"), "cp312")
+
+    def test_recursive_groups_and_stale_modules(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            issues = scan.scan_extension_abi(str(sp), abi_tag=scan.python_abi_tag_for(sp))
+            dups = {i["base"]: i["files"] for i in issues if i["type"] == "duplicate-pyd"}
+            self.assertEqual(
+                dups,
+                {
+                    "_top": ["_top.cp311-win_amd64.pyd", "_top.cp312-win_amd64.pyd"],
+                    "numpy/core/_umath": [
+                        "numpy/core/_umath.abi3.so",
+                        "numpy/core/_umath.cpython-312-x86_64-linux-gnu.so",
+                        "numpy/core/_umath.cpython-39-x86_64-linux-gnu.so",
+                    ],
+                },
+            )
+            stale = [i for i in issues if i["type"] == "stale-extension-abi"]
+            self.assertEqual(stale[0]["files"], ["old/_speedups.cpython-39-x86_64-linux-gnu.so"])
+
+    def test_cleanup_removes_only_stale_cpython_builds(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            issues = scan.scan_extension_abi(str(sp), abi_tag="cp312")
+            env = {"python": "python", "issues": list(issues)}
+            with mock.patch.object(repair, "_python_abi_tag") as spawn:
+                fixes = repair._cleanup_duplicate_pyd(env, False)
+            spawn.assert_not_called()
+            self.assertTrue(all(f["fixed"] for f in fixes))
+            core = sorted(p.name for p in (sp / "numpy" / "core").iterdir())
+            self.assertEqual(core, ["_umath.abi3.so", "_umath.cpython-312-x86_64-linux-gnu.so"])
+            self.assertFalse((sp / "_top.cp311-win_amd64.pyd").exists())
+            self.assertEqual([i["type"] for i in env["issues"]], ["stale-extension-abi"])
+
+
+if __name__ == "__main__":
+    unittest.main()
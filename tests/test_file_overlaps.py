@@ -0,0 +1,59 @@
+import argparse
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, doctor
+from env_repair.ownership import find_file_overlaps, scan_file_overlaps
+
+from env_fixtures import sp_rel, touch, write_record
+
+
+def _make_env(td):
+    env = Path(td)
+    sp = env / sp_rel()
+    write_record(env / "conda-meta", "openssl", files=["lib/libssl.so.3", "bin/openssl"])
+    write_record(env / "conda-meta", "openssl-compat", files=["lib/libssl.so.3"])
+    # conda-installed python package: its RECORD must not count as a second owner.
+    write_record(env / "conda-meta", "six", files=[f"{sp_rel()}/six.py", f"{sp_rel()}/six-1.16.0.dist-info/RECORD"])
+    touch(sp / "six-1.16.0.dist-info" / "RECORD", b"six.py,,\nsix-1.16.0.dist-info/RECORD,,\n")
+    # pip dist overwriting a conda file
+    write_record(env / "conda-meta", "certifi", files=[f"{sp_rel()}/certifi/cacert.pem"])
+    touch(sp / "certifi_fork-1.0.dist-info" / "RECORD", b"certifi/cacert.pem,,\ncertifi_fork-1.0.dist-info/RECORD,,\n")
+    return env, sp
+
+
+class TestFileOverlaps(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_finds_conda_and_pip_overlaps(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, sp = _make_env(td)
+            overlaps = {o["relpath"]: o["owners"] for o in find_file_overlaps(str(env), [str(sp)])}
+            self.assertEqual(sorted(overlaps), sorted([f"{sp_rel()}/certifi/cacert.pem", "lib/libssl.so.3"]))
+            self.assertEqual([o["name"] for o in overlaps["lib/libssl.so.3"]], ["openssl", "openssl-compat"])
+            self.assertEqual(
+                [(o["kind"], o.get("name") or o.get("dist")) for o in overlaps[f"{sp_rel()}/certifi/cacert.pem"]],
+                [("conda", "certifi"), ("pip", "certifi_fork-1.0.dist-info")],
+            )
+            issue = scan_file_overlaps(str(env), [str(sp)])[0]
+            self.assertEqual(issue["count"], 2)
+            self.assertIn("openssl-compat", issue["packages"])
+
+    def test_diagnose_clobber_without_logfile(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, _sp = _make_env(td)
+            args = argparse.Namespace(env=str(env), logfile=None, json=True, debug=False)
+            with mock.patch.object(doctor, "discover_envs", return_value=([str(env)], str(env), None)):
+                result = doctor.diagnose_clobber(args)
+            self.assertEqual(result["exit_code"], 1)
+            report = result["report"][0]
+            self.assertEqual(report["mode"], "proactive")
+            relpaths = [c["relpath"] for c in report["conflicts"]]
+            self.assertIn("lib/libssl.so.3", relpaths)
+
+
+if __name__ == "__main__":
+    unittest.main()
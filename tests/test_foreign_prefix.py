@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, repair
+from env_repair.relocation import read_shebang_interpreter, scan_foreign_prefix
+
+from env_fixtures import touch
+
+
+@unittest.skipIf(os.name == "nt", "POSIX script layout")
+class TestForeignPrefix(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def _make_moved_env(self, td):
+        env = Path(td) / "env"
+        old = "/opt/old/envs/demo"
+        sp = env / "lib" / "python3.12" / "site-packages"
+        touch(env / "bin" / "tool", f"#!{old}/bin/python3.12\nimport demo\n")
+        touch(env / "bin" / "fresh", f"#!{env}/bin/python3.12\nimport demo\n")
+        touch(env / "bin" / "shell", "#!/bin/sh\necho hi\n")
+        touch(env / "lib" / "pkgconfig" / "demo.pc", f"prefix={env}\n")
+        touch(env / "etc" / "demo.conf", f"data={old}/share/demo\n")
+        touch(env / "bin" / "piptool", f"#!{old}/bin/python3.12\nimport piptool\n")
+        dist = sp / "piptool-1.0.dist-info"
+        touch(dist / "METADATA", "Metadata-Version: 2.1\nName: piptool\nVersion: 1.0\n")
+        touch(dist / "RECORD", "../../../bin/piptool,,\npiptool-1.0.dist-info/METADATA,,\n")
+        placeholder = {"prefix_placeholder": "/opt/placehold", "file_mode": "text", "path_type": "hardlink"}
+        record = {
+            "name": "demo",
+            "version": "1.0",
+            "build": "h0_0",
+            "depends": [],
+            "files": ["bin/tool", "bin/fresh", "lib/pkgconfig/demo.pc", "etc/demo.conf"],
+            "paths_data": {
+                "paths_version": 1,
+                "paths": [
+                    {"_path": "bin/tool", **placeholder},
+                    {"_path": "bin/fresh", **placeholder},
+                    {"_path": "lib/pkgconfig/demo.pc", **placeholder},
+                    {"_path": "etc/demo.conf", **placeholder},
+                ],
+            },
+        }
+        touch(env / "conda-meta" / "demo-1.0-h0_0.json", json.dumps(record, indent=2))
+        return env, sp, old
+
+    def test_reports_unrelocated_files_per_owner(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, sp, old = self._make_moved_env(td)
+            issues = scan_foreign_prefix(str(env), [str(sp)])
+            by_pkg = {i["package"]: i for i in issues}
+            self.assertEqual(sorted(by_pkg), ["demo", "piptool"])
+            self.assertEqual(by_pkg["demo"]["kind"], "conda")
+            self.assertEqual(by_pkg["demo"]["build"], "h0_0")
+            self.assertEqual(by_pkg["demo"]["files"], ["bin/tool", "etc/demo.conf"])
+            self.assertEqual(by_pkg["demo"]["prefixes"], [old])
+            self.assertEqual(by_pkg["piptool"]["kind"], "pip")
+            self.assertEqual(by_pkg["piptool"]["files"], ["bin/piptool"])
+
+    def test_fix_reinstalls_only_conda_owners(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, sp, _old = self._make_moved_env(td)
+            issues = scan_foreign_prefix(str(env), [str(sp)])
+            state = {"path": str(env), "issues": list(issues)}
+            with mock.patch.object(repair, "conda_install", return_value=True) as install:
+                fixes = repair._fix_damaged_conda_files(state, "mamba", [], False, False)
+            self.assertEqual(install.call_args[0][1], ["demo=1.0=h0_0"])
+            self.assertTrue(fixes[0]["fixed"])
+            self.assertEqual([i["package"] for i in state["issues"]], ["piptool"])
+
+    def test_system_interpreter_is_not_a_foreign_prefix(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = Path(td) / "env"
+            touch(env / "bin" / "sysscript", "#!/usr/bin/python3\nimport sys\n")
+            touch(env / "lib" / "pkgconfig" / "z.pc", f"prefix={env}\nlibdir=/usr/lib\n")
+            placeholder = {"_path": "lib/pkgconfig/z.pc", "prefix_placeholder": "/opt/placehold", "file_mode": "text"}
+            touch(
+                env / "conda-meta" / "zlib-1.3-h0_0.json",
+                json.dumps(
+                    {
+                        "name": "zlib",
+                        "version": "1.3",
+                        "build": "h0_0",
+                        "files": ["lib/pkgconfig/z.pc"],
+                        "paths_data": {"paths_version": 1, "paths": [placeholder]},
+                    }
+                ),
+            )
+            self.assertEqual(scan_foreign_prefix(str(env), []), [])
+
+    def test_long_prefix_shebang(self):
+        with tempfile.TemporaryDirectory() as td:
+            script = Path(td) / "s"
+            script.write_text("#!/bin/sh\n'''exec' \"/very/long/prefix/bin/python\" \"$0\" \"$@\"\n' '''\n", encoding="utf-8")
+            self.assertEqual(read_shebang_interpreter(script), "/very/long/prefix/bin/python")
+
+
+if __name__ == "__main__":
+    unittest.main()
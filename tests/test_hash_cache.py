@@ -0,0 +1,86 @@
+import concurrent.futures
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import hashing
+from env_repair.cache import load_json_cache, save_json_cache
+
+
+class TestHashCache(unittest.TestCase):
+    def _files(self, td, count, *, age=60):
+        paths = []
+        past = time.time() - age
+        for i in range(count):
+            p = Path(td) / f"lib{i}.so"
+            p.write_bytes(b"payload-%d" % i)
+            os.utime(p, (past, past))
+            paths.append(str(p))
+        return paths
+
+    def test_second_run_reads_no_files(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache:
+            paths = self._files(td, 5)
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": cache}):
+                first = hashing.hash_files(paths)
+                self.assertFalse(hashing.hash_cache_path().exists())  # written once per run
+                self.assertTrue(hashing.save_hash_cache())
+                self.assertTrue(hashing.hash_cache_path().exists())
+                hashing._cache = None  # force a reload from disk
+                with mock.patch.object(hashing, "sha256_file") as sha:
+                    second = hashing.hash_files(paths)
+                sha.assert_not_called()
+            self.assertEqual(first, second)
+            self.assertEqual(first[paths[2]], hashlib.sha256(b"payload-2").hexdigest())
+
+    def test_modified_file_is_rehashed(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache:
+            paths = self._files(td, 1)
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": cache}):
+                hashing.hash_files(paths)
+                Path(paths[0]).write_bytes(b"changed content")
+                digest = hashing.hash_files(paths)[paths[0]]
+            self.assertEqual(digest, hashlib.sha256(b"changed content").hexdigest())
+
+    def test_recently_modified_files_are_not_cached(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache:
+            paths = self._files(td, 2, age=0)
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": cache}):
+                hashing.hash_files(paths)
+                hashing.save_hash_cache()
+                self.assertFalse(hashing.hash_cache_path().exists())
+
+    def test_files_without_inode_are_not_cached(self):
+        real_stat = os.stat
+
+        def stat_without_inode(path, *args, **kwargs):
+            st = list(real_stat(path, *args, **kwargs))
+            st[1] = 0  # st_ino
+            return os.stat_result(st)
+
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache:
+            paths = self._files(td, 1)
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_CACHE_DIR": cache}), mock.patch(
+                "env_repair.hashing.os.stat", stat_without_inode
+            ):
+                digest = hashing.hash_files(paths)[paths[0]]
+                hashing.save_hash_cache()
+                self.assertFalse(hashing.hash_cache_path().exists())
+            self.assertEqual(digest, hashlib.sha256(b"payload-0").hexdigest())
+
+    def test_concurrent_cache_writes_use_distinct_temp_files(self):
+        with tempfile.TemporaryDirectory() as cache:
+            path = Path(cache) / "x.json"
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as ex:
+                ok = list(ex.map(lambda i: save_json_cache(path, {"i": i}, version=1), range(32)))
+            self.assertTrue(all(ok))
+            self.assertIn(load_json_cache(path, version=1)["i"], range(32))
+            self.assertEqual([p.name for p in Path(cache).iterdir()], ["x.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta
+from env_repair.conda_ops import list_revisions
+from env_repair.history import parse_dist, parse_history, plan_rollback, write_explicit_file
+
+from env_fixtures import write_record
+
+HISTORY = """\
+==> 2024-01-01 10:00:00 <==
+# cmd: conda create -p /envs/x python
+python-3.11.0-h0_0
+openssl-3.0.0-h0_0
+
+==> 2024-02-01 10:00:00 <==
+# cmd: conda install requests
+# conda version: 24.1.0
++defaults/linux-64::requests-2.31.0-py311_0
++conda-forge::idna-3.4-pyhd8ed1ab_0
+
+==> 2024-03-01 10:00:00 <==
+# cmd: conda update openssl
+-openssl-3.0.0-h0_0
++defaults::openssl-3.0.13-h1_0
+-defaults::idna-3.4-pyhd8ed1ab_0
+# update specs: ["openssl"]
+"""
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def _make_env(self, td):
+        env = Path(td) / "env"
+        cm = env / "conda-meta"
+        cm.mkdir(parents=True)
+        (cm / "history").write_text(HISTORY, encoding="utf-8")
+        write_record(cm, "python", "3.11.0", "h0_0")
+        write_record(cm, "openssl", "3.0.13", "h1_0")
+        write_record(cm, "requests", "2.31.0", "py311_0")
+        return env
+
+    def test_parse_dist(self):
+        self.assertEqual(
+            parse_dist("conda-forge/linux-64::ca-certificates-2024.2.2-hbcca054_0"),
+            {
+                "channel": "conda-forge/linux-64",
+                "name": "ca-certificates",
+                "version": "2024.2.2",
+                "build": "hbcca054_0",
+                "dist": "ca-certificates-2024.2.2-hbcca054_0",
+            },
+        )
+        self.assertIsNone(parse_dist("garbage"))
+
+    def test_revision_model(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = self._make_env(td)
+            revisions = parse_history(env)
+            self.assertEqual([r["rev"] for r in revisions], [0, 1, 2])
+            self.assertEqual(revisions[1]["cmd"], "conda install requests")
+            self.assertEqual(sorted(revisions[0]["state"]), ["openssl", "python"])
+            self.assertEqual(sorted(revisions[1]["state"]), ["idna", "openssl", "python", "requests"])
+            state = revisions[2]["state"]
+            self.assertEqual(sorted(state), ["openssl", "python", "requests"])
+            self.assertEqual(state["openssl"]["version"], "3.0.13")
+            with mock.patch("env_repair.conda_ops.shutil.which", side_effect=AssertionError("no CLI")):
+                self.assertEqual(list_revisions(str(env)), [0, 1, 2])
+
+    def test_plan_rollback_uses_cache(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = self._make_env(td)
+            pkgs = Path(td) / "pkgs"
+            info = pkgs / "openssl-3.0.0-h0_0" / "info"
+            info.mkdir(parents=True)
+            (info / "repodata_record.json").write_text(
+                json.dumps({"url": "https://repo.example/linux-64/openssl-3.0.0-h0_0.conda", "md5": "abc"}),
+                encoding="utf-8",
+            )
+
+            plan = plan_rollback(env, 0, [str(pkgs)])
+            self.assertEqual([i["dist"] for i in plan["install"]], ["openssl-3.0.0-h0_0"])
+            self.assertEqual(plan["remove"], ["requests"])
+            self.assertTrue(plan["explicit"])
+            path = write_explicit_file(Path(td) / "out" / "explicit.txt", plan["install"])
+            self.assertEqual(
+                path.read_text(encoding="utf-8").splitlines(),
+                ["@EXPLICIT", "https://repo.example/linux-64/openssl-3.0.0-h0_0.conda#abc"],
+            )
+
+            plan = plan_rollback(env, 1, [str(pkgs)])
+            self.assertEqual(plan["unfetchable"], ["idna-3.4-pyhd8ed1ab_0"])
+            self.assertFalse(plan["explicit"])
+
+
+if __name__ == "__main__":
+    unittest.main()
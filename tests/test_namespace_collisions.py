@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from env_repair import conda_meta
+from env_repair.ownership import build_module_index, scan_namespace_collisions
+
+from env_fixtures import touch, write_record
+
+
+class TestNamespaceCollisions(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def _make_env(self, td):
+        env = Path(td)
+        sp_rel = "Lib/site-packages" if os.name == "nt" else "lib/python3.12/site-packages"
+        sp = env / sp_rel
+
+        def conda_pkg(name, files):
+            for f in files:
+                touch(env / f, "")
+            write_record(env / "conda-meta", name, files=files)
+
+        def pip_dist(name, files):
+            dist = f"{name}-1.0.dist-info"
+            for f in files:
+                touch(sp / f, "")
+            touch(sp / dist / "METADATA", f"Name: {name}\nVersion: 1.0\n")
+            touch(sp / dist / "RECORD", "".join(f"{f},,\n" for f in files + [f"{dist}/METADATA"]))
+
+        conda_pkg("six", [f"{sp_rel}/six.py", f"{sp_rel}/six-1.0.dist-info/METADATA"])
+        conda_pkg("jedi", [f"{sp_rel}/jedi/__init__.py", f"{sp_rel}/jedi/common.py"])
+        conda_pkg("nsa", [f"{sp_rel}/google/a/__init__.py"])
+        # pip copy of a conda-managed dist (its dist-info is conda-owned) is not a collision
+        touch(sp / "six-1.0.dist-info" / "RECORD", "six.py,,\n")
+        pip_dist("vendor", ["six.py", "vendor/__init__.py", "tests/__init__.py"])
+        pip_dist("other", ["tests/__init__.py", "other.py"])
+        pip_dist("jedi_fork", ["jedi/common/__init__.py"])
+        pip_dist("nsb", ["google/b/__init__.py"])
+        return env, sp
+
+    def test_module_index(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, sp = self._make_env(td)
+            index = build_module_index(str(env), [str(sp)])
+            names = {name for _sp, name in index}
+            self.assertTrue({"six", "jedi", "google", "tests", "vendor", "other"} <= names)
+
+    def test_collisions(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, sp = self._make_env(td)
+            issues = scan_namespace_collisions(str(env), [str(sp)])
+            self.assertEqual(len(issues), 1)
+            found = {(c["name"], c["kind"]): c["owners"] for c in issues[0]["collisions"]}
+            self.assertEqual(
+                found,
+                {
+                    ("jedi.common", "shadow"): ["conda:jedi", "pip:jedi_fork"],
+                    ("six", "duplicate"): ["conda:six", "pip:vendor"],
+                    ("tests", "duplicate"): ["pip:other", "pip:vendor"],
+                },
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
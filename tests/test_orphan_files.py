@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from env_repair import conda_meta
+from env_repair.ownership import scan_orphan_files
+
+from env_fixtures import sp_rel, touch, write_record
+
+
+class TestOrphanFiles(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_reports_files_owned_by_nobody(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = Path(td)
+            sp = env / sp_rel()
+            write_record(env / "conda-meta", "libfoo", files=["lib/libfoo.so", f"{sp_rel()}/foo/__init__.py"])
+            touch(env / "conda-meta" / "history")
+            touch(env / "lib" / "libfoo.so")
+            touch(sp / "foo" / "__init__.py")
+            touch(sp / "foo" / "__pycache__" / "__init__.cpython-311.pyc")
+
+            dist = sp / "bar-2.0.dist-info"
+            touch(dist / "RECORD", b"bar/__init__.py,sha256=abc,1\nbar-2.0.dist-info/RECORD,,\n../../../bin/bar,sha256=def,2\n")
+            touch(sp / "bar" / "__init__.py")
+            touch(env / "bin" / "bar")
+
+            touch(env / "lib" / "libstale.so.1", b"stale" * 10)
+            touch(sp / "leftover.pth")
+            touch(env / "pkgs" / "cache" / "x.conda")
+            touch(env / ".condarc")
+
+            issues = scan_orphan_files(str(env), [str(sp)])
+            self.assertEqual(len(issues), 1)
+            issue = issues[0]
+            self.assertEqual(issue["type"], "orphan-files")
+            self.assertEqual([f["path"] for f in issue["files"]], ["lib/libstale.so.1", f"{sp_rel()}/leftover.pth"])
+            self.assertEqual(issue["total_bytes"], 51)
+
+    def test_no_conda_meta_is_skipped(self):
+        with tempfile.TemporaryDirectory() as td:
+            touch(Path(td) / "bin" / "python")
+            self.assertEqual(scan_orphan_files(td, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
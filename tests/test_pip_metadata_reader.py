@@ -0,0 +1,128 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import pip_ops
+from env_repair.dist_meta import freeze_line, read_installed_dists
+
+
+def _make_venv(td):
+    env = Path(td)
+    if os.name == "nt":
+        py = env / "Scripts" / "python.exe"
+        sp = env / "Lib" / "site-packages"
+    else:
+        py = env / "bin" / "python"
+        sp = env / "lib" / "python3.12" / "site-packages"
+    py.parent.mkdir(parents=True, exist_ok=True)
+    py.write_bytes(b"")
+    sp.mkdir(parents=True, exist_ok=True)
+    (env / "pyvenv.cfg").write_text("include-system-site-packages = false\n", encoding="utf-8")
+
+    def dist(dirname, name, version, *, installer="pip", direct_url=None):
+        d = sp / dirname
+        d.mkdir()
+        (d / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nlong body\n", encoding="utf-8")
+        (d / "INSTALLER").write_text(installer + "\n", encoding="utf-8")
+        if direct_url is not None:
+            (d / "direct_url.json").write_text(json.dumps(direct_url), encoding="utf-8")
+
+    dist("six-1.16.0.dist-info", "six", "1.16.0")
+    dist("pip-24.0.dist-info", "pip", "24.0")
+    dist("Local_Pkg-0.1.dist-info", "Local-Pkg", "0.1", direct_url={"url": "file:///tmp/local_pkg-0.1-py3-none-any.whl", "archive_info": {}})
+    dist("mylib-2.0.dist-info", "mylib", "2.0", direct_url={"url": "file:///src/mylib", "dir_info": {"editable": True}})
+    dist(
+        "gitpkg-1.0.dist-info",
+        "gitpkg",
+        "1.0",
+        direct_url={"url": "https://github.com/o/gitpkg.git", "vcs_info": {"vcs": "git", "commit_id": "abc123"}},
+    )
+    return env, str(py), sp
+
+
+class TestPipMetadataReader(unittest.TestCase):
+    def test_read_installed_dists(self):
+        with tempfile.TemporaryDirectory() as td:
+            _env, _py, sp = _make_venv(td)
+            dists = read_installed_dists([str(sp)])
+            names = [d["name"] for d in dists]
+            self.assertEqual(names, ["gitpkg", "Local-Pkg", "mylib", "pip", "six"])
+            self.assertEqual({d["installer"] for d in dists}, {"pip"})
+
+    def test_freeze_line_formats(self):
+        self.assertEqual(freeze_line({"name": "six", "version": "1.16.0"}), "six==1.16.0")
+        self.assertEqual(
+            freeze_line({"name": "x", "version": "1", "direct_url": {"url": "file:///src/x", "dir_info": {"editable": True}}}),
+            "-e file:///src/x",
+        )
+        self.assertEqual(
+            freeze_line(
+                {"name": "g", "version": "1", "direct_url": {"url": "https://h/g.git", "vcs_info": {"vcs": "git", "commit_id": "c1"}}}
+            ),
+            "g @ git+https://h/g.git@c1",
+        )
+
+    def test_pip_ops_use_metadata_without_subprocess(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, py, _sp = _make_venv(td)
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_PACKAGE_LIST": "native"}):
+                with mock.patch("env_repair.pip_ops.subprocess.run") as run:
+                    listed = pip_ops.pip_list_json(py)
+                    version = pip_ops.pip_get_version(py, "SIX")
+                    missing = pip_ops.pip_get_version(py, "numpy")
+                    out = env / "snap" / "requirements.txt"
+                    self.assertTrue(pip_ops.pip_freeze(py, out))
+                run.assert_not_called()
+            self.assertIn({"name": "six", "version": "1.16.0", "channel": "pypi"}, listed)
+            self.assertEqual(version, "1.16.0")
+            self.assertIsNone(missing)
+            lines = out.read_text(encoding="utf-8").splitlines()
+            self.assertIn("six==1.16.0", lines)
+            self.assertIn("Local-Pkg @ file:///tmp/local_pkg-0.1-py3-none-any.whl", lines)
+            self.assertNotIn("pip==24.0", lines)
+
+    def test_system_site_packages_venv_falls_back_to_pip(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, py, _sp = _make_venv(td)
+            (env / "pyvenv.cfg").write_text("include-system-site-packages = true\n", encoding="utf-8")
+            fake = mock.Mock(returncode=0, stdout='[{"name": "six", "version": "1.16.0"}]')
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_PACKAGE_LIST": "native"}):
+                with mock.patch("env_repair.pip_ops.subprocess.run", return_value=fake) as run:
+                    listed = pip_ops.pip_list_json(py)
+            run.assert_called_once()
+            self.assertEqual(listed, [{"name": "six", "version": "1.16.0", "channel": "pypi"}])
+
+    def test_freeze_verify_mode_runs_pip_and_reports_differences(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, py, _sp = _make_venv(td)
+            fake = mock.Mock(returncode=0, stdout="six==1.16.0\nextra==1.0\n")
+            out = env / "snap" / "requirements.txt"
+            err = io.StringIO()
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_PACKAGE_LIST": "verify"}):
+                with mock.patch("env_repair.pip_ops.subprocess.run", return_value=fake) as run, contextlib.redirect_stderr(err):
+                    self.assertTrue(pip_ops.pip_freeze(py, out))
+            run.assert_called_once()
+            self.assertEqual(out.read_text(encoding="utf-8"), "six==1.16.0\nextra==1.0\n")
+            self.assertIn("cli only: extra==1.0", err.getvalue())
+            self.assertIn("native only: -e file:///src/mylib", err.getvalue())
+
+    def test_egg_link_develop_install_falls_back_to_pip(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, py, sp = _make_venv(td)
+            (sp / "devpkg.egg-link").write_text(f"{env / 'src' / 'devpkg'}\n.\n", encoding="utf-8")
+            fake = mock.Mock(returncode=0, stdout="-e /src/devpkg\nsix==1.16.0\n")
+            out = env / "snap" / "requirements.txt"
+            with mock.patch.dict(os.environ, {"ENV_REPAIR_PACKAGE_LIST": "native"}):
+                with mock.patch("env_repair.pip_ops.subprocess.run", return_value=fake) as run:
+                    self.assertTrue(pip_ops.pip_freeze(py, out))
+            run.assert_called_once()
+            self.assertIn("-e /src/devpkg", out.read_text(encoding="utf-8").splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
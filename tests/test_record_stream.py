@@ -0,0 +1,95 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, record_stream
+from env_repair.record_stream import iter_record_files, iter_record_paths_data, read_record_header
+
+RECORD = {
+    "build": "h1_0",
+    "depends": ["python >=3.11"],
+    "files": ["bin/qmake", "lib/libQt6Core.so.6", "share/naïve \"quoted\".txt"],
+    "name": "qt",
+    "paths_data": {
+        "paths": [
+            {"_path": "bin/qmake", "path_type": "hardlink", "sha256": "ab", "size_in_bytes": 3},
+            {"_path": "lib/libQt6Core.so.6", "path_type": "softlink", "size_in_bytes": 0},
+        ],
+        "paths_version": 1,
+    },
+    "version": "6.7.0",
+}
+
+
+class TestRecordStream(unittest.TestCase):
+    def test_layouts_match_json_loads(self):
+        for text in (
+            json.dumps(RECORD, indent=2, sort_keys=True),
+            json.dumps(RECORD, indent=2).replace("\n", "\r\n"),
+            json.dumps(RECORD),
+            json.dumps(RECORD, indent=4),
+        ):
+            for chunk in (1, 7, 1 << 20):
+                with mock.patch.object(record_stream, "CHUNK_CHARS", chunk):
+                    header, keys = read_record_header(io.StringIO(text))
+                    self.assertEqual(keys, list(json.loads(text)))
+                    self.assertEqual(header, {k: v for k, v in RECORD.items() if k not in ("files", "paths_data")})
+                    self.assertEqual(list(iter_record_files(io.StringIO(text))), RECORD["files"])
+                    self.assertEqual(list(iter_record_paths_data(io.StringIO(text))), RECORD["paths_data"]["paths"])
+
+    def test_malformed_records_raise(self):
+        for text in (
+            '{"name": "x"',
+            '{"name": "x"} trailing',
+            '["not", "an object"]',
+            '{"files": [1, 2}',
+            # Skipped (never materialized) values are validated too.
+            '{"name": "x", "paths_data": {"paths": [{"_path": "a" "size": 1}]}}',
+            '{"name": "x", "files": ["a\\qb"]}',
+        ):
+            with self.assertRaises(ValueError):
+                read_record_header(io.StringIO(text))
+
+    def test_missing_keys(self):
+        text = json.dumps({"name": "x"}, indent=2)
+        self.assertEqual(list(iter_record_files(io.StringIO(text))), [])
+        self.assertEqual(list(iter_record_paths_data(io.StringIO(text))), [])
+
+    def test_index_streams_large_records(self):
+        conda_meta.clear_index_cache()
+        with tempfile.TemporaryDirectory() as td:
+            cm = Path(td) / "conda-meta"
+            cm.mkdir()
+            (cm / "qt-6.7.0-h1_0.json").write_text(json.dumps(RECORD, indent=2, sort_keys=True), encoding="utf-8")
+            with mock.patch.object(conda_meta, "STREAM_MIN_BYTES", 0), mock.patch(
+                "env_repair.conda_meta.json.loads"
+            ) as loads:
+                index = conda_meta.load_conda_meta_index(td)
+            loads.assert_not_called()
+            rec = index["records"][0]
+            self.assertTrue(rec["valid"])
+            self.assertIsNone(rec["files"])
+            self.assertEqual(list(conda_meta.record_files(rec)), RECORD["files"])
+            self.assertEqual(conda_meta.file_owner(index, "bin/qmake"), rec)
+            self.assertNotIn("paths_data", rec["meta"])
+            self.assertIn("paths_data", rec["keys"])
+
+    def test_index_memo_is_bounded(self):
+        conda_meta.clear_index_cache()
+        with tempfile.TemporaryDirectory() as td:
+            envs = []
+            for i in range(conda_meta._INDEX_MEMO_MAX + 2):
+                cm = Path(td) / f"env{i}" / "conda-meta"
+                cm.mkdir(parents=True)
+                (cm / "x-1-0.json").write_text(json.dumps({"name": "x", "depends": []}), encoding="utf-8")
+                envs.append(cm.parent)
+                conda_meta.load_conda_meta_index(cm.parent)
+            self.assertEqual(len(conda_meta._INDEX_MEMO), conda_meta._INDEX_MEMO_MAX)
+            self.assertNotIn(str(envs[0].resolve()), conda_meta._INDEX_MEMO)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from env_repair.dependencies import (
+    evaluate_marker,
+    parse_requirement,
+    parse_specifier_set,
+    parse_version,
+    scan_requirements,
+    version_satisfies,
+)
+
+from env_fixtures import write_dist
+
+
+ENV = {
+    "python_version": "3.11",
+    "python_full_version": "3.11.7",
+    "os_name": "posix",
+    "sys_platform": "linux",
+    "platform_system": "Linux",
+    "platform_machine": "x86_64",
+    "implementation_name": "cpython",
+    "extra": "",
+}
+
+
+class TestRequirementsCheck(unittest.TestCase):
+    def test_version_ordering(self):
+        order = ["1.0.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0+local", "1.0.post1", "1.1", "1!0.5"]
+        keys = [parse_version(v)["key"] for v in order]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(parse_version("1.0")["key"], parse_version("1.0.0")["key"])
+        self.assertIsNone(parse_version("not-a-version"))
+
+    def test_specifiers(self):
+        def ok(version, spec):
+            return version_satisfies(version, parse_specifier_set(spec))
+
+        self.assertTrue(ok("2.31.0", ">=2.0,<3"))
+        self.assertFalse(ok("3.0", ">=2.0,<3"))
+        self.assertTrue(ok("1.4.2", "~=1.4"))
+        self.assertFalse(ok("2.0", "~=1.4"))
+        self.assertTrue(ok("1.4.9", "==1.4.*"))
+        self.assertFalse(ok("1.4.9", "!=1.4.*"))
+        self.assertTrue(ok("1.0+cu121", "==1.0"))
+        self.assertFalse(ok("3.0rc1", "<3.0"))
+        self.assertFalse(ok("1.0.post1", ">1.0"))
+        self.assertTrue(ok("1.0b1", ">=0.9"))
+        self.assertIsNone(ok("weird", ">=1"))
+
+    def test_markers(self):
+        self.assertTrue(evaluate_marker('python_version >= "3.8" and sys_platform == "linux"', ENV))
+        self.assertFalse(evaluate_marker('python_version < "3.10" or os_name == "nt"', ENV))
+        self.assertTrue(evaluate_marker('(platform_system == "Windows" or "linux" in sys_platform)', ENV))
+        self.assertFalse(evaluate_marker('extra == "test"', ENV))
+        self.assertTrue(evaluate_marker('extra == "Foo_Bar"', {**ENV, "extra": "foo-bar"}))
+        self.assertTrue(evaluate_marker("platform_machine not in 'arm64 aarch64'", ENV))
+        with self.assertRaises(ValueError):
+            evaluate_marker('python_version >= ', ENV)
+
+    def test_parse_requirement(self):
+        req = parse_requirement('Requests[socks, security] (>=2.0,<3) ; python_version >= "3.8"')
+        self.assertEqual(req["name"], "Requests")
+        self.assertEqual(req["extras"], ["socks", "security"])
+        self.assertEqual(req["specifier"], [(">=", "2.0"), ("<", "3")])
+        self.assertEqual(req["marker"], 'python_version >= "3.8"')
+        req = parse_requirement("pkg @ https://example.org/pkg.whl ; os_name == 'nt'")
+        self.assertEqual(req["url"], "https://example.org/pkg.whl")
+        self.assertEqual(req["marker"], "os_name == 'nt'")
+
+    def test_scan_reports_missing_and_conflicts(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = Path(td) / "lib" / "python3.11" / "site-packages"
+            sp.mkdir(parents=True)
+            write_dist(
+                sp,
+                "app",
+                "1.0",
+                body="body",
+                requires=[
+                    "lib_a>=2",
+                    "lib-b",
+                    "missing-dep",
+                    'winonly; sys_platform == "win32" and python_version < "3"',
+                    'testdep; extra == "test"',
+                ],
+            )
+            write_dist(sp, "lib_a", "1.5", body="body")
+            write_dist(sp, "Lib_B", "0.1", body="body")
+            egg = sp / "old-2.0.egg-info"
+            egg.mkdir()
+            (egg / "PKG-INFO").write_text("Name: old\nVersion: 2.0\n", encoding="utf-8")
+            (egg / "requires.txt").write_text("lib_a<2\n\n[docs]\nsphinx\n", encoding="utf-8")
+
+            issues = scan_requirements(td, [str(sp)])
+            self.assertEqual(len(issues), 1)
+            issue = issues[0]
+            self.assertEqual(issue["type"], "unmet-requirements")
+            self.assertEqual([m["dependency"] for m in issue["missing"]], ["missing-dep"])
+            self.assertEqual([(c["package"], c["dependency"], c["installed"]) for c in issue["conflicts"]], [("app", "lib_a", "1.5")])
+            self.assertEqual(issue["packages"], ["app"])
+
+
+if __name__ == "__main__":
+    unittest.main()
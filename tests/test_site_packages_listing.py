@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import doctor, scan
+
+
+class TestSitePackagesListing(unittest.TestCase):
+    def _make_site_packages(self, td):
+        sp = Path(td) / "site-packages"
+        sp.mkdir()
+        (sp / "six-1.15.0.dist-info").mkdir()
+        (sp / "six-1.16.0.dist-info").mkdir()
+        (sp / "stray-1.0.dist-info").write_text("", encoding="utf-8")
+        (sp / "_foo.cp311-win_amd64.pyd").write_bytes(b"")
+        (sp / "_foo.cp312-win_amd64.pyd").write_bytes(b"")
+        (sp / "~umpy").mkdir()
+        (sp / "pkg.conda_trash").write_bytes(b"")
+        return sp
+
+    def test_listing_classifies_entries(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            listing = scan.list_site_packages(sp)
+            self.assertEqual(listing["dist_infos"], ["six-1.15.0.dist-info", "six-1.16.0.dist-info"])
+            self.assertEqual(len(listing["pyd"]), 2)
+            self.assertEqual(listing["artifacts"], ["pkg.conda_trash", "~umpy"])
+            self.assertIn(("~umpy", True), listing["entries"])
+            self.assertIsNone(scan.list_site_packages(sp / "missing"))
+
+    def test_scan_env_lists_each_site_packages_once(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = self._make_site_packages(td)
+            real_scandir = os.scandir
+            calls = []
+
+            def counting_scandir(path):
+                calls.append(str(path))
+                return real_scandir(path)
+
+            with mock.patch.object(doctor, "get_python_exe", return_value="python"), mock.patch.object(
+                doctor, "get_site_packages", return_value=[str(sp)]
+            ), mock.patch.object(doctor, "is_conda_env", return_value=False), mock.patch(
+                "env_repair.scan.os.scandir", side_effect=counting_scandir
+            ):
+                env = doctor.scan_env(td)
+
+            self.assertEqual(calls, [str(sp)])
+            types = sorted(i["type"] for i in env["issues"])
+            self.assertEqual(
+                types,
+                ["duplicate-dist-info", "duplicate-pyd", "invalid-artifact", "invalid-artifact"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
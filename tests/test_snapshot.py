@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta
+from env_repair.doctor import _write_snapshot
+from env_repair.snapshot import export_explicit, export_yaml, load_snapshot, take_snapshot, write_snapshot
+
+from env_fixtures import write_dist, write_record
+
+SP = "lib/python3.11/site-packages"
+URL = "https://conda.anaconda.org/conda-forge/linux-64"
+
+
+def _write_record(cm, name, version, build, depends=(), files=()):
+    write_record(
+        cm,
+        name,
+        version,
+        build,
+        depends=depends,
+        files=files,
+        channel=URL,
+        subdir="linux-64",
+        url=f"{URL}/{name}-{version}-{build}.conda",
+        md5=f"md5-{name}",
+    )
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def _make_env(self, td):
+        env = Path(td) / "env"
+        cm = env / "conda-meta"
+        cm.mkdir(parents=True)
+        _write_record(cm, "zlib", "1.3.1", "h0_0")
+        _write_record(cm, "python", "3.11.7", "h0_cpython", ["zlib >=1.3,<2", "__glibc >=2.17"])
+        _write_record(cm, "numpy", "1.26.4", "py311_0", ["python >=3.11,<3.12.0a0"], [f"{SP}/numpy-1.26.4.dist-info/METADATA"])
+        _write_record(cm, "abseil", "1.0", "h0_0", ["python"])
+        sp = env / SP
+        sp.mkdir(parents=True)
+        write_dist(sp, "numpy", "1.26.4")
+        write_dist(sp, "tiny_pkg", "0.3")
+        return env
+
+    def test_snapshot_and_exporters(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = self._make_env(td)
+            snap = take_snapshot(env)
+            self.assertEqual([r["name"] for r in snap["conda"]], ["zlib", "python", "abseil", "numpy"])
+            self.assertEqual(snap["conda"][0]["channel"], "conda-forge")
+            self.assertEqual(snap["pip"], [{"name": "tiny_pkg", "version": "0.3", "requirement": "tiny_pkg==0.3"}])
+
+            explicit = export_explicit(snap).splitlines()
+            self.assertIn("# platform: linux-64", explicit)
+            self.assertEqual(explicit[explicit.index("@EXPLICIT") + 1], f"{URL}/zlib-1.3.1-h0_0.conda#md5-zlib")
+
+            self.assertEqual(
+                export_yaml(snap, name="copy").splitlines(),
+                [
+                    "name: copy",
+                    "channels:",
+                    "  - conda-forge",
+                    "dependencies:",
+                    "  - abseil=1.0=h0_0",
+                    "  - numpy=1.26.4=py311_0",
+                    "  - python=3.11.7=h0_cpython",
+                    "  - zlib=1.3.1=h0_0",
+                    "  - pip:",
+                    "      - tiny_pkg==0.3",
+                ],
+            )
+
+            path = write_snapshot(Path(td) / "snap" / "snapshot.json", snap)
+            self.assertEqual(load_snapshot(path), snap)
+            self.assertIsNone(take_snapshot(Path(td) / "nope"))
+
+    def test_streamed_records_own_their_dists(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = self._make_env(td)
+            with mock.patch.object(conda_meta, "STREAM_MIN_BYTES", 0):
+                snap = take_snapshot(env)
+            self.assertEqual([d["name"] for d in snap["pip"]], ["tiny_pkg"])
+
+    def test_doctor_snapshot_formats(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = self._make_env(td)
+            self.assertEqual(_write_snapshot(env, Path(td) / "a" / "snapshot.json"), (True, "native"))
+            self.assertEqual(_write_snapshot(env, Path(td) / "b" / "env.yml"), (True, "conda-yaml"))
+            self.assertTrue((Path(td) / "b" / "env.yml").read_text(encoding="utf-8").startswith("name: env\n"))
+            self.assertEqual(_write_snapshot(Path(td) / "nope", Path(td) / "c" / "snapshot.json"), (False, "native"))
+
+
+if __name__ == "__main__":
+    unittest.main()
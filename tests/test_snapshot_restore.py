@@ -0,0 +1,133 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, doctor
+from env_repair.snapshot import plan_pip_restore, take_snapshot, write_snapshot
+
+from env_fixtures import write_dist, write_record
+
+SP = "lib/python3.11/site-packages"
+URL = "https://conda.anaconda.org/conda-forge/linux-64"
+
+
+def _write_record(cm, name, version, build, depends=()):
+    write_record(
+        cm,
+        name,
+        version,
+        build,
+        depends=depends,
+        channel=URL,
+        subdir="linux-64",
+        url=f"{URL}/{name}-{version}-{build}.conda",
+        md5=f"md5-{name}-{version}",
+    )
+
+
+class TestSnapshotRestore(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def test_plan_pip_restore(self):
+        snap = {"pip": [{"name": "A_b", "version": "1", "requirement": "A_b==1"}, {"name": "c", "version": "2", "requirement": "c==2"}]}
+        current = [{"name": "a-b", "version": "1", "requirement": "a-b==1"}, {"name": "c", "version": "3", "requirement": "c==3"}, {"name": "d", "version": "1", "requirement": "d==1"}]
+        self.assertEqual(plan_pip_restore(snap, current), {"install": ["A_b==1", "c==2"], "uninstall": ["d"]})
+
+    def test_restore_replays_explicit_and_pinned_pip(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = Path(td) / "env"
+            cm = env / "conda-meta"
+            cm.mkdir(parents=True)
+            sp = env / SP
+            sp.mkdir(parents=True)
+            _write_record(cm, "python", "3.11.7", "h0_cpython")
+            _write_record(cm, "numpy", "1.26.4", "py311_0", ["python >=3.11"])
+            _write_record(cm, "pandas", "2.2.0", "py311_0", ["numpy >=1.23", "python"])
+            tiny = write_dist(sp, "tiny", "0.3")
+            snap_path = write_snapshot(Path(td) / "snap" / "snapshot.json", take_snapshot(env))
+
+            # The interrupted fix changed numpy/pandas, added a package and touched pip dists.
+            for f in cm.glob("numpy-*.json"):
+                f.unlink()
+            for f in cm.glob("pandas-*.json"):
+                f.unlink()
+            _write_record(cm, "numpy", "2.0.0", "py311_0")
+            _write_record(cm, "pandas", "2.2.2", "py311_0")
+            _write_record(cm, "extra", "1.0", "h0_0")
+            shutil.rmtree(tiny)
+            write_dist(sp, "tiny", "0.4")
+            write_dist(sp, "junk", "1.0")
+            conda_meta.clear_index_cache()
+
+            pkgs = Path(td) / "pkgs"
+            info = pkgs / "pandas-2.2.0-py311_0" / "info"
+            info.mkdir(parents=True)
+            (info / "repodata_record.json").write_text(
+                json.dumps({"url": f"{URL}/pandas-2.2.0-py311_0.conda", "md5": "cached-md5"}), encoding="utf-8"
+            )
+
+            calls = {}
+
+            def fake_explicit(env_path, manager, explicit_file, *, dry_run):
+                calls["explicit"] = Path(explicit_file).read_text(encoding="utf-8").splitlines()
+                return True
+
+            def fake_requirements(python_exe, req_path, *, no_deps=False):
+                calls["pip"] = (Path(req_path).read_text(encoding="utf-8").splitlines(), no_deps)
+                return True
+
+            with mock.patch.object(doctor, "install_explicit", side_effect=fake_explicit), mock.patch.object(
+                doctor, "remove_forced", return_value=True
+            ) as remove, mock.patch.object(doctor, "pip_uninstall", return_value=True) as uninstall, mock.patch.object(
+                doctor, "pip_install_requirements", side_effect=fake_requirements
+            ), mock.patch.object(doctor, "env_update_from_yaml", side_effect=AssertionError("no solver")):
+                result = doctor._restore_native_snapshot(str(env), "conda", "/env/bin/python", snap_path, pkgs_dirs=[str(pkgs)])
+
+            self.assertTrue(result["ok"])
+            self.assertEqual(result["method"], "explicit")
+            self.assertEqual(result["install"], ["numpy-1.26.4-py311_0", "pandas-2.2.0-py311_0"])
+            self.assertEqual(
+                calls["explicit"],
+                ["@EXPLICIT", f"{URL}/numpy-1.26.4-py311_0.conda#md5-numpy-1.26.4", f"{URL}/pandas-2.2.0-py311_0.conda#cached-md5"],
+            )
+            self.assertEqual(remove.call_args[0][2], ["extra"])
+            self.assertEqual(uninstall.call_args[0][1], ["junk"])
+            self.assertEqual(calls["pip"], (["tiny==0.3"], True))
+
+    def test_dry_run_writes_nothing_next_to_the_snapshot(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = Path(td) / "env"
+            cm = env / "conda-meta"
+            cm.mkdir(parents=True)
+            _write_record(cm, "numpy", "1.26.4", "py311_0")
+            snap_path = write_snapshot(Path(td) / "snap" / "snapshot.json", take_snapshot(env))
+            for f in cm.glob("numpy-*.json"):
+                f.unlink()
+            _write_record(cm, "numpy", "2.0.0", "py311_0")
+            conda_meta.clear_index_cache()
+
+            seen = []
+
+            def fake_explicit(env_path, manager, explicit_file, *, dry_run):
+                self.assertTrue(dry_run)
+                seen.append(Path(explicit_file).read_text(encoding="utf-8").splitlines()[1])
+                return True
+
+            with mock.patch.object(doctor, "install_explicit", side_effect=fake_explicit), mock.patch.object(
+                doctor, "env_update_from_yaml", side_effect=AssertionError("dry run")
+            ):
+                for solver in (False, True):
+                    result = doctor._restore_native_snapshot(
+                        str(env), "conda", None, snap_path, pkgs_dirs=[], dry_run=True, solver=solver
+                    )
+                    self.assertTrue(result["ok"])
+            self.assertEqual(seen, [f"{URL}/numpy-1.26.4-py311_0.conda#md5-numpy-1.26.4"])
+            self.assertEqual([p.name for p in snap_path.parent.iterdir()], ["snapshot.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
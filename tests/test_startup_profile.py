@@ -0,0 +1,63 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from env_repair.startup import inspect_pth_files, parse_importtime, profile_startup
+
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _codecs
+import time:       300 |        420 | codecs
+import time:      3561 |       3633 |       typing
+import time:       607 |      38448 |   certifi
+import time:       459 |        459 |   _distutils_hack
+import time:       233 |        233 |   sitecustomize
+import time:      2136 |      50972 | site
+noise printed by a .pth
+"""
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_parse_importtime(self):
+        entries = parse_importtime(IMPORTTIME)
+        self.assertEqual([e["module"] for e in entries], ["_codecs", "codecs", "typing", "certifi", "_distutils_hack", "sitecustomize", "site"])
+        self.assertEqual([e["depth"] for e in entries], [1, 0, 3, 1, 1, 1, 0])
+        self.assertEqual(entries[3]["cumulative_us"], 38448)
+        self.assertEqual(entries[-1]["self_us"], 2136)
+
+    def test_inspect_pth_files(self):
+        with tempfile.TemporaryDirectory() as td:
+            sp = Path(td)
+            (sp / "real").mkdir()
+            (sp / "paths.pth").write_text("# comment\nreal\nmissing-dir\n\n", encoding="utf-8")
+            (sp / "hook.pth").write_text(
+                "import os; var = 'X'; os.environ.get(var) and __import__('_hack').add_shim();\n"
+                "import certifi, json\n",
+                encoding="utf-8",
+            )
+            (sp / "pkg.egg-link").write_text("/src/pkg\n.\n", encoding="utf-8")
+
+            pth, eggs = inspect_pth_files(sp)
+            self.assertEqual(eggs, 1)
+            by_name = {p["file"]: p for p in pth}
+            self.assertEqual(by_name["paths.pth"]["path_lines"], 2)
+            self.assertEqual(by_name["paths.pth"]["missing_paths"], 1)
+            self.assertEqual(by_name["paths.pth"]["code_lines"], 0)
+            self.assertEqual(by_name["hook.pth"]["code_lines"], 2)
+            self.assertEqual(by_name["hook.pth"]["imports"], ["os", "_hack", "certifi", "json"])
+
+    def test_profile_current_interpreter(self):
+        with tempfile.TemporaryDirectory() as td:
+            report = profile_startup(sys.executable, [td], runs=1, top=3)
+        self.assertIsNotNone(report["startup_ms"])
+        self.assertIsNotNone(report["no_site_ms"])
+        self.assertGreaterEqual(report["site_ms"], 0.0)
+        self.assertGreater(report["sys_path_len"], 0)
+        self.assertLessEqual(len(report["top"]), 3)
+        self.assertEqual(report["pth_files"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
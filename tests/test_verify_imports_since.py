@@ -0,0 +1,104 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from env_repair import conda_meta, verify_imports
+from env_repair.changes import changed_packages, parse_timestamp
+from env_repair.cli import main
+
+from env_fixtures import write_dist, write_record
+
+HISTORY = """\
+==> 2024-01-01 10:00:00 <==
+# cmd: conda create -p /envs/x python numpy pandas six
++defaults::python-3.11.0-h0_0
++defaults::numpy-1.26.3-py311_0
++defaults::pandas-2.2.0-py311_0
++defaults::six-1.16.0-py_0
+
+==> 2024-02-01 10:00:00 <==
+# cmd: mamba update numpy idna
+-defaults::numpy-1.26.3-py311_0
++defaults::numpy-1.26.4-py311_0
++defaults::idna-3.4-py_0
+"""
+
+SP = "lib/python3.11/site-packages"
+
+
+class TestVerifyImportsSince(unittest.TestCase):
+    def setUp(self):
+        conda_meta.clear_index_cache()
+
+    def _make_env(self, td):
+        env = Path(td) / "env"
+        cm = env / "conda-meta"
+        cm.mkdir(parents=True)
+        (cm / "history").write_text(HISTORY, encoding="utf-8")
+        write_record(cm, "python", "3.11.0", "py311_0")
+        write_record(cm, "numpy", "1.26.4", "py311_0", depends=["python >=3.11,<3.12.0a0"], files=[f"{SP}/numpy-1.26.4.dist-info/METADATA"])
+        write_record(cm, "pandas", "2.2.0", "py311_0", depends=["numpy >=1.23"], files=[f"{SP}/pandas-2.2.0.dist-info/METADATA"])
+        write_record(cm, "six", "1.16.0", "py311_0", depends=["python"], files=[f"{SP}/six-1.16.0.dist-info/METADATA"])
+        sp = env / SP
+        sp.mkdir(parents=True)
+        old = parse_timestamp("2023-12-01")
+        write_dist(sp, "numpy", "1.26.4", mtime=old)
+        write_dist(sp, "pandas", "2.2.0", requires=["numpy>=1.23"], mtime=old)
+        write_dist(sp, "six", "1.16.0", mtime=old)
+        write_dist(sp, "myapp", "0.1", requires=["NumPy; python_version >= '3'"], mtime=old)
+        write_dist(sp, "fresh", "1.0", mtime=parse_timestamp("2024-03-01 12:00"))
+        return env, [str(sp)]
+
+    def test_parse_timestamp(self):
+        self.assertEqual(parse_timestamp("2024-02-01T10:00"), parse_timestamp("2024-02-01 10:00:00"))
+        self.assertEqual(parse_timestamp("1700000000"), 1700000000.0)
+        with self.assertRaises(ValueError):
+            parse_timestamp("yesterday")
+
+    def test_since_revision_selects_changed_and_reverse_deps(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, site_pkgs = self._make_env(td)
+            result = changed_packages(env, site_pkgs, revision=0)
+            self.assertEqual(result["conda_changed"], ["idna", "numpy"])
+            self.assertEqual(result["conda_reverse"], ["pandas"])
+            self.assertEqual(result["pip_changed"], ["fresh", "numpy"])
+            self.assertEqual(result["pip_reverse"], ["myapp", "pandas"])
+            self.assertEqual(
+                result["dist_infos"],
+                ["fresh-1.0.dist-info", "myapp-0.1.dist-info", "numpy-1.26.4.dist-info", "pandas-2.2.0.dist-info"],
+            )
+
+            latest = changed_packages(env, site_pkgs, revision=1)
+            self.assertEqual(latest["conda_changed"], [])
+            self.assertEqual(latest["dist_infos"], ["fresh-1.0.dist-info"])
+
+            with self.assertRaises(ValueError):
+                changed_packages(env, site_pkgs, revision=5)
+
+    def test_since_timestamp(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, site_pkgs = self._make_env(td)
+            result = changed_packages(env, site_pkgs, since=parse_timestamp("2024-01-20"))
+            self.assertEqual(result["conda_changed"], ["idna", "numpy"])
+            self.assertNotIn("six-1.16.0.dist-info", result["dist_infos"])
+
+    def test_json_output_with_no_changes_is_pure_json(self):
+        with tempfile.TemporaryDirectory() as td:
+            env, site_pkgs = self._make_env(td)
+            out = io.StringIO()
+            with mock.patch.object(verify_imports, "discover_envs", return_value=([str(env)], str(env), None)), mock.patch.object(
+                verify_imports, "get_python_exe", return_value="python"
+            ), mock.patch("env_repair.discovery.get_site_packages", return_value=site_pkgs), contextlib.redirect_stdout(out):
+                code = main(["verify-imports", "--env", str(env), "--since", "2030-01-01", "--json"])
+            self.assertEqual(code, 0)
+            report = json.loads(out.getvalue())
+            self.assertEqual(report["checks"], 0)
+            self.assertEqual(report["incremental"]["dist_infos"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()